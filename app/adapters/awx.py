@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Any, Optional, Dict, List
 from app.adapters.awx_service import awx_client
+from app.adapters.batch import run_batch
+from app.config import settings
+from app.jobs.tracker import is_terminal, job_tracker
 import httpx
+import json
 import logging
 
 router = APIRouter(prefix="/awx2", tags=["AWX"])
@@ -53,6 +58,79 @@ class OrganizationUpdate(BaseModel):
     description: Optional[str] = None
 
 
+class BatchOperation(BaseModel):
+    method: str = "GET"
+    path: str
+    body: Optional[Any] = None
+
+
+@router.post("/batch")
+async def batch(operations: List[BatchOperation], request: Request):
+    if len(operations) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.batch_max_requests} operations",
+        )
+    results = await run_batch(
+        request.scope,
+        [op.model_dump() for op in operations],
+        settings.batch_max_concurrency,
+    )
+    return {"results": results}
+
+
+# Collections that can be streamed with /{resource}/export
+EXPORTABLE_RESOURCES = {
+    "activity_stream",
+    "credentials",
+    "hosts",
+    "inventories",
+    "job_templates",
+    "jobs",
+    "organizations",
+    "projects",
+    "users",
+}
+
+
+# Registered before the /{resource}/{id} routes so "export" is not parsed as an id
+@router.get("/{resource}/export")
+async def export_collection(
+    resource: str, request: Request, format: str = "ndjson", cursor: int | None = None
+):
+    if resource not in EXPORTABLE_RESOURCES:
+        raise HTTPException(status_code=404, detail=f"Cannot export '{resource}'")
+    if format != "ndjson":
+        raise HTTPException(status_code=400, detail="Only format=ndjson is supported")
+    # Any other query parameter is pushed down to AWX as a filter
+    filters = {
+        k: v for k, v in request.query_params.items() if k not in ("format", "cursor")
+    }
+    items = awx_client.iter_collection(resource, filters, after_id=cursor)
+    # Fetch the first page up front so AWX errors still map to a status code
+    try:
+        first = await items.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except httpx.HTTPStatusError as exc:
+        raise HTTPException(status_code=exc.response.status_code, detail=str(exc))
+
+    async def stream():
+        if first is None:
+            return
+        last_id = first.get("id")
+        yield json.dumps(first) + "\n"
+        try:
+            async for item in items:
+                last_id = item.get("id")
+                yield json.dumps(item) + "\n"
+        except httpx.HTTPError as exc:
+            logging.error(f"Export of {resource} aborted after id {last_id}: {exc}")
+            yield json.dumps({"error": str(exc), "cursor": last_id}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.post("/job_templates/{template_id}/launch")
 async def launch_job_template(template_id: int, extra_vars: dict | None = None):
     try:
@@ -215,6 +293,42 @@ async def list_jobs(page: int = 1):
         raise HTTPException(status_code=exc.response.status_code, detail=str(exc))
 
 
+# Job completion endpoints, fed by the /webhooks/awx receiver
+@router.get("/jobs/events")
+async def job_events():
+    queue = job_tracker.subscribe()
+
+    async def stream():
+        try:
+            while True:
+                job = await queue.get()
+                yield json.dumps(job) + "\n"
+        finally:
+            job_tracker.unsubscribe(queue)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/jobs/{job_id}/wait")
+async def wait_for_job(job_id: int, timeout: float = 60):
+    # Without the webhook receiver nothing would ever wake the waiter
+    webhooks = bool(settings.webhook_secret)
+    job = job_tracker.get(job_id) if webhooks else None
+    if job is None:
+        try:
+            job = await awx_client.get_job(job_id)
+        except httpx.HTTPStatusError as exc:
+            raise HTTPException(status_code=exc.response.status_code, detail=str(exc))
+    if not is_terminal(job):
+        if not webhooks:
+            raise HTTPException(
+                status_code=503,
+                detail="Job webhooks are not configured (set WEBHOOK_SECRET)",
+            )
+        job = await job_tracker.wait(job_id, min(timeout, 300))
+    return {"job": job, "finished": is_terminal(job)}
+
+
 @router.get("/schedules/{schedule_id}")
 async def get_schedule(schedule_id: int):
     try:
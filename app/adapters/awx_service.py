@@ -1,7 +1,11 @@
+import asyncio
 import httpx
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 from app.config import settings
+from app.jobs.tracker import job_tracker
+from app.replica.invalidation import invalidation_bus
+from app.replica.store import REPLICATED_RESOURCES, ReplicaStore
 from fastapi import HTTPException
 
 
@@ -21,12 +25,73 @@ class AWXClient:
         if settings.awx_username and settings.awx_password:
             self.auth = (settings.awx_username, settings.awx_password)
         self.headers: dict[str, str] = {}
+        # Optional local read replica, attached by app.replica.sync.setup_replica
+        self.replica: ReplicaStore | None = None
 
     async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
         async with httpx.AsyncClient(auth=self.auth) as client:
             resp = await client.request(method, url, headers=self.headers, **kwargs)
             resp.raise_for_status()
-            return resp
+        if method != "GET":
+            await self._write_through(method, url, resp)
+        return resp
+
+    def _from_replica(self, resource: str) -> ReplicaStore | None:
+        """Return the replica if it can answer reads for ``resource``."""
+        if self.replica is not None and self.replica.is_synced(resource):
+            return self.replica
+        return None
+
+    async def _write_through(self, method: str, url: str, resp: httpx.Response) -> None:
+        """Apply a successful write to the replica and publish it on the bus."""
+        parts = url[len(f"{self.base_url}/api/v2/") :].strip("/").split("/")
+        if parts[0] not in REPLICATED_RESOURCES or len(parts) > 2:
+            return
+        resource = parts[0]
+        if method == "DELETE" and len(parts) == 2:
+            obj_id = int(parts[1])
+            if self.replica is not None:
+                await asyncio.to_thread(self.replica.delete, resource, obj_id)
+            await invalidation_bus.publish(resource, obj_id, "delete")
+            return
+        try:
+            obj = resp.json()
+        except ValueError:
+            return
+        if not isinstance(obj, dict) or "id" not in obj:
+            return
+        if self.replica is not None:
+            await asyncio.to_thread(self.replica.upsert, resource, [obj])
+        operation = "update" if len(parts) == 2 else "create"
+        await invalidation_bus.publish(resource, obj["id"], operation)
+
+    async def iter_collection(
+        self,
+        resource: str,
+        filters: dict | None = None,
+        after_id: int | None = None,
+        page_size: int = 200,
+    ) -> AsyncIterator[dict]:
+        """Yield every object of a collection, one AWX page at a time.
+
+        Pages are walked by id (``id__gt``) rather than by page number, so the
+        id of the last object yielded is a stable cursor to resume from.
+        """
+        url = f"{self.base_url}/api/v2/{resource}/"
+        params: dict = dict(filters or {})
+        params["order_by"] = "id"
+        params["page_size"] = page_size
+        if after_id is not None:
+            params["id__gt"] = after_id
+        while True:
+            resp = await self._request("GET", url, params=params)
+            data = resp.json()
+            results = data.get("results", [])
+            for item in results:
+                yield item
+            if not data.get("next") or not results:
+                break
+            params["id__gt"] = results[-1]["id"]
 
     async def launch_job_template(
         self, template_id: int, extra_vars: dict | None = None
@@ -56,7 +121,15 @@ class AWXClient:
         """Retrieve a job by ID."""
         url = f"{self.base_url}/api/v2/jobs/{job_id}/"
         resp = await self._request("GET", url)
-        return resp.json()
+        job = resp.json()
+        job_tracker.update(job_id, job)
+        return job
+
+    async def get_job_stdout(self, job_id: int) -> str:
+        """Retrieve the plain-text stdout of a job."""
+        url = f"{self.base_url}/api/v2/jobs/{job_id}/stdout/"
+        resp = await self._request("GET", url, params={"format": "txt"})
+        return resp.text
 
     async def list_schedules(self, template_id: int) -> dict:
         """List schedules for a job template."""
@@ -79,6 +152,8 @@ class AWXClient:
 
     async def list_templates(self) -> dict:
         """List all job templates."""
+        if replica := self._from_replica("job_templates"):
+            return await asyncio.to_thread(replica.list, "job_templates")
         url = f"{self.base_url}/api/v2/job_templates/"
         resp = await self._request("GET", url)
         return resp.json()
@@ -90,6 +165,20 @@ class AWXClient:
         resp = await self._request("GET", url, params=params)
         return resp.json()
 
+    async def list_recent_jobs(
+        self, filters: dict | None = None, limit: int = 50
+    ) -> list[dict]:
+        """The newest ``limit`` jobs matching ``filters``, newest first.
+
+        One page sorted by ``-id``; AWX caps ``page_size`` at 200.
+        """
+        url = f"{self.base_url}/api/v2/jobs/"
+        params: dict = dict(filters or {})
+        params["order_by"] = "-id"
+        params["page_size"] = limit
+        resp = await self._request("GET", url, params=params)
+        return resp.json().get("results", [])
+
     async def get_schedule(self, schedule_id: int) -> dict:
         """Retrieve a schedule by ID."""
         url = f"{self.base_url}/api/v2/schedules/{schedule_id}/"
@@ -111,12 +200,18 @@ class AWXClient:
     # NEW INVENTORY METHODS START
     async def list_inventories(self) -> dict:
         """List all inventories."""
+        if replica := self._from_replica("inventories"):
+            return await asyncio.to_thread(replica.list, "inventories")
         url = f"{self.base_url}/api/v2/inventories/"
         resp = await self._request("GET", url)
         return resp.json()
 
     async def get_inventory(self, inventory_id: int) -> dict:
         """Retrieve details for an inventory."""
+        if (replica := self._from_replica("inventories")) and (
+            obj := await asyncio.to_thread(replica.get, "inventories", inventory_id)
+        ):
+            return obj
         url = f"{self.base_url}/api/v2/inventories/{inventory_id}/"
         resp = await self._request("GET", url)
         return resp.json()
@@ -138,6 +233,9 @@ class AWXClient:
     # Organizations methods
 
     async def list_organizations(self):
+        if replica := self._from_replica("organizations"):
+            return await asyncio.to_thread(replica.list, "organizations")
+
         url = f"{self.base_url}/api/v2/organizations/"
 
         resp = await self._request("GET", url)
@@ -145,6 +243,13 @@ class AWXClient:
         return resp.json()
 
     async def get_organization(self, organization_id: int):
+        if (replica := self._from_replica("organizations")) and (
+            obj := await asyncio.to_thread(
+                replica.get, "organizations", organization_id
+            )
+        ):
+            return obj
+
         url = f"{self.base_url}/api/v2/organizations/{organization_id}/"
 
         resp = await self._request("GET", url)
@@ -193,6 +298,9 @@ class AWXClient:
     # Projects methods
 
     async def list_projects(self):
+        if replica := self._from_replica("projects"):
+            return await asyncio.to_thread(replica.list, "projects")
+
         url = f"{self.base_url}/api/v2/projects/"
 
         resp = await self._request("GET", url)
@@ -200,6 +308,11 @@ class AWXClient:
         return resp.json()
 
     async def get_project(self, project_id: int):
+        if (replica := self._from_replica("projects")) and (
+            obj := await asyncio.to_thread(replica.get, "projects", project_id)
+        ):
+            return obj
+
         url = f"{self.base_url}/api/v2/projects/{project_id}/"
 
         resp = await self._request("GET", url)
@@ -270,6 +383,9 @@ class AWXClient:
     # Credentials methods
 
     async def list_credentials(self):
+        if replica := self._from_replica("credentials"):
+            return await asyncio.to_thread(replica.list, "credentials")
+
         url = f"{self.base_url}/api/v2/credentials/"
 
         resp = await self._request("GET", url)
@@ -277,6 +393,11 @@ class AWXClient:
         return resp.json()
 
     async def get_credential(self, credential_id: int):
+        if (replica := self._from_replica("credentials")) and (
+            obj := await asyncio.to_thread(replica.get, "credentials", credential_id)
+        ):
+            return obj
+
         url = f"{self.base_url}/api/v2/credentials/{credential_id}/"
 
         resp = await self._request("GET", url)
@@ -323,6 +444,9 @@ class AWXClient:
 
     async def list_users(self, username: Optional[str] = None):
         logging.info(f"DEBUG: list_users called with username = {username}")
+        if replica := self._from_replica("users"):
+            return await asyncio.to_thread(replica.list, "users", name=username)
+
         url = f"{self.base_url}/api/v2/users/"
 
         resp = await self._request("GET", url)
@@ -336,6 +460,11 @@ class AWXClient:
         return users
 
     async def get_user(self, user_id: int):
+        if (replica := self._from_replica("users")) and (
+            obj := await asyncio.to_thread(replica.get, "users", user_id)
+        ):
+            return obj
+
         url = f"{self.base_url}/api/v2/users/{user_id}/"
 
         resp = await self._request("GET", url)
@@ -343,7 +472,7 @@ class AWXClient:
         return resp.json()
 
     async def get_user_by_name(self, username: str):
-        users = await self.list_users()
+        users = await self.list_users(username)
         for user in users.get("results", []):
             if user["username"] == username:
                 return await self.get_user(user["id"])
@@ -503,15 +632,21 @@ class AWXClient:
         return resp.json()
 
     async def create_notification(
-        self, name: str, notification_type: str, notification_configuration: dict
+        self,
+        name: str,
+        notification_type: str,
+        notification_configuration: dict,
+        organization: int | None = None,
     ):
         url = f"{self.base_url}/api/v2/notification_templates/"
 
-        payload = {
+        payload: dict = {
             "name": name,
             "notification_type": notification_type,
             "notification_configuration": notification_configuration,
         }
+        if organization is not None:
+            payload["organization"] = organization
 
         resp = await self._request("POST", url, json=payload)
 
@@ -544,6 +679,16 @@ class AWXClient:
 
         return resp.json()
 
+    async def associate_notification(
+        self, template_id: int, notification_id: int, event: str
+    ):
+        """Attach a notification template to a job template event."""
+        url = f"{self.base_url}/api/v2/job_templates/{template_id}/notification_templates_{event}/"
+
+        await self._request("POST", url, json={"id": notification_id})
+
+        return {"status": "associated", "id": notification_id, "event": event}
+
     # Instance Groups methods
 
     async def list_instance_groups(self):
@@ -622,6 +767,58 @@ class AWXClient:
 
         return resp.json()
 
+    async def list_activity_stream_since(self, since_id: int, page_size: int = 200):
+        """List activity stream entries newer than ``since_id``, oldest first."""
+        url = f"{self.base_url}/api/v2/activity_stream/"
+
+        params = {"id__gt": since_id, "order_by": "id", "page_size": page_size}
+
+        resp = await self._request("GET", url, params=params)
+
+        return resp.json()
+
+    async def latest_activity_stream_id(self) -> int:
+        url = f"{self.base_url}/api/v2/activity_stream/"
+
+        params = {"order_by": "-id", "page_size": 1}
+
+        resp = await self._request("GET", url, params=params)
+
+        results = resp.json().get("results", [])
+        return results[0]["id"] if results else 0
+
+    async def fetch_object(self, resource: str, obj_id: int) -> dict:
+        """Fetch an object straight from AWX, bypassing the replica."""
+        url = f"{self.base_url}/api/v2/{resource}/{obj_id}/"
+
+        resp = await self._request("GET", url)
+
+        return resp.json()
+
+    async def ping(self) -> dict:
+        """AWX's own ping endpoint, never answered from the replica."""
+        url = f"{self.base_url}/api/v2/ping/"
+        resp = await self._request("GET", url)
+        return resp.json()
+
+    async def list_all(self, resource: str) -> list[dict]:
+        """Every object of a collection, from the replica when it is synced."""
+        if replica := self._from_replica(resource):
+            data = await asyncio.to_thread(replica.list, resource)
+            return data["results"]
+        return [obj async for obj in self.iter_collection(resource)]
+
+    async def read_object(self, resource: str, obj_id: int) -> dict | None:
+        """One object, from the replica when it is synced; None if it is gone."""
+        if replica := self._from_replica(resource):
+            return await asyncio.to_thread(replica.get, resource, obj_id)
+        try:
+            return await self.fetch_object(resource, obj_id)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 404:
+                return None
+            raise
+
 
 # Singleton instance
 awx_client = AWXClient()
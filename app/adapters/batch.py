@@ -0,0 +1,127 @@
+"""In-process execution of batched gateway sub-requests.
+
+Each sub-request is dispatched straight into the application router as an
+ASGI call, so it goes through the normal route matching, validation and
+exception handling without a loopback HTTP round-trip.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from starlette.types import Message, Scope
+
+BATCH_PREFIX = "/awx2/"
+BATCH_PATH = "/awx2/batch"
+
+
+def _error(status: int, detail: str) -> Dict[str, Any]:
+    return {"status": status, "body": {"detail": detail}}
+
+
+async def dispatch(
+    parent_scope: Scope, method: str, path: str, body: Optional[Any] = None
+) -> Dict[str, Any]:
+    """Run a single sub-request against the app router and collect its response."""
+    path, _, query = path.partition("?")
+    payload = b"" if body is None else json.dumps(body).encode("utf-8")
+    headers = [(b"content-length", str(len(payload)).encode("latin-1"))]
+    if body is not None:
+        headers.append((b"content-type", b"application/json"))
+
+    scope: Scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": parent_scope.get("scheme", "http"),
+        "server": parent_scope.get("server"),
+        "client": parent_scope.get("client"),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("latin-1"),
+        "headers": headers,
+        "app": parent_scope["app"],
+        "state": dict(parent_scope.get("state", {})),
+    }
+    # Reuse the exception handlers installed by the parent request so that
+    # HTTPException and validation errors become regular responses.
+    if "starlette.exception_handlers" in parent_scope:
+        scope["starlette.exception_handlers"] = parent_scope[
+            "starlette.exception_handlers"
+        ]
+
+    request_sent = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    status = 500
+    content_type = ""
+    chunks: List[bytes] = []
+
+    async def send(message: Message) -> None:
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for name, value in message.get("headers", []):
+                if name.lower() == b"content-type":
+                    content_type = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    # The exit-stack middleware provides the per-request stack FastAPI needs
+    # for dependency cleanup; everything else goes straight to the router.
+    await AsyncExitStackMiddleware(parent_scope["app"].router)(scope, receive, send)
+
+    raw = b"".join(chunks)
+    result: Any = raw.decode("utf-8", errors="replace")
+    if content_type.startswith("application/json") and raw:
+        result = json.loads(raw)
+    return {"status": status, "body": result}
+
+
+async def run_batch(
+    parent_scope: Scope, operations: List[Dict[str, Any]], concurrency: int
+) -> List[Dict[str, Any]]:
+    """Execute ``operations`` concurrently and return their results in order.
+
+    Identical GET requests are only executed once and share their result.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    shared_gets: Dict[str, asyncio.Future] = {}
+
+    async def run(method: str, path: str, body: Any) -> Dict[str, Any]:
+        if not path.startswith(BATCH_PREFIX):
+            return _error(400, f"Path must start with {BATCH_PREFIX}")
+        if path.partition("?")[0].rstrip("/") == BATCH_PATH:
+            return _error(400, "Nested batch requests are not allowed")
+        async with semaphore:
+            try:
+                return await dispatch(parent_scope, method, path, body)
+            except Exception as exc:
+                return _error(500, str(exc))
+
+    futures: List[asyncio.Future] = []
+    for op in operations:
+        method = op.get("method", "GET").upper()
+        path = op["path"]
+        body = op.get("body")
+        if method == "GET":
+            future = shared_gets.get(path)
+            if future is None:
+                future = asyncio.ensure_future(run(method, path, None))
+                shared_gets[path] = future
+        else:
+            future = asyncio.ensure_future(run(method, path, body))
+        futures.append(future)
+
+    return list(await asyncio.gather(*futures))
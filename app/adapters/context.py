@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse, Response
+import httpx
+
+from app.adapters.awx_service import awx_client
+from app.config import settings
+from app.context.catalog import CatalogDigest
+from app.llm.tokens import estimate_tokens
+
+router = APIRouter(prefix="/context", tags=["Context"])
+
+# Shared digest, kept current by the invalidation bus (see app.main)
+catalog = CatalogDigest(awx_client, max_age=settings.catalog_max_age)
+
+
+@router.get("/catalog", response_class=PlainTextResponse)
+async def get_catalog(request: Request):
+    """Compact AWX catalog digest for injection into system prompts."""
+    try:
+        text = await catalog.text()
+    except httpx.HTTPStatusError as exc:
+        raise HTTPException(status_code=exc.response.status_code, detail=str(exc))
+    etag = catalog.etag()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return PlainTextResponse(
+        text,
+        headers={"ETag": etag, "X-Token-Estimate": str(estimate_tokens(text))},
+    )
@@ -1,16 +1,43 @@
-from fastapi import APIRouter
+import json
+import logging
+from typing import Optional
+
+import httpx
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from jsonschema.exceptions import SchemaError
+from pydantic import BaseModel, Field
+
+from app.adapters.awx_service import awx_client
+from app.config import settings
 from app.dependencies.llm import (
     llm_validate_payload,
     llm_generate_job,
     llm_summarize_log,
 )
+from app.llm.compaction import compact_log
+from app.llm.jobs import summarize_jobs
+from app.llm.service import PromptService
+from app.schema.validator import schema_errors
 
 router = APIRouter(prefix="/llm", tags=["LLM"])
 
 
 @router.post("/validate")
-async def validate_payload(payload: dict, schema: dict):
-    await llm_validate_payload(payload, schema)
+async def validate_payload(payload: dict, schema: dict, semantic: bool = False):
+    # Structural validation is deterministic, so it runs locally
+    try:
+        errors = schema_errors(schema, payload)
+    except SchemaError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid schema: {exc.message}")
+    if errors:
+        raise HTTPException(
+            status_code=422, detail={"status": "invalid", "errors": errors}
+        )
+    # The LLM is only asked for an optional semantic review
+    if semantic:
+        await llm_validate_payload(payload, schema)
+        return {"status": "valid", "semantic_review": "passed"}
     return {"status": "valid"}
 
 
@@ -20,7 +47,69 @@ async def generate_job(request: dict):
     return resp
 
 
+_prompt_service: PromptService | None = None
+
+
+def get_prompt_service() -> PromptService:
+    global _prompt_service
+    if _prompt_service is None:
+        _prompt_service = PromptService()
+    return _prompt_service
+
+
+async def _stream_summary(log: str):
+    # NDJSON: {"delta": ...} lines as tokens arrive, then {"summary": ...}
+    try:
+        async for event in get_prompt_service().stream_log_summary(log):
+            if "payload" in event:
+                event = {"summary": event["payload"]["result"]["summary"]}
+            yield json.dumps(event) + "\n"
+    except Exception as exc:
+        logging.exception("Streaming summary failed")
+        yield json.dumps({"error": str(exc)}) + "\n"
+
+
 @router.post("/summarize")
-async def summarize_log(log: str):
-    summary = await llm_summarize_log(log)
+async def summarize_log(log: str, stream: bool = False):
+    if stream:
+        return StreamingResponse(
+            _stream_summary(log), media_type="application/x-ndjson"
+        )
+    compacted, _ = compact_log(log)
+    summary = await llm_summarize_log(compacted)
     return {"summary": summary}
+
+
+class JobSummaryRequest(BaseModel):
+    status: str = "failed"
+    job_template: Optional[int] = None
+    finished_after: Optional[str] = None
+    finished_before: Optional[str] = None
+    limit: int = Field(50, ge=1, le=200)
+
+
+@router.post("/summarize/jobs")
+async def summarize_jobs_route(request: JobSummaryRequest):
+    """Summarize the newest ``limit`` matching jobs, streamed as NDJSON."""
+    filters: dict = {"status": request.status}
+    if request.job_template is not None:
+        filters["job_template"] = request.job_template
+    if request.finished_after:
+        filters["finished__gte"] = request.finished_after
+    if request.finished_before:
+        filters["finished__lt"] = request.finished_before
+    try:
+        jobs = await awx_client.list_recent_jobs(filters, request.limit)
+    except httpx.HTTPStatusError as exc:
+        raise HTTPException(status_code=exc.response.status_code, detail=str(exc))
+
+    async def stream():
+        async for result in summarize_jobs(
+            awx_client,
+            get_prompt_service(),
+            jobs,
+            settings.llm_summary_jobs_concurrency,
+        ):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
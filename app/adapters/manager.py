@@ -9,6 +9,7 @@ from .sn import router as sn_router
 from .llm import router as llm_router
 from .audit import router as audit_router
 from .context import router as context_router
+from .webhooks import router as webhooks_router
 
 # Registry mapping names to routers
 ADAPTER_REGISTRY: Dict[str, APIRouter] = {
@@ -18,6 +19,7 @@ ADAPTER_REGISTRY: Dict[str, APIRouter] = {
     "llm": llm_router,
     "audit": audit_router,
     "context": context_router,
+    "webhooks": webhooks_router,
 }
 
 # Helper to get router by name
@@ -0,0 +1,76 @@
+import hashlib
+import hmac
+import json
+import logging
+from typing import List
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel
+
+from app.adapters.awx_service import awx_client
+from app.config import settings
+from app.jobs.notifications import WEBHOOK_TOKEN_HEADER, register_job_webhooks
+from app.jobs.tracker import job_tracker
+
+router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
+
+SIGNATURE_HEADER = "X-Signature-256"
+
+
+class WebhookRegistration(BaseModel):
+    job_template_ids: List[int]
+
+
+def verify_webhook(request: Request, body: bytes) -> None:
+    """Accept either the shared token header or an HMAC-SHA256 body signature."""
+    secret = settings.webhook_secret
+    if not secret:
+        raise HTTPException(status_code=503, detail="Webhook receiver not configured")
+    token = request.headers.get(WEBHOOK_TOKEN_HEADER)
+    if token is not None and hmac.compare_digest(token, secret):
+        return
+    signature = request.headers.get(SIGNATURE_HEADER)
+    if signature is not None:
+        digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        if hmac.compare_digest(signature, f"sha256={digest}"):
+            return
+    raise HTTPException(status_code=401, detail="Invalid webhook token or signature")
+
+
+@router.post("/awx")
+async def receive_awx_notification(request: Request):
+    body = await request.body()
+    verify_webhook(request, body)
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Webhook body must be JSON")
+    job_id = payload.get("id") if isinstance(payload, dict) else None
+    if not isinstance(job_id, int):
+        # AWX "test notification" deliveries carry no job
+        return {"status": "ignored"}
+    job_tracker.update(job_id, payload)
+    logging.info(f"Webhook update for job {job_id}: {payload.get('status')}")
+    return {"status": "accepted", "id": job_id}
+
+
+@router.post("/awx/register")
+async def register_awx_webhook(registration: WebhookRegistration):
+    if not settings.webhook_public_url or not settings.webhook_secret:
+        raise HTTPException(
+            status_code=400,
+            detail="WEBHOOK_PUBLIC_URL and WEBHOOK_SECRET must be set",
+        )
+    try:
+        return await register_job_webhooks(
+            awx_client,
+            registration.job_template_ids,
+            settings.webhook_public_url,
+            settings.webhook_secret,
+            settings.webhook_organization,
+        )
+    except httpx.HTTPStatusError as exc:
+        raise HTTPException(status_code=exc.response.status_code, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -14,12 +14,61 @@ class Settings(BaseSettings):
     llm_model: str | None = None
     llm_api_key: str | None = None
     llm_provider: str = "default"
+    llm_endpoints: str = ""
+    llm_hedge: bool = False
+    llm_eject_failures: int = 3
+    llm_eject_seconds: float = 30
+    llm_backend_concurrency: int = 4
+    llm_interactive_deadline: float = 60
+    llm_keep_alive: str = "30m"
+    llm_warmup: bool = True
+    llm_keep_warm_interval: int = 240
+    llm_keep_warm_hours: str = "8-18"
+    llm_keep_warm_weekends: bool = False
+    llm_connect_timeout: float = 5
+    llm_read_timeout: float = 120
+    llm_max_connections: int = 20
+    llm_max_keepalive_connections: int = 10
+    llm_keepalive_expiry: float = 30
+    llm_max_tokens: int = 3000
+    llm_context_tokens: int | None = None
+    llm_summary_chunk_tokens: int = 2000
+    llm_summary_concurrency: int = 4
+    llm_summary_jobs_concurrency: int = 8
 
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
+    redis_timeout: float = 0.5
     audit_log_dir: str = "/var/log/mcp"
     jwt_secret: str | None = None
 
+    batch_max_requests: int = 50
+    batch_max_concurrency: int = 8
+
+    replica_db_path: str | None = None
+    replica_sync_interval: int = 60
+    replica_full_sync_every: int = 60
+    activity_stream_follow: bool = False
+    activity_stream_poll_interval: float = 5
+
+    catalog_max_age: int = 600
+
+    webhook_secret: str | None = None
+    webhook_public_url: str | None = None
+    webhook_job_templates: str = ""
+    webhook_organization: int | None = None
+
+    llm_cache_max_entries: int = 1024
+    llm_cache_max_bytes: int = 16 * 1024 * 1024
+    llm_cache_ttl: int = 3600
+    llm_cache_backend: str = "memory"
+    llm_cache_disk_path: str | None = None
+    llm_cache_disk_max_bytes: int = 256 * 1024 * 1024
+    llm_cache_compact_interval: int = 600
+    llm_cache_warm_entries: int = 256
+    llm_semantic_cache: bool = False
+    llm_semantic_cache_entries: int = 2048
+
 
 settings = Settings()
@@ -0,0 +1,118 @@
+"""Compact digest of the AWX catalog for system prompts.
+
+One line per job template, inventory and organization (``id|name|short
+description``) gives the model the ids it needs without calling listing
+tools.  The digest is built once (from the replica when it is synced),
+patched per object from invalidation bus events, and rebuilt from scratch
+after ``CATALOG_MAX_AGE`` seconds to pick up anything no event reported.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CATALOG_RESOURCES = ("job_templates", "inventories", "organizations")
+DESCRIPTION_CHARS = 80
+
+
+def digest_line(obj: Dict[str, Any]) -> str:
+    name = " ".join(str(obj.get("name", "")).split()).replace("|", "/")
+    description = " ".join(str(obj.get("description") or "").split())
+    if len(description) > DESCRIPTION_CHARS:
+        description = description[: DESCRIPTION_CHARS - 1] + "…"
+    return f"{obj['id']}|{name}|{description.replace('|', '/')}"
+
+
+class CatalogDigest:
+    def __init__(
+        self,
+        client: Any,
+        max_age: float = 600,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client = client
+        self.max_age = max_age
+        self._clock = clock
+        self._entries: Dict[str, Dict[int, str]] = {}
+        self._text: Optional[str] = None
+        self._built_at: Optional[float] = None
+        self._etag: Optional[str] = None
+        # Created on first use, inside the event loop that serves requests
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _changed(self) -> None:
+        self._text = None
+        self._etag = None
+
+    async def _load(self, resource: str) -> Dict[int, str]:
+        objects = await self.client.list_all(resource)
+        return {obj["id"]: digest_line(obj) for obj in objects}
+
+    async def rebuild(self) -> None:
+        entries = {}
+        for resource in CATALOG_RESOURCES:
+            entries[resource] = await self._load(resource)
+        self._entries = entries
+        self._built_at = self._clock()
+        self._changed()
+
+    def _stale(self) -> bool:
+        return self._built_at is None or self._clock() - self._built_at > self.max_age
+
+    async def on_invalidate(
+        self, resource: str, obj_id: Optional[int], operation: str
+    ) -> None:
+        """Patch the line of one changed object."""
+        if resource not in CATALOG_RESOURCES or self._built_at is None:
+            return
+        if obj_id is None:
+            self._built_at = None  # unknown scope: rebuild on next read
+            return
+        obj = None
+        if operation != "delete":
+            obj = await self.client.read_object(resource, obj_id)
+        entries = self._entries.setdefault(resource, {})
+        if obj is None:
+            if entries.pop(obj_id, None) is not None:
+                self._changed()
+            return
+        line = digest_line(obj)
+        if entries.get(obj_id) != line:
+            entries[obj_id] = line
+            self._changed()
+
+    def render(self) -> str:
+        if self._text is None:
+            sections = []
+            for resource in CATALOG_RESOURCES:
+                entries = self._entries.get(resource, {})
+                lines = [entries[i] for i in sorted(entries)]
+                sections.append(
+                    f"{resource} ({len(lines)}) id|name|description:\n"
+                    + "\n".join(lines)
+                )
+            self._text = "\n\n".join(sections) + "\n"
+        return self._text
+
+    def etag(self) -> str:
+        """Entity tag of :meth:`render`, equal across processes for equal text."""
+        if self._etag is None:
+            digest = hashlib.sha256(self.render().encode("utf-8")).hexdigest()
+            self._etag = f'"{digest[:32]}"'
+        return self._etag
+
+    async def text(self) -> str:
+        """The current digest, rebuilt first if missing or too old."""
+        if self._stale():
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._stale():
+                    await self.rebuild()
+        return self.render()
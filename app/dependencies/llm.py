@@ -1,28 +1,66 @@
 # dependencies/llm.py
+"""Calls to the remote LLM helper service.
+
+One pooled ``httpx.AsyncClient`` is kept per endpoint so requests reuse
+keep-alive connections, with explicit timeouts so a stuck LLM cannot hang a
+route forever.  The app lifespan closes the pool on shutdown.
+"""
+
+from typing import Dict
+
 import httpx
+
 from app.config import settings
 
+_CLIENTS: Dict[str, httpx.AsyncClient] = {}
+
+
+def _build_client(endpoint: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=endpoint,
+        timeout=httpx.Timeout(
+            settings.llm_read_timeout, connect=settings.llm_connect_timeout
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+            keepalive_expiry=settings.llm_keepalive_expiry,
+        ),
+    )
+
+
+def get_http_client(endpoint: str | None = None) -> httpx.AsyncClient:
+    """Return the shared client for ``endpoint`` (default: ``LLM_ENDPOINT``)."""
+    endpoint = endpoint or settings.llm_endpoint
+    if not endpoint:
+        raise RuntimeError("LLM_ENDPOINT is not configured")
+    client = _CLIENTS.get(endpoint)
+    if client is None or client.is_closed:
+        client = _CLIENTS[endpoint] = _build_client(endpoint)
+    return client
+
+
+async def close_http_clients() -> None:
+    clients = list(_CLIENTS.values())
+    _CLIENTS.clear()
+    for client in clients:
+        await client.aclose()
+
 
 async def llm_validate_payload(payload: dict, schema: dict):
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{settings.llm_endpoint}/validate",
-            json={"payload": payload, "schema": schema},
-        )
-        resp.raise_for_status()
+    resp = await get_http_client().post(
+        "/validate", json={"payload": payload, "schema": schema}
+    )
+    resp.raise_for_status()
 
 
 async def llm_generate_job(request: dict) -> dict:
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(f"{settings.llm_endpoint}/generate", json=request)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await get_http_client().post("/generate", json=request)
+    resp.raise_for_status()
+    return resp.json()
 
 
 async def llm_summarize_log(log: str) -> str:
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{settings.llm_endpoint}/summarize", json={"log": log}
-        )
-        resp.raise_for_status()
-        return resp.json().get("summary")
+    resp = await get_http_client().post("/summarize", json={"log": log})
+    resp.raise_for_status()
+    return resp.json().get("summary")
@@ -0,0 +1,76 @@
+"""Register the gateway's webhook receiver as an AWX notification template."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_NOTIFICATION_NAME = "awx-advanced-tools job webhook"
+WEBHOOK_TOKEN_HEADER = "X-Webhook-Token"
+
+# Job template notification events the webhook is attached to
+NOTIFICATION_EVENTS = ("started", "success", "error")
+
+
+async def ensure_webhook_notification(
+    client: Any,
+    url: str,
+    token: str,
+    organization: Optional[int] = None,
+    template_id: Optional[int] = None,
+) -> int:
+    """Create (or update) the webhook notification template and return its id.
+
+    AWX requires an organization on new notification templates; without
+    ``organization`` the one owning job template ``template_id`` is used.
+    """
+    configuration = {
+        "url": url,
+        "http_method": "POST",
+        "headers": {WEBHOOK_TOKEN_HEADER: token},
+        "disable_ssl_verification": False,
+        "username": "",
+        "password": "",
+    }
+    existing = await client.list_notifications()
+    for notification in existing.get("results", []):
+        if notification.get("name") == WEBHOOK_NOTIFICATION_NAME:
+            await client.update_notification(
+                notification["id"], notification_configuration=configuration
+            )
+            return notification["id"]
+    if organization is None and template_id is not None:
+        template = await client.fetch_object("job_templates", template_id)
+        organization = template.get("organization")
+    if organization is None:
+        raise ValueError(
+            "An organization is needed to create the webhook notification; "
+            "set WEBHOOK_ORGANIZATION"
+        )
+    created = await client.create_notification(
+        WEBHOOK_NOTIFICATION_NAME, "webhook", configuration, organization=organization
+    )
+    return created["id"]
+
+
+async def register_job_webhooks(
+    client: Any,
+    template_ids: Iterable[int],
+    url: str,
+    token: str,
+    organization: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Attach the webhook notification to every job template in ``template_ids``."""
+    template_ids = list(template_ids)
+    notification_id = await ensure_webhook_notification(
+        client, url, token, organization, template_ids[0] if template_ids else None
+    )
+    registered: List[int] = []
+    for template_id in template_ids:
+        for event in NOTIFICATION_EVENTS:
+            await client.associate_notification(template_id, notification_id, event)
+        registered.append(template_id)
+    logger.info(f"Job webhook registered on job templates {registered}")
+    return {"notification_id": notification_id, "job_templates": registered}
@@ -0,0 +1,85 @@
+"""In-process job status cache fed by AWX webhooks.
+
+Webhook deliveries (and any job read through the gateway) update the cache,
+resolve callers blocked in :meth:`JobTracker.wait` and fan the update out to
+every subscriber queue, so nobody has to poll AWX for job completion.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"successful", "failed", "error", "canceled"}
+
+
+def is_terminal(job: Optional[Dict[str, Any]]) -> bool:
+    return job is not None and job.get("status") in TERMINAL_STATUSES
+
+
+class JobTracker:
+    def __init__(self, max_jobs: int = 10000, queue_size: int = 100) -> None:
+        self.max_jobs = max_jobs
+        self.queue_size = queue_size
+        self._jobs: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._waiters: Dict[int, List[asyncio.Future]] = {}
+        self._subscribers: List[asyncio.Queue] = []
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id)
+
+    def update(self, job_id: int, job: Dict[str, Any]) -> None:
+        """Record the latest known state of a job and notify listeners."""
+        self._jobs[job_id] = job
+        self._jobs.move_to_end(job_id)
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+        if is_terminal(job):
+            for future in self._waiters.pop(job_id, []):
+                if not future.done():
+                    future.set_result(job)
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(job)
+            except asyncio.QueueFull:
+                logger.warning("Dropping job update for a slow subscriber")
+
+    async def wait(self, job_id: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait until the job reaches a terminal status or ``timeout`` expires.
+
+        Returns the latest known job state either way (``None`` if unknown).
+        """
+        job = self._jobs.get(job_id)
+        if is_terminal(job):
+            return job
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job_id, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return self._jobs.get(job_id)
+        finally:
+            waiters = self._waiters.get(job_id)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[job_id]
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+
+# Shared tracker for the whole application
+job_tracker = JobTracker()
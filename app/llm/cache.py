@@ -1,23 +1,267 @@
-"""Optional caching layer – currently a simple in‑memory dict.
+"""Bounded in-process cache for LLM responses.
 
-If you want to use Redis, replace the implementation below with a
-Redis client (e.g. `aioredis`).  The rest of the code only imports
-`CACHE_ENABLED` and calls `cache_get`/`cache_set`.
+Entries are evicted least-recently-used first once either the entry count or
+the approximate byte size exceeds its limit, and expire after a per-action
+TTL.  Keys are compact hashes built by :func:`make_cache_key` rather than the
+full serialized payload.
+
+Slower tiers sit behind the in-process cache: an on-disk SQLite store
+(``LLM_CACHE_DISK_PATH``) that survives restarts, and Redis shared across
+replicas (``LLM_CACHE_BACKEND=redis``).  `cache_aget`/`cache_aset` go through
+every tier while `cache_get`/`cache_set` only touch the local one.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
 
-# In‑memory cache for demo purposes
-_CACHE: Dict[str, Any] = {}
+from app.config import settings
 
 CACHE_ENABLED: bool = True
 
+# TTL in seconds per action; anything else uses settings.llm_cache_ttl
+ACTION_TTLS: Dict[str, int] = {
+    "summarize_log": 24 * 3600,
+    "reduce_summaries": 24 * 3600,
+    # Keyed by job id; a finished job's output never changes
+    "summarize_job": 7 * 24 * 3600,
+    "validate_schema": 3600,
+    "launch_job_template": 600,
+    "create_project": 600,
+    "get_awx_status": 30,
+}
+
+
+def ttl_for(action: str) -> int:
+    return ACTION_TTLS.get(action, settings.llm_cache_ttl)
+
+
+def make_cache_key(
+    action: str,
+    payload: Any,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+) -> str:
+    """Return ``<action>:<hash>`` for an action, its inputs and model settings."""
+    raw = json.dumps(
+        [model, temperature, payload],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+    return f"{action}:{digest}"
+
+
+def _sizeof(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU cache with TTLs and entry/byte bounds."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        default_ttl: float = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._clock = clock
+        # key -> (value, expires_at, size)
+        self._data: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            return
+        expires_at = self._clock() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# Process-wide LLM response cache
+_CACHE = LRUCache(
+    max_entries=settings.llm_cache_max_entries,
+    max_bytes=settings.llm_cache_max_bytes,
+    default_ttl=settings.llm_cache_ttl,
+)
+
 
 def cache_get(key: str) -> Any | None:
     return _CACHE.get(key)
 
 
-def cache_set(key: str, value: Any) -> None:
-    _CACHE[key] = value
+def cache_set(key: str, value: Any, ttl: float | None = None) -> None:
+    _CACHE.set(key, value, ttl)
+
+
+def cache_stats() -> Dict[str, int]:
+    return _CACHE.stats()
+
+
+class CacheTier(Protocol):
+    async def get(self, key: str) -> Any | None: ...
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None: ...
+
+
+_TIERS: Optional[List[CacheTier]] = None
+
+
+def _build_tiers() -> List[CacheTier]:
+    tiers: List[CacheTier] = []
+    if settings.llm_cache_disk_path:
+        from .cache_disk import DiskCache
+
+        tiers.append(
+            DiskCache(
+                settings.llm_cache_disk_path,
+                max_bytes=settings.llm_cache_disk_max_bytes,
+                default_ttl=settings.llm_cache_ttl,
+                compact_interval=settings.llm_cache_compact_interval,
+            )
+        )
+    if settings.llm_cache_backend == "redis":
+        from .cache_redis import RedisCache
+
+        tiers.append(RedisCache())
+    return tiers
+
+
+def set_cache_tiers(tiers: Optional[List[CacheTier]]) -> None:
+    """Replace the tiers behind the local cache (``None`` rebuilds from settings)."""
+    global _TIERS
+    _TIERS = tiers
+
+
+def _tiers() -> List[CacheTier]:
+    global _TIERS
+    if _TIERS is None:
+        _TIERS = _build_tiers()
+    return _TIERS
+
+
+async def cache_aget(key: str) -> Any | None:
+    """Look ``key`` up in the local cache, then in each slower tier.
+
+    A hit in a slower tier is copied into the faster ones.
+    """
+    value = _CACHE.get(key)
+    tiers = _tiers()
+    if value is not None:
+        # Let persistent tiers rank keys that never miss in memory
+        for tier in tiers:
+            touch = getattr(tier, "touch", None)
+            if touch is not None:
+                touch(key)
+        return value
+    for index, tier in enumerate(tiers):
+        value = await tier.get(key)
+        if value is not None:
+            ttl = ttl_for(key.partition(":")[0])
+            for faster in tiers[:index]:
+                await faster.set(key, value, ttl)
+            _CACHE.set(key, value, ttl)
+            return value
+    return None
+
+
+async def cache_aset(key: str, value: Any, ttl: float | None = None) -> None:
+    _CACHE.set(key, value, ttl)
+    for tier in _tiers():
+        await tier.set(key, value, ttl)
+
+
+async def start_cache_tiers(warm_entries: int = 0) -> int:
+    """Warm the local cache from persistent tiers and start their maintenance.
+
+    Returns the number of entries loaded into memory.
+    """
+    warmed = 0
+    for tier in _tiers():
+        most_used = getattr(tier, "most_used", None)
+        if most_used is not None and warm_entries > 0:
+            for key, value, remaining in await most_used(warm_entries - warmed):
+                _CACHE.set(key, value, remaining)
+                warmed += 1
+        start = getattr(tier, "start", None)
+        if start is not None:
+            start()
+    return warmed
+
+
+async def stop_cache_tiers() -> None:
+    for tier in _tiers():
+        stop = getattr(tier, "stop", None)
+        if stop is not None:
+            await stop()
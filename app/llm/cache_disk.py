@@ -0,0 +1,207 @@
+"""Persistent SQLite tier for the LLM response cache.
+
+Values are stored zlib-compressed so the cache survives restarts and deploys.
+A background compaction task drops expired rows and, once the database grows
+past its size cap, the least used entries.  On startup the most used entries
+are loaded back into memory.  Hits served from memory are recorded with
+:meth:`DiskCache.touch` and written in batches, so keys that stay hot in
+memory keep their rank here.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_llm_cache_expires ON llm_cache (expires_at);
+CREATE INDEX IF NOT EXISTS ix_llm_cache_usage ON llm_cache (hits, last_access);
+"""
+
+
+class DiskCache:
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: float = 3600,
+        compact_interval: float = 600,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.compact_interval = compact_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._touched: Dict[str, Tuple[int, float]] = {}
+        self._touched_lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    # Blocking primitives, run in a worker thread by the async API
+
+    def _get(self, key: str) -> Any | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET hits = hits + 1, last_access = ? WHERE key = ?",
+                (now, key),
+            )
+            self._conn.commit()
+        return json.loads(zlib.decompress(row[0]))
+
+    def _set(self, key: str, value: Any, ttl: float | None) -> None:
+        blob = zlib.compress(json.dumps(value, default=str).encode("utf-8"))
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO llm_cache (key, value, size, expires_at, hits, last_access) "
+                "VALUES (?, ?, ?, ?, 0, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                "size = excluded.size, expires_at = excluded.expires_at, "
+                "last_access = excluded.last_access",
+                (key, blob, len(blob), expires_at, now),
+            )
+            self._conn.commit()
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def touch(self, key: str) -> None:
+        """Count a hit served by a faster tier; written by :meth:`flush_hits`."""
+        with self._touched_lock:
+            hits, _ = self._touched.get(key, (0, 0.0))
+            self._touched[key] = (hits + 1, time.time())
+
+    def flush_hits(self) -> int:
+        """Write the hits recorded by :meth:`touch` in one batch."""
+        with self._touched_lock:
+            touched, self._touched = self._touched, {}
+        if not touched:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE llm_cache SET hits = hits + ?, "
+                "last_access = MAX(last_access, ?) WHERE key = ?",
+                [(hits, last, key) for key, (hits, last) in touched.items()],
+            )
+            self._conn.commit()
+        return len(touched)
+
+    def _most_used(self, limit: int) -> List[Tuple[str, Any, float]]:
+        self.flush_hits()
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, expires_at FROM llm_cache WHERE expires_at > ? "
+                "ORDER BY hits DESC, last_access DESC LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        return [
+            (key, json.loads(zlib.decompress(blob)), expires_at - now)
+            for key, blob, expires_at in rows
+        ]
+
+    def size(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        return int(row[0])
+
+    def compact(self) -> int:
+        """Drop expired rows, then the least used ones until under the size cap."""
+        self.flush_hits()
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                victims = []
+                for key, size in self._conn.execute(
+                    "SELECT key, size FROM llm_cache ORDER BY hits, last_access"
+                ):
+                    if total <= self.max_bytes:
+                        break
+                    victims.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+                removed += len(victims)
+            self._conn.commit()
+            if removed:
+                self._conn.execute("VACUUM")
+        return removed
+
+    def close(self) -> None:
+        self.flush_hits()
+        with self._lock:
+            self._conn.close()
+
+    # Cache tier API
+
+    async def get(self, key: str) -> Any | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def most_used(self, limit: int) -> List[Tuple[str, Any, float]]:
+        """Return ``(key, value, remaining_ttl)`` for the most used live entries."""
+        return await asyncio.to_thread(self._most_used, limit)
+
+    async def _compact_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                removed = await asyncio.to_thread(self.compact)
+                if removed:
+                    logger.info(f"LLM disk cache compaction removed {removed} entries")
+            except Exception:
+                logger.exception("LLM disk cache compaction failed")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._compact_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush_hits)
@@ -0,0 +1,74 @@
+"""Redis tier for the LLM response cache, shared by every gateway replica.
+
+Values are stored as JSON with a Redis-side expiry.  Redis problems are
+logged and treated as cache misses so an outage never fails an LLM request.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+
+from app.config import settings
+
+from .loop_thread import PerLoop
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCache:
+    def __init__(self, client: Any = None, prefix: str = "llm:") -> None:
+        if client is None:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError as exc:  # pragma: no cover
+                raise RuntimeError(
+                    "Redis client not installed. Install with `pip install redis`"
+                ) from exc
+
+            def connect() -> Any:
+                return aioredis.Redis(
+                    host=settings.redis_host,
+                    port=settings.redis_port,
+                    db=settings.redis_db,
+                    socket_timeout=settings.redis_timeout,
+                    socket_connect_timeout=settings.redis_timeout,
+                )
+
+            # redis.asyncio connections belong to one event loop, and sync
+            # LLM callers run on the background loop
+            self._clients: PerLoop[Any] = PerLoop(connect)
+        self._client = client
+        self.prefix = prefix
+
+    @property
+    def client(self) -> Any:
+        # An injected client is used as is, on every loop
+        if self._client is not None:
+            return self._client
+        return self._clients.get()
+
+    async def get(self, key: str) -> Any | None:
+        try:
+            raw = await self.client.get(self.prefix + key)
+        except Exception as exc:
+            logger.warning(f"Redis cache get failed: {exc}")
+            return None
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        data = json.dumps(value, separators=(",", ":"), default=str)
+        expire = int(ttl) if ttl else None
+        try:
+            await self.client.set(self.prefix + key, data, ex=expire)
+        except Exception as exc:
+            logger.warning(f"Redis cache set failed: {exc}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.client.delete(self.prefix + key)
+        except Exception as exc:
+            logger.warning(f"Redis cache delete failed: {exc}")
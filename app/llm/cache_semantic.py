@@ -0,0 +1,198 @@
+"""Near-duplicate cache for LLM prompts.
+
+Prompts are normalized and embedded locally with a signed hashing-trick
+vectorizer over word unigrams and bigrams (NumPy, no external service).  A
+new prompt reuses a cached result when its cosine similarity to a stored
+prompt of the same action reaches that action's threshold and both carry
+the same outcome signals: the hosts reported fatal, failed, unreachable or
+changed and the PLAY RECAP counts must match exactly, so a log with one more
+failure never reuses the summary of a clean run.  Actions whose
+output depends on exact values (ids, schemas) have no threshold and are never
+served from here.
+
+Enable with ``LLM_SEMANTIC_CACHE=true``; requires ``numpy``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+from app import metrics
+from app.config import settings
+
+# Minimum cosine similarity for a hit, per action
+SEMANTIC_THRESHOLDS: Dict[str, float] = {
+    "summarize_log": 0.97,
+    "reduce_summaries": 0.97,
+}
+
+_WORD_RE = re.compile(r"[a-z0-9_]+")
+
+
+# "fatal: [web2]", "changed: [web1] => (item=x)"
+_HOST_STATUS_RE = re.compile(
+    r"\b(fatal|failed|unreachable|changed)\s*:\s*\[([^\]]+)\]", re.IGNORECASE
+)
+# PLAY RECAP counts, "ok=2 changed=1 unreachable=0 failed=0 ..."
+_RECAP_COUNT_RE = re.compile(
+    r"\b(ok|changed|unreachable|failed|skipped|rescued|ignored)=(\d+)", re.IGNORECASE
+)
+
+
+def normalize(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def outcome_signature(text: str) -> int:
+    """Hash of the failure and change signals that must match exactly."""
+    statuses = sorted(
+        f"{status.lower()}:{host.strip()}"
+        for status, host in _HOST_STATUS_RE.findall(text)
+    )
+    counts = [f"{name.lower()}={n}" for name, n in _RECAP_COUNT_RE.findall(text)]
+    digest = hashlib.blake2b(
+        "\n".join(statuses + ["--"] + counts).encode("utf-8"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _import_numpy():
+    try:
+        import numpy as np
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError(
+            "NumPy not installed. Install with `pip install numpy`"
+        ) from exc
+    return np
+
+
+class HashingVectorizer:
+    def __init__(self, dim: int = 4096) -> None:
+        self.np = _import_numpy()
+        self.dim = dim
+
+    def transform(self, text: str):
+        np = self.np
+        words = normalize(text)
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in features:
+            h = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % self.dim] += sign
+        # Sublinear term frequency, then unit length for cosine similarity
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class _ActionIndex:
+    """Fixed-size matrix of prompt vectors for one action."""
+
+    def __init__(self, np, capacity: int, dim: int) -> None:
+        self.np = np
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.expires = np.zeros(capacity, dtype=np.float64)
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+        self.signatures = np.zeros(capacity, dtype=np.int64)
+        self.values: List[Any] = [None] * capacity
+        self.size = 0
+
+    def best(self, vector, signature: int, now: float):
+        if not self.size:
+            return None, 0.0
+        scores = self.vectors[: self.size] @ vector
+        scores[self.expires[: self.size] <= now] = -1.0
+        scores[self.signatures[: self.size] != signature] = -1.0
+        index = int(scores.argmax())
+        return index, float(scores[index])
+
+    def add(
+        self, vector, signature: int, value: Any, expires_at: float, now: float
+    ) -> None:
+        if self.size < len(self.values):
+            index = self.size
+            self.size += 1
+        else:
+            # Replace an expired row, else the least recently used one
+            expired = self.np.flatnonzero(self.expires <= now)
+            index = int(expired[0]) if len(expired) else int(self.last_used.argmin())
+        self.vectors[index] = vector
+        self.signatures[index] = signature
+        self.values[index] = value
+        self.expires[index] = expires_at
+        self.last_used[index] = now
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        dim: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.vectorizer = HashingVectorizer(dim)
+        self.max_entries = max_entries
+        self._clock = clock
+        self._indexes: Dict[str, _ActionIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, action: str, prompt: str) -> Any | None:
+        threshold = SEMANTIC_THRESHOLDS.get(action)
+        if threshold is None:
+            return None
+        vector = self.vectorizer.transform(prompt)
+        signature = outcome_signature(prompt)
+        now = self._clock()
+        with self._lock:
+            index = self._indexes.get(action)
+            if index is None:
+                metrics.incr(f"llm.semantic.misses.{action}")
+                return None
+            row, score = index.best(vector, signature, now)
+            if row is None or score < threshold:
+                metrics.incr(f"llm.semantic.misses.{action}")
+                if row is not None and score > 0:
+                    metrics.observe(f"llm.semantic.best_miss.{action}", score)
+                return None
+            index.last_used[row] = now
+            value = index.values[row]
+        metrics.incr(f"llm.semantic.hits.{action}")
+        metrics.observe(f"llm.semantic.similarity.{action}", score)
+        return value
+
+    def set(self, action: str, prompt: str, value: Any, ttl: float) -> None:
+        if action not in SEMANTIC_THRESHOLDS:
+            return
+        vector = self.vectorizer.transform(prompt)
+        now = self._clock()
+        with self._lock:
+            index = self._indexes.get(action)
+            if index is None:
+                index = self._indexes[action] = _ActionIndex(
+                    self.vectorizer.np, self.max_entries, self.vectorizer.dim
+                )
+            index.add(vector, outcome_signature(prompt), value, now + ttl, now)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {action: index.size for action, index in self._indexes.items()}
+
+
+_SEMANTIC: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """The process-wide semantic cache, or ``None`` when disabled."""
+    global _SEMANTIC
+    if not settings.llm_semantic_cache:
+        return None
+    if _SEMANTIC is None:
+        _SEMANTIC = SemanticCache(settings.llm_semantic_cache_entries)
+        metrics.register_gauge("llm.semantic.entries", _SEMANTIC.stats)
+    return _SEMANTIC
@@ -0,0 +1,63 @@
+"""Split long text into token-bounded chunks for map-reduce prompting.
+
+Chunks break on line boundaries and are filled greedily from the start, so
+when a log only grows at the end every earlier chunk stays byte-identical and
+its cached summary is reused.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List
+
+from .tokens import DEFAULT_CHARS_PER_TOKEN, estimate_tokens
+
+CHARS_PER_TOKEN = DEFAULT_CHARS_PER_TOKEN
+
+
+def _pieces(text: str, max_tokens: int) -> Iterable[str]:
+    # Lines longer than a whole chunk are cut into chunk-sized pieces
+    max_chars = int(max_tokens * CHARS_PER_TOKEN)
+    for line in text.splitlines(keepends=True):
+        if estimate_tokens(line) <= max_tokens:
+            yield line
+        else:
+            for start in range(0, len(line), max_chars):
+                yield line[start : start + max_chars]
+
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """Split ``text`` into chunks of at most ``max_tokens`` estimated tokens."""
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for piece in _pieces(text, max_tokens):
+        tokens = estimate_tokens(piece)
+        if current and size + tokens > max_tokens:
+            chunks.append("".join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += tokens
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def group_texts(texts: List[str], max_tokens: int) -> List[List[str]]:
+    """Pack ``texts`` in order into groups within ``max_tokens``.
+
+    Every group holds at least two texts (when available) so repeated
+    grouping always shrinks the list.
+    """
+    groups: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if len(current) >= 2 and size + tokens > max_tokens:
+            groups.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += tokens
+    if current:
+        groups.append(current)
+    return groups
@@ -13,11 +13,14 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict
+from typing import Any, AsyncGenerator, Dict, List
 from abc import ABC, abstractmethod
 
 from app.config import settings
 
+from .loop_thread import PerLoop
+from .scheduler import get_scheduler
+
 
 class BaseLLMClient(ABC):
     @abstractmethod
@@ -26,9 +29,53 @@ class BaseLLMClient(ABC):
         prompt: str,
         model: str | None = None,
         temperature: float | None = None,
+        schema: Dict[str, Any] | None = None,
     ) -> Dict[str, Any]:
+        """Generate a JSON object, constrained to ``schema`` when given."""
         raise NotImplementedError
 
+    async def stream_payload(
+        self,
+        prompt: str,
+        model: str | None = None,
+        temperature: float | None = None,
+        schema: Dict[str, Any] | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Yield the generated JSON text as it arrives.
+
+        Closing the iterator early stops the generation.  Providers without
+        streaming yield the whole payload at once.
+        """
+        payload = await self.get_payload(prompt, model, temperature, schema)
+        yield json.dumps(payload)
+
+
+async def _aclose(stream: Any) -> None:
+    # Closing the provider stream drops the connection, which stops generation
+    aclose = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+    if aclose is not None:
+        result = aclose()
+        if hasattr(result, "__await__"):
+            await result
+
+
+def is_strict_schema(schema: Dict[str, Any]) -> bool:
+    """Whether ``schema`` satisfies OpenAI's strict structured-output rules.
+
+    Every object must list all of its properties as required and forbid
+    additional properties.
+    """
+    if schema.get("type") == "object":
+        properties = schema.get("properties")
+        if not properties or schema.get("additionalProperties") is not False:
+            return False
+        if set(schema.get("required", [])) != set(properties):
+            return False
+        return all(is_strict_schema(p) for p in properties.values())
+    if schema.get("type") == "array" and "items" in schema:
+        return is_strict_schema(schema["items"])
+    return True
+
 
 class OpenAIClient(BaseLLMClient):
     """Simple wrapper around the OpenAI chat completion API."""
@@ -56,23 +103,44 @@ class OpenAIClient(BaseLLMClient):
         if self.endpoint:
             self.openai.base_url = self.endpoint
 
-    async def get_payload(
+    def _request(
         self,
         prompt: str,
-        model: str | None = None,
-        temperature: float | None = None,
+        model: str | None,
+        temperature: float | None,
+        schema: Dict[str, Any] | None,
     ) -> Dict[str, Any]:
-        request = {
+        response_format: Dict[str, Any] = {"type": "json_object"}
+        if schema:
+            response_format = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "payload",
+                    "schema": schema,
+                    "strict": is_strict_schema(schema),
+                },
+            }
+        return {
             "model": model or self.model,
             "messages": [{"role": "user", "content": prompt}],
             "max_tokens": self.max_tokens,
             "temperature": temperature or self.temperature,
-            "response_format": {"type": "json_object"},
+            "response_format": response_format,
         }
-        try:
-            response = await self.openai.ChatCompletion.acreate(**request)
-        except Exception as exc:  # pragma: no cover
-            raise RuntimeError("LLM request failed") from exc
+
+    async def get_payload(
+        self,
+        prompt: str,
+        model: str | None = None,
+        temperature: float | None = None,
+        schema: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any]:
+        request = self._request(prompt, model, temperature, schema)
+        async with get_scheduler(self.endpoint).slot():
+            try:
+                response = await self.openai.ChatCompletion.acreate(**request)
+            except Exception as exc:  # pragma: no cover
+                raise RuntimeError("LLM request failed") from exc
 
         content = response.choices[0].message.content
         try:
@@ -81,39 +149,121 @@ class OpenAIClient(BaseLLMClient):
             raise ValueError(f"LLM did not return valid JSON: {content}") from exc
         return payload
 
+    async def stream_payload(
+        self,
+        prompt: str,
+        model: str | None = None,
+        temperature: float | None = None,
+        schema: Dict[str, Any] | None = None,
+    ) -> AsyncGenerator[str, None]:
+        request = self._request(prompt, model, temperature, schema)
+        async with get_scheduler(self.endpoint).slot():
+            try:
+                stream = await self.openai.ChatCompletion.acreate(
+                    **request, stream=True
+                )
+            except Exception as exc:  # pragma: no cover
+                raise RuntimeError("LLM request failed") from exc
+            try:
+                async for chunk in stream:
+                    content = getattr(chunk.choices[0].delta, "content", None)
+                    if content:
+                        yield content
+            finally:
+                await _aclose(stream)
+
+
+# Ollama reports model load time; above this the model was not in memory
+COLD_LOAD_SECONDS = 0.5
+
+
+def _record_load(response: Any) -> float:
+    try:
+        seconds = (response["load_duration"] or 0) / 1e9
+    except (KeyError, TypeError):
+        return 0.0
+    if seconds >= COLD_LOAD_SECONDS:
+        from app import metrics
+
+        metrics.incr("llm.cold_loads")
+        metrics.observe("llm.cold_load_seconds", seconds)
+    return seconds
+
 
 class OllamaClient(BaseLLMClient):
     """Client for Ollama."""
 
-    def __init__(self) -> None:
+    def __init__(self, host: str | None = None) -> None:
         try:
             import ollama
         except ImportError as exc:  # pragma: no cover
             raise RuntimeError(
                 "Ollama SDK not installed. Install with `pip install ollama`"
             ) from exc
-        self.client = ollama.AsyncClient(host=settings.llm_endpoint)
+        self.host = host or settings.llm_endpoint
+        # The SDK's httpx pool is bound to one event loop; sync callers run on
+        # the background loop, so each loop gets its own client
+        self._clients: PerLoop[Any] = PerLoop(
+            lambda: ollama.AsyncClient(host=self.host)
+        )
+        self._client: Any = None
         self.model = settings.llm_model
         self.temperature = float(os.getenv("LLM_TEMPERATURE", "0.2"))
 
-    async def get_payload(
+    @property
+    def client(self) -> Any:
+        if self._client is not None:
+            return self._client
+        return self._clients.get()
+
+    @client.setter
+    def client(self, client: Any) -> None:
+        # An injected client is used as is, on every loop
+        self._client = client
+
+    def _request(
         self,
         prompt: str,
-        model: str | None = None,
-        temperature: float | None = None,
+        model: str | None,
+        temperature: float | None,
+        schema: Dict[str, Any] | None,
+        stream: bool = False,
     ) -> Dict[str, Any]:
-        request = {
+        return {
             "model": model or self.model,
             "prompt": prompt,
-            "stream": False,
-            "format": "json",
+            "stream": stream,
+            # Ollama constrains decoding to a JSON schema passed as the format
+            "format": schema or "json",
             "options": {"temperature": temperature or self.temperature},
+            "keep_alive": settings.llm_keep_alive,
         }
-        try:
-            response = await self.client.generate(**request)  # type: ignore
-            content = response["response"]
-        except Exception as exc:  # pragma: no cover
-            raise RuntimeError("LLM request failed") from exc
+
+    async def warm_up(self, model: str | None = None) -> float:
+        """Load the model into memory; returns the load time in seconds."""
+        request = {
+            "model": model or self.model,
+            "prompt": "",
+            "keep_alive": settings.llm_keep_alive,
+        }
+        response = await self.client.generate(**request)  # type: ignore
+        return _record_load(response)
+
+    async def get_payload(
+        self,
+        prompt: str,
+        model: str | None = None,
+        temperature: float | None = None,
+        schema: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any]:
+        request = self._request(prompt, model, temperature, schema)
+        async with get_scheduler(self.host).slot():
+            try:
+                response = await self.client.generate(**request)  # type: ignore
+                content = response["response"]
+            except Exception as exc:  # pragma: no cover
+                raise RuntimeError("LLM request failed") from exc
+        _record_load(response)
 
         try:
             payload = json.loads(content)
@@ -121,9 +271,54 @@ class OllamaClient(BaseLLMClient):
             raise ValueError(f"LLM did not return valid JSON: {content}") from exc
         return payload
 
+    async def stream_payload(
+        self,
+        prompt: str,
+        model: str | None = None,
+        temperature: float | None = None,
+        schema: Dict[str, Any] | None = None,
+    ) -> AsyncGenerator[str, None]:
+        request = self._request(prompt, model, temperature, schema, stream=True)
+        async with get_scheduler(self.host).slot():
+            try:
+                stream = await self.client.generate(**request)  # type: ignore
+            except Exception as exc:  # pragma: no cover
+                raise RuntimeError("LLM request failed") from exc
+            try:
+                async for part in stream:
+                    _record_load(part)
+                    if part["response"]:
+                        yield part["response"]
+            finally:
+                await _aclose(stream)
+
+
+_ROUTER: BaseLLMClient | None = None
+
+
+def _routing_client(hosts: List[str]) -> BaseLLMClient:
+    # One router per process so every caller shares its latency statistics
+    global _ROUTER
+    if _ROUTER is None:
+        from app import metrics
+
+        from .router import RoutingClient
+
+        _ROUTER = RoutingClient(
+            [OllamaClient(host) for host in hosts],
+            hedge=settings.llm_hedge,
+            eject_failures=settings.llm_eject_failures,
+            eject_seconds=settings.llm_eject_seconds,
+        )
+        metrics.register_gauge("llm.backends", _ROUTER.stats)
+    return _ROUTER
+
 
 def get_llm_client() -> BaseLLMClient:
     if settings.llm_provider == "ollama":
+        hosts = [h.strip() for h in settings.llm_endpoints.split(",") if h.strip()]
+        if hosts:
+            return _routing_client(hosts)
         return OllamaClient()
     from importlib.util import find_spec
 
@@ -0,0 +1,72 @@
+"""Compact Ansible stdout before it is sent to the LLM.
+
+Escape codes, banner padding and runs of identical per-host ``ok`` or
+``skipping`` results carry no information for a summary but are billed as
+prompt tokens.  Failed, changed and every other line are kept verbatim.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from app import metrics
+
+logger = logging.getLogger(__name__)
+
+ANSI_RE = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]")
+BANNER_RE = re.compile(r"\s*\*{3,}\s*$")
+HOST_RESULT_RE = re.compile(r"^(ok|skipping): \[([^\]]+)\](.*)$")
+
+
+def _flush(status: str, rest: str, hosts: List[str]) -> str:
+    if len(hosts) == 1:
+        return f"{status}: [{hosts[0]}]{rest}"
+    return f"{status}: {len(hosts)} hosts{rest}"
+
+
+def compact_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield compacted lines (without newlines) as input lines arrive."""
+    run: Optional[Tuple[str, str]] = None
+    hosts: List[str] = []
+    blank = False
+    for line in lines:
+        line = ANSI_RE.sub("", line).rstrip("\r\n")
+        line = BANNER_RE.sub("", line).rstrip()
+        match = HOST_RESULT_RE.match(line)
+        if match:
+            status, host, rest = match.groups()
+            if run == (status, rest):
+                hosts.append(host)
+                continue
+            if run is not None:
+                yield _flush(*run, hosts)
+            run, hosts = (status, rest), [host]
+            blank = False
+            continue
+        if run is not None:
+            yield _flush(*run, hosts)
+            run, hosts = None, []
+        if not line:
+            if blank:
+                continue
+            blank = True
+        else:
+            blank = False
+        yield line
+    if run is not None:
+        yield _flush(*run, hosts)
+
+
+def compact_log(log: str) -> Tuple[str, float]:
+    """Return the compacted log and its size as a fraction of the original."""
+    compacted = "\n".join(compact_lines(log.splitlines()))
+    if log.endswith("\n"):
+        compacted += "\n"
+    ratio = len(compacted) / len(log) if log else 1.0
+    metrics.incr("llm.compaction.chars_in", len(log))
+    metrics.incr("llm.compaction.chars_out", len(compacted))
+    metrics.observe("llm.compaction.ratio", ratio)
+    logger.debug(f"Compacted log from {len(log)} to {len(compacted)} chars")
+    return compacted, ratio
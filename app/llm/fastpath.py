@@ -0,0 +1,79 @@
+"""Deterministic generators for actions that need no LLM.
+
+Some prompts only ask the model to copy inputs into a JSON wrapper or to run
+a check that `jsonschema` does exactly.  A fast path builds the schema-valid
+payload directly and returns ``None`` when the inputs need interpretation, in
+which case the caller falls back to the LLM.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, Optional
+
+from jsonschema.exceptions import SchemaError
+
+from app.schema.validator import compile_schema
+
+FastPath = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+FAST_PATHS: Dict[str, FastPath] = {}
+
+
+def fast_path(action: str) -> Callable[[FastPath], FastPath]:
+    """Register a deterministic generator for ``action``."""
+
+    def register(fn: FastPath) -> FastPath:
+        FAST_PATHS[action] = fn
+        return fn
+
+    return register
+
+
+def _as_object(value: Any) -> Optional[Dict[str, Any]]:
+    """Accept a dict or a JSON string encoding one."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    return value if isinstance(value, dict) else None
+
+
+@fast_path("launch_job_template")
+def launch_job_template(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    template_id = payload.get("template_id")
+    if isinstance(template_id, str) and template_id.strip().isdigit():
+        template_id = int(template_id)
+    if isinstance(template_id, bool) or not isinstance(template_id, int):
+        return None
+    if template_id <= 0:
+        return None
+    extra_vars = payload.get("extra_vars")
+    extra_vars = {} if extra_vars in (None, "") else _as_object(extra_vars)
+    if extra_vars is None:
+        return None
+    return {"result": {"template_id": template_id, "extra_vars": extra_vars}}
+
+
+@fast_path("validate_schema")
+def validate_schema(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    instance = _as_object(payload.get("payload"))
+    schema = _as_object(payload.get("schema"))
+    if instance is None or schema is None:
+        return None
+    try:
+        validator = compile_schema(schema)
+    except SchemaError:
+        return None
+    errors = [e.message for e in validator.iter_errors(instance)]
+    if errors:
+        return {"result": {"valid": False, "errors": errors}}
+    return {"result": {"valid": True}}
+
+
+def try_fast_path(action: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    generator = FAST_PATHS.get(action)
+    if generator is None:
+        return None
+    return generator(payload)
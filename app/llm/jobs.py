@@ -0,0 +1,69 @@
+"""Summarize many AWX jobs at once for failure triage.
+
+Job output is fetched and summarized concurrently (at most
+``LLM_SUMMARY_JOBS_CONCURRENCY`` jobs at a time) at background LLM priority,
+so interactive requests are served first.  Summaries of finished jobs are
+cached by job id.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List
+
+from app.jobs.tracker import is_terminal
+
+from .cache import cache_aget, cache_aset, make_cache_key, ttl_for
+from .scheduler import llm_priority
+
+logger = logging.getLogger(__name__)
+
+JOB_FIELDS = ("id", "name", "status", "finished")
+
+
+def _job_fields(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: job.get(field) for field in JOB_FIELDS}
+
+
+async def summarize_job(
+    client: Any, service: Any, job: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Summarize one job's stdout, reusing the cached summary if there is one."""
+    # Keyed like PromptService's own entries, so a new model misses
+    model = getattr(getattr(service, "client", None), "model", None)
+    key = make_cache_key("summarize_job", job["id"], model=model)
+    summary = await cache_aget(key)
+    if summary is not None:
+        return {**_job_fields(job), "summary": summary, "cached": True}
+    stdout = await client.get_job_stdout(job["id"])
+    result = await service.summarize_log(stdout)
+    summary = result["result"]["summary"]
+    if is_terminal(job):
+        await cache_aset(key, summary, ttl_for("summarize_job"))
+    return {**_job_fields(job), "summary": summary, "cached": False}
+
+
+async def summarize_jobs(
+    client: Any, service: Any, jobs: List[Dict[str, Any]], concurrency: int
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield each job's summary (or error) as soon as it is ready."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(job: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return await summarize_job(client, service, job)
+            except Exception as exc:
+                logger.warning(f"Summarizing job {job.get('id')} failed: {exc}")
+                return {**_job_fields(job), "error": str(exc)}
+
+    # Tasks copy the context, and with it the background priority
+    with llm_priority("background"):
+        tasks = [asyncio.create_task(one(job)) for job in jobs]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
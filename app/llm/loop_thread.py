@@ -0,0 +1,109 @@
+"""A persistent event loop thread for synchronous callers.
+
+``asyncio.run`` creates and closes an event loop per call, which throws away
+connection pools.  Sync code instead
+submits coroutines to one long-lived loop running in a daemon thread, so
+every sync call reuses the same connections, in-flight deduplication and
+caches.
+
+SDK clients built on httpx or redis.asyncio are bound to the loop they were
+first used on, so the app loop and the background loop each get their own
+instance through :class:`PerLoop`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import weakref
+from typing import Any, Callable, Coroutine, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PerLoop(Generic[T]):
+    """One instance of a loop-bound resource per running event loop."""
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._items: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            item = self._items.get(loop)
+            if item is None:
+                item = self._items[loop] = self._factory()
+            return item
+
+
+class BackgroundLoop:
+    def __init__(self, name: str = "llm-sync-loop") -> None:
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                thread = threading.Thread(target=run, name=self.name, daemon=True)
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def run(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        timeout: float | None = None,
+        block_running_loop: bool = False,
+    ) -> Any:
+        """Run ``coro`` on the background loop and block for its result.
+
+        Like ``asyncio.run`` this refuses to block a thread whose event loop
+        is running, since the background call could wait on work that loop
+        owns.  Callers that know it cannot pass ``block_running_loop=True``;
+        the background loop itself is never blocked.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None and (not block_running_loop or running is self._loop):
+            coro.close()
+            raise RuntimeError(
+                "BackgroundLoop.run() cannot be called from a running event loop"
+            )
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
+
+
+# Shared by every synchronous caller in the process
+background_loop = BackgroundLoop()
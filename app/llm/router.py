@@ -0,0 +1,229 @@
+"""Route LLM calls across a pool of equivalent backends.
+
+Each backend tracks an exponentially weighted moving average of its latency
+and the number of calls in flight, and a call goes to the healthy backend
+with the lowest ``ewma * (in_flight + 1)``.  With hedging enabled, a call that
+runs past the backend's p95 latency is duplicated on a second backend and the
+slower of the two is cancelled.  A backend that fails ``eject_failures`` times
+in a row is left out for ``eject_seconds`` and then tried again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AbstractSet, Any, AsyncGenerator, Callable, Dict, List, Optional
+
+from app import metrics
+
+from .client import BaseLLMClient
+from .scheduler import LLMOverloaded
+
+logger = logging.getLogger(__name__)
+
+
+class Backend:
+    def __init__(
+        self,
+        client: BaseLLMClient,
+        name: str,
+        alpha: float = 0.2,
+        window: int = 200,
+    ) -> None:
+        self.client = client
+        self.name = name
+        self.alpha = alpha
+        self.ewma: Optional[float] = None
+        self.in_flight = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self._latencies: deque = deque(maxlen=window)
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def score(self) -> float:
+        # Backends without samples yet score 0 so they get tried
+        return (self.ewma or 0.0) * (self.in_flight + 1)
+
+    def p95(self, min_samples: int = 10) -> Optional[float]:
+        if len(self._latencies) < min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def record_success(self, latency: float) -> None:
+        self._latencies.append(latency)
+        if self.ewma is None:
+            self.ewma = latency
+        else:
+            self.ewma = self.alpha * latency + (1 - self.alpha) * self.ewma
+        if self.failures:
+            logger.info(f"LLM backend {self.name} recovered")
+        self.failures = 0
+
+    def record_failure(self, now: float, eject_failures: int, eject_seconds: float):
+        self.failures += 1
+        if self.failures >= eject_failures:
+            self.ejected_until = now + eject_seconds
+            metrics.incr("llm.router.ejections")
+            logger.warning(
+                f"Ejecting LLM backend {self.name} for {eject_seconds}s "
+                f"after {self.failures} failures"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ewma": self.ewma,
+            "p95": self.p95(),
+            "in_flight": self.in_flight,
+            "failures": self.failures,
+            "ejected": not self.available(time.monotonic()),
+        }
+
+
+class RoutingClient(BaseLLMClient):
+    def __init__(
+        self,
+        clients: List[BaseLLMClient],
+        hedge: bool = False,
+        eject_failures: int = 3,
+        eject_seconds: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not clients:
+            raise ValueError("RoutingClient needs at least one backend")
+        self.backends = [
+            Backend(c, getattr(c, "host", None) or f"backend-{i}")
+            for i, c in enumerate(clients)
+        ]
+        self.model = getattr(clients[0], "model", None)
+        self.hedge = hedge
+        self.eject_failures = eject_failures
+        self.eject_seconds = eject_seconds
+        self._clock = clock
+
+    def pick(self, exclude: Optional[AbstractSet[Backend]] = None) -> Optional[Backend]:
+        """Least loaded healthy backend not in ``exclude``.
+
+        When nothing else is left the first choice falls back to the backend
+        whose ejection ends soonest, so callers always get an attempt.
+        """
+        now = self._clock()
+        candidates = [b for b in self.backends if not exclude or b not in exclude]
+        healthy = [b for b in candidates if b.available(now)]
+        if healthy:
+            return min(healthy, key=lambda b: b.score())
+        if candidates and not exclude:
+            return min(candidates, key=lambda b: b.ejected_until)
+        return None
+
+    def _first(self) -> Backend:
+        backend = self.pick()
+        assert backend is not None  # never None without exclusions
+        return backend
+
+    async def _call(self, backend: Backend, prompt: str, kwargs: Dict[str, Any]):
+        backend.in_flight += 1
+        start = self._clock()
+        try:
+            result = await backend.client.get_payload(prompt, **kwargs)
+        except (ValueError, LLMOverloaded):
+            # The backend answered badly or was busy; it is not unhealthy
+            raise
+        except Exception:
+            backend.record_failure(
+                self._clock(), self.eject_failures, self.eject_seconds
+            )
+            raise
+        else:
+            backend.record_success(self._clock() - start)
+            return result
+        finally:
+            backend.in_flight -= 1
+
+    async def get_payload(
+        self,
+        prompt: str,
+        model: str | None = None,
+        temperature: float | None = None,
+        schema: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any]:
+        kwargs = {"model": model, "temperature": temperature, "schema": schema}
+        primary = self._first()
+        tried = {primary}
+        tasks = {asyncio.create_task(self._call(primary, prompt, kwargs)): primary}
+        error: BaseException | None = None
+        try:
+            hedge_after = primary.p95() if self.hedge else None
+            if hedge_after is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+                backup = None if done else self.pick(exclude=tried)
+                if backup is not None:
+                    metrics.incr("llm.router.hedges")
+                    tried.add(backup)
+                    task = asyncio.create_task(self._call(backup, prompt, kwargs))
+                    tasks[task] = backup
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    backend = tasks.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if backend is not primary:
+                            metrics.incr("llm.router.hedge_wins")
+                        return task.result()
+                    if isinstance(error, ValueError):
+                        raise error
+                if not tasks:
+                    # Everything in flight failed; fail over to an untried backend
+                    backup = self.pick(exclude=tried)
+                    if backup is not None:
+                        metrics.incr("llm.router.failovers")
+                        tried.add(backup)
+                        task = asyncio.create_task(self._call(backup, prompt, kwargs))
+                        tasks[task] = backup
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stream_payload(
+        self,
+        prompt: str,
+        model: str | None = None,
+        temperature: float | None = None,
+        schema: Dict[str, Any] | None = None,
+    ) -> AsyncGenerator[str, None]:
+        # Streams are not hedged; the first token already reaches the caller
+        backend = self._first()
+        backend.in_flight += 1
+        start = self._clock()
+        tokens = backend.client.stream_payload(
+            prompt, model=model, temperature=temperature, schema=schema
+        )
+        try:
+            async for token in tokens:
+                yield token
+        except GeneratorExit:
+            # The caller stopped reading once it had what it needed
+            backend.record_success(self._clock() - start)
+            raise
+        except Exception:
+            backend.record_failure(
+                self._clock(), self.eject_failures, self.eject_seconds
+            )
+            raise
+        else:
+            backend.record_success(self._clock() - start)
+        finally:
+            backend.in_flight -= 1
+            await tokens.aclose()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {b.name: b.stats() for b in self.backends}
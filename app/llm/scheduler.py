@@ -0,0 +1,231 @@
+"""Priority queue in front of each LLM backend.
+
+Every backend (Ollama host or OpenAI endpoint) runs at most
+``LLM_BACKEND_CONCURRENCY`` generations at once.  Callers beyond that wait in
+a queue ordered by priority class, then deadline.  The class and deadline
+travel with the request in context variables, set with :func:`llm_priority`::
+
+    with llm_priority("background"):
+        await service.summarize_log(log)
+
+A request that finds a free slot always runs.  One that has to queue is shed
+with :class:`LLMOverloaded` when its place in the queue times the average
+generation time already overruns its deadline, or once the deadline passes
+while it waits, instead of holding a slot for an answer nobody waits for.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from app import metrics
+from app.config import settings
+
+# Lower value is served first
+PRIORITIES: Dict[str, int] = {"interactive": 0, "background": 1}
+
+_priority: ContextVar[str] = ContextVar("llm_priority", default="interactive")
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+
+class LLMOverloaded(RuntimeError):
+    """The request was shed because it could not finish before its deadline."""
+
+
+@contextlib.contextmanager
+def llm_priority(priority: str, timeout: Optional[float] = None) -> Iterator[None]:
+    """Run LLM calls in this block with ``priority`` and an optional deadline."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority {priority}")
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    tokens = (_priority.set(priority), _deadline.set(deadline))
+    try:
+        yield
+    finally:
+        _priority.reset(tokens[0])
+        _deadline.reset(tokens[1])
+
+
+def _default_timeout(priority: str) -> Optional[float]:
+    if priority == "interactive":
+        return settings.llm_interactive_deadline
+    return None
+
+
+class Scheduler:
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        clock: Callable[[], float] = time.monotonic,
+        alpha: float = 0.2,
+    ) -> None:
+        self.name = name
+        self.limit = limit
+        self.active = 0
+        self.service_time: Optional[float] = None
+        self._alpha = alpha
+        self._clock = clock
+        # [priority, deadline, seq, future, class]
+        self._queue: List[List[Any]] = []
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        # Granted slots per event loop, for holds()
+        self._holders: Dict[asyncio.AbstractEventLoop, int] = {}
+
+    def _expected_wait(self, entry: List[Any]) -> float:
+        # Every ``limit`` requests served before this one take about one
+        # average generation; so does freeing the slot it will take
+        ahead = sum(1 for e in self._queue if e[:3] < entry and not e[3].done())
+        return (ahead // self.limit + 1) * (self.service_time or 0.0)
+
+    def _shed(self, priority: str) -> LLMOverloaded:
+        metrics.incr(f"llm.shed.{priority}")
+        return LLMOverloaded(f"LLM backend {self.name} cannot meet the deadline")
+
+    def _grant(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.active += 1
+        self._holders[loop] = self._holders.get(loop, 0) + 1
+
+    async def _acquire(self, priority: str, deadline: Optional[float]) -> None:
+        now = self._clock()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            # A free slot is always granted; only queueing can miss a deadline
+            if self.active < self.limit and not self._queue:
+                self._grant(loop)
+                return
+            entry = [PRIORITIES[priority], deadline or math.inf, next(self._seq)]
+            if deadline is not None and now + self._expected_wait(entry) > deadline:
+                raise self._shed(priority)
+            heapq.heappush(self._queue, entry + [future, priority])
+        timeout = None if deadline is None else max(0.0, deadline - now)
+        try:
+            done, _ = await asyncio.wait({future}, timeout=timeout)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and not future.exception():
+                self._release(loop)
+            future.cancel()
+            raise
+        if not done:
+            future.cancel()
+            raise self._shed(priority)
+        future.result()
+
+    def _release(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        with self._lock:
+            self.active -= 1
+            if loop is not None and loop in self._holders:
+                self._holders[loop] -= 1
+                if not self._holders[loop]:
+                    del self._holders[loop]
+            now = self._clock()
+            while self._queue and self.active < self.limit:
+                _, deadline, _, future, priority = heapq.heappop(self._queue)
+                if future.done():
+                    continue
+                if deadline <= now:
+                    self._deliver(future, self._shed(priority))
+                    continue
+                self._grant(future.get_loop())
+                self._deliver(future, None)
+
+    def _deliver(self, future: asyncio.Future, error: Optional[Exception]) -> None:
+        # Waiters may belong to another thread's event loop (sync callers)
+        def apply() -> None:
+            if future.done():
+                # The waiter gave up meanwhile; hand its slot on
+                if error is None:
+                    self._release(future.get_loop())
+            elif error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+        loop = future.get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is running:
+            apply()
+            return
+        if not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(apply)
+                return
+            except RuntimeError:
+                pass  # closed in the meantime
+        # Nobody is left to wait on a closed loop; pass a granted slot on
+        if error is None:
+            self._release(loop)
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the backend's generation slots for the block."""
+        priority = _priority.get()
+        deadline = _deadline.get()
+        queued_at = self._clock()
+        if deadline is None:
+            timeout = _default_timeout(priority)
+            deadline = queued_at + timeout if timeout is not None else None
+        await self._acquire(priority, deadline)
+        started = self._clock()
+        metrics.observe(f"llm.queue_wait.{priority}", started - queued_at)
+        try:
+            yield
+        finally:
+            duration = self._clock() - started
+            if self.service_time is None:
+                self.service_time = duration
+            else:
+                self.service_time += self._alpha * (duration - self.service_time)
+            self._release(asyncio.get_running_loop())
+
+    def holds(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Whether tasks on ``loop`` hold or wait for a slot of this backend."""
+        with self._lock:
+            return loop in self._holders or any(
+                e[3].get_loop() is loop and not e[3].done() for e in self._queue
+            )
+
+    def queued(self, priority: str) -> int:
+        return sum(1 for e in self._queue if e[4] == priority and not e[3].done())
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"active": self.active, "limit": self.limit}
+        for priority in PRIORITIES:
+            stats[f"queued.{priority}"] = self.queued(priority)
+        return stats
+
+
+_SCHEDULERS: Dict[str, Scheduler] = {}
+
+
+def get_scheduler(name: Optional[str]) -> Scheduler:
+    """Shared scheduler for the backend ``name`` (host or endpoint URL)."""
+    name = name or "default"
+    scheduler = _SCHEDULERS.get(name)
+    if scheduler is None:
+        scheduler = _SCHEDULERS[name] = Scheduler(
+            name, settings.llm_backend_concurrency
+        )
+    return scheduler
+
+
+def loop_holds_slot(loop: asyncio.AbstractEventLoop) -> bool:
+    """Whether blocking ``loop`` could stall a backend queue."""
+    return any(s.holds(loop) for s in _SCHEDULERS.values())
+
+
+def queue_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: s.stats() for name, s in _SCHEDULERS.items()}
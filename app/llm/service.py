@@ -10,25 +10,49 @@ from __future__ import annotations
 
 import asyncio
 import json
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List
 
+from .cache import CACHE_ENABLED, cache_aget, cache_aset, make_cache_key, ttl_for
+from .cache_semantic import get_semantic_cache
+from .chunking import group_texts, split_text
 from .client import get_llm_client
+from .compaction import compact_log
+from .fastpath import try_fast_path
+from .loop_thread import background_loop
+from .scheduler import loop_holds_slot
+from .singleflight import SingleFlight
+from .stream import IncrementalJSON, required_fields
 from .templates import TEMPLATES
+from .truncation import fit_prompt
 
+from app import metrics
+from app.config import settings
 from app.schema.registry import get_schema
+from app.schema.validator import compile_schema
 
-# Optional: simple in‑memory cache (replace with redis if needed)
-_CACHE: Dict[str, Any] = {}
+
+def _numbered(summaries: List[str]) -> str:
+    return "\n".join(f"{i}. {s}" for i, s in enumerate(summaries, 1))
+
+
+# Identical generations in progress, shared by every PromptService instance
+_INFLIGHT = SingleFlight()
 
 
 class PromptService:
     def __init__(self) -> None:
         self.client = get_llm_client()
 
-    def _cache_key(self, action: str, payload: Dict[str, Any]) -> str:
-        # Use a deterministic hash of the action + sorted payload
-        key = f"{action}:{json.dumps(payload, sort_keys=True)}"
-        return key
+    def _cache_key(
+        self, action: str, payload: Dict[str, Any], temperature: float | None = None
+    ) -> str:
+        # Compact hash of the action, inputs and generation settings
+        model = getattr(self.client, "model", None)
+        return make_cache_key(action, payload, model=model, temperature=temperature)
+
+    def _render(self, action: str, payload: Dict[str, Any]) -> str:
+        model = getattr(self.client, "model", None)
+        return fit_prompt(action, TEMPLATES[action], payload, model)
 
     async def generate_payload(
         self, action: str, payload: Dict[str, Any]
@@ -37,32 +61,54 @@ class PromptService:
         if action not in TEMPLATES:
             raise ValueError(f"Unknown action {action}")
 
-        # 2. Build the prompt
-        template = TEMPLATES[action]
-        # Render placeholders – assume simple string format
-        prompt = template.format(**payload)
+        # 1b. Actions that are pure data transforms skip the LLM entirely
+        fast = try_fast_path(action, payload)
+        if fast is not None:
+            metrics.incr(f"llm.fast_path.{action}")
+            return fast
 
-        # 3. Check cache
-        key = self._cache_key(action, payload)
-        if key in _CACHE:
-            return _CACHE[key]
+        # 2. Build the prompt, truncated to the model's token budget
+        prompt = self._render(action, payload)
 
-        # 4. Call LLM
+        # 3. Check cache
         if action == "validate_schema":
             temperature = 0.8
         else:
             temperature = 0.2
-        result = await self.client.get_payload(prompt, temperature=temperature)
+        key = self._cache_key(action, payload, temperature)
+        if CACHE_ENABLED:
+            cached = await cache_aget(key)
+            if cached is not None:
+                return cached
+            # 3b. A differently phrased but near-identical prompt
+            semantic = get_semantic_cache()
+            if semantic is not None:
+                cached = semantic.get(action, prompt)
+                if cached is not None:
+                    return cached
 
-        # 5. Validate result against schema
+        # 4. Generate, sharing the call with concurrent identical requests
+        return await _INFLIGHT.do(
+            key, lambda: self._generate(action, prompt, temperature, key)
+        )
+
+    async def _generate(
+        self, action: str, prompt: str, temperature: float, key: str
+    ) -> Dict[str, Any]:
+        # The schema constrains decoding where the provider supports it and is
+        # still checked afterwards for providers that only approximate it
         schema = get_schema("AWX", action)
+        result = await self.client.get_payload(
+            prompt, temperature=temperature, schema=schema
+        )
+
+        # 5. Validate result against schema
         if schema:
-            # Use jsonschema for validation
-            import jsonschema
+            # Validators are compiled once per schema and reused
             from jsonschema import ValidationError
 
             try:
-                jsonschema.validate(result, schema)
+                compile_schema(schema).validate(result)
             except ValidationError as exc:  # pragma: no cover
                 raise ValueError(f"LLM payload does not match schema: {exc}") from exc
         else:
@@ -73,11 +119,155 @@ class PromptService:
             )
 
         # 6. Cache & return
-        _CACHE[key] = result
+        if CACHE_ENABLED:
+            await cache_aset(key, result, ttl_for(action))
+            semantic = get_semantic_cache()
+            if semantic is not None:
+                semantic.set(action, prompt, result, ttl_for(action))
         return result
 
+    async def stream_payload(
+        self, action: str, payload: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a generation as ``{"delta": text}`` events.
+
+        The last event is ``{"payload": result}`` with the validated object.
+        Generation stops as soon as every required field is complete.
+        Streams are not shared with concurrent identical requests.
+        """
+        if action not in TEMPLATES:
+            raise ValueError(f"Unknown action {action}")
+        result = try_fast_path(action, payload)
+        if result is not None:
+            metrics.incr(f"llm.fast_path.{action}")
+        else:
+            temperature = 0.8 if action == "validate_schema" else 0.2
+            key = self._cache_key(action, payload, temperature)
+            if CACHE_ENABLED:
+                result = await cache_aget(key)
+        if result is not None:
+            yield {"delta": json.dumps(result)}
+            yield {"payload": result}
+            return
+
+        prompt = self._render(action, payload)
+        schema = get_schema("AWX", action)
+        parser = IncrementalJSON(required_fields(schema))
+        tokens = self.client.stream_payload(
+            prompt, temperature=temperature, schema=schema
+        )
+        try:
+            async for token in tokens:
+                yield {"delta": token}
+                if parser.feed(token):
+                    break
+        finally:
+            await tokens.aclose()
+
+        result = parser.result()
+        if schema:
+            from jsonschema import ValidationError
+
+            try:
+                compile_schema(schema).validate(result)
+            except ValidationError as exc:
+                raise ValueError(f"LLM payload does not match schema: {exc}") from exc
+        if CACHE_ENABLED:
+            await cache_aset(key, result, ttl_for(action))
+        yield {"payload": result}
+
+    async def summarize_log(self, log: str) -> Dict[str, Any]:
+        """Summarize a log of any size.
+
+        Logs over ``LLM_SUMMARY_CHUNK_TOKENS`` are split into chunks that are
+        summarized concurrently (each cached by content), and the partial
+        summaries are then reduced into one.  The log is compacted first.
+        """
+        log, _ = compact_log(log)
+        chunks = split_text(log, settings.llm_summary_chunk_tokens)
+        if len(chunks) <= 1:
+            return await self.generate_payload("summarize_log", {"log": log})
+        summaries = await self._reduce_to_group(await self._map_summaries(chunks))
+        return await self.generate_payload(
+            "reduce_summaries", {"summaries": _numbered(summaries)}
+        )
+
+    async def stream_log_summary(self, log: str) -> AsyncIterator[Dict[str, Any]]:
+        """Like :meth:`summarize_log`, streaming the final generation."""
+        log, _ = compact_log(log)
+        chunks = split_text(log, settings.llm_summary_chunk_tokens)
+        if len(chunks) <= 1:
+            action, payload = "summarize_log", {"log": log}
+        else:
+            summaries = await self._reduce_to_group(await self._map_summaries(chunks))
+            action, payload = "reduce_summaries", {"summaries": _numbered(summaries)}
+        async for event in self.stream_payload(action, payload):
+            yield event
+
+    async def _map_summaries(self, chunks: List[str]) -> List[str]:
+        metrics.incr("llm.summarize.chunks", len(chunks))
+        return await self._bounded(
+            [
+                self._summary_of(self.generate_payload("summarize_log", {"log": c}))
+                for c in chunks
+            ]
+        )
+
+    async def _reduce_to_group(self, summaries: List[str]) -> List[str]:
+        """Reduce partial summaries until they fit one reduce prompt."""
+        while True:
+            groups = group_texts(summaries, settings.llm_summary_chunk_tokens)
+            if len(groups) == 1:
+                return groups[0]
+            metrics.incr("llm.summarize.reduces", len(groups))
+            summaries = await self._bounded(
+                [
+                    self._summary_of(
+                        self.generate_payload(
+                            "reduce_summaries", {"summaries": _numbered(group)}
+                        )
+                    )
+                    for group in groups
+                ]
+            )
+
+    @staticmethod
+    async def _summary_of(result) -> str:
+        return (await result)["result"]["summary"]
+
+    @staticmethod
+    async def _bounded(calls: List) -> List[Any]:
+        semaphore = asyncio.Semaphore(settings.llm_summary_concurrency)
+
+        async def run(call):
+            async with semaphore:
+                return await call
+
+        return list(await asyncio.gather(*(run(c) for c in calls)))
+
     # Synchronous wrapper for convenience
     def generate_payload_sync(
         self, action: str, payload: Dict[str, Any]
     ) -> Dict[str, Any]:
-        return asyncio.run(self.generate_payload(action, payload))
+        """Blocking :meth:`generate_payload` on the shared background loop.
+
+        Connections, caches and in-flight calls are shared with async callers.
+        Called from a running event loop it blocks that loop until the result
+        arrives, which is only allowed while no task on it holds or waits for
+        an LLM backend slot; otherwise the backend queue could stall and a
+        ``RuntimeError`` is raised.  Async code should await
+        :meth:`generate_payload` instead.
+        """
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None and loop_holds_slot(loop):
+            raise RuntimeError(
+                "generate_payload_sync() would block an event loop that holds "
+                "an LLM backend slot; await generate_payload() instead"
+            )
+        return background_loop.run(
+            self.generate_payload(action, payload),
+            block_running_loop=loop is not None,
+        )
@@ -0,0 +1,35 @@
+"""Collapse concurrent identical LLM generations into a single call.
+
+The first caller for a key starts the work as a task; every caller that
+arrives while it is running awaits the same task.  The entry is removed as
+soon as the task finishes, so a failure reaches all current waiters but the
+next caller starts a fresh attempt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        task = self._calls.get(key)
+        # Tasks cannot be awaited from another event loop; run independently
+        if task is None or task.get_loop() is not loop:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # Shield so one cancelled caller does not cancel the shared work
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
@@ -0,0 +1,124 @@
+"""Incremental parsing of a JSON object generated token by token.
+
+:class:`IncrementalJSON` scans text as it arrives and notes where each
+top-level member ends, so a caller can stop generation as soon as the object
+is closed or every required field is complete, and still parse the result.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+
+class IncrementalJSON:
+    def __init__(self, required: Iterable[str] = ()) -> None:
+        self.required: Set[str] = set(required)
+        self.completed: Set[str] = set()
+        self.done = False
+        self._buf: List[str] = []
+        self._len = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key_start: Optional[int] = None
+        self._key_chars: List[str] = []
+        self._current_key: Optional[str] = None
+        self._start: Optional[int] = None
+        self._member_end: Optional[int] = None
+        self._end: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._buf)
+
+    def feed(self, chunk: str) -> bool:
+        """Consume ``chunk``; return True once enough output has arrived."""
+        if self.done:
+            return True
+        for ch in chunk:
+            pos = self._len
+            self._buf.append(ch)
+            self._len += 1
+            if self._in_string:
+                if self._key_start is not None:
+                    self._key_chars.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._current_key = json.loads('"' + "".join(self._key_chars))
+                        self._key_start = None
+                continue
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = pos
+                    self._key_chars = []
+                    self._expect_key = False
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._start = pos
+                    self._expect_key = ch == "{"
+            elif ch in "}]" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_member(pos)
+                    self._end = pos + 1
+                    self.done = True
+                    return True
+            elif ch == "," and self._depth == 1:
+                self._finish_member(pos)
+                self._expect_key = True
+        if self.required and self.required <= self.completed:
+            self.done = True
+        return self.done
+
+    def _finish_member(self, end: int) -> None:
+        if self._current_key is not None:
+            self.completed.add(self._current_key)
+            self._member_end = end
+            self._current_key = None
+
+    def result(self) -> Any:
+        """Parse the object, dropping any member that was still incomplete."""
+        text = self.text
+        if self._start is None:
+            raise ValueError(f"LLM did not return valid JSON: {text}")
+        if self._end is not None:
+            raw = text[self._start : self._end]
+        elif self._member_end is not None:
+            raw = text[self._start : self._member_end] + "}"
+        else:
+            raise ValueError(f"LLM did not return valid JSON: {text}")
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"LLM did not return valid JSON: {text}") from exc
+
+
+def required_fields(schema: Optional[Dict[str, Any]]) -> List[str]:
+    if not schema or schema.get("type") != "object":
+        return []
+    return list(schema.get("required", []))
+
+
+async def collect_json(
+    tokens: AsyncIterator[str], schema: Optional[Dict[str, Any]] = None
+) -> Any:
+    """Read ``tokens`` until the JSON object is usable, then stop the stream."""
+    parser = IncrementalJSON(required_fields(schema))
+    try:
+        async for token in tokens:
+            if parser.feed(token):
+                break
+    finally:
+        aclose = getattr(tokens, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return parser.result()
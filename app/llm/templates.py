@@ -21,6 +21,13 @@ SUMMARIZE_LOG_TEMPLATE = (
     'Only return a JSON object in the format {{"result": {{"summary": "<concise summary>"}}}}, no markdown or explanations.'
 )
 
+# Template for combining summaries of consecutive chunks of one AWX log
+REDUCE_SUMMARIES_TEMPLATE = (
+    "You are given summaries of consecutive parts of one AWX log, in order:\n{summaries}\n"
+    "Think step-by-step: merge them into one summary of the key events and outcomes in 80 words, keeping every failure.\n"
+    'Only return a JSON object in the format {{"result": {{"summary": "<concise summary>"}}}}, no markdown or explanations.'
+)
+
 GET_AWX_STATUS_TEMPLATE = (
     "You are given AWX instance URL and credentials.\n"
     "Think step-by-step: perform a GET request to '/api/v2/status/' and extract the status code and body.\n"
@@ -37,6 +44,7 @@ TEMPLATES = {
     "launch_job_template": LAUNCH_JOB_TEMPLATE,
     "validate_schema": VALIDATE_SCHEMA_TEMPLATE,
     "summarize_log": SUMMARIZE_LOG_TEMPLATE,
+    "reduce_summaries": REDUCE_SUMMARIES_TEMPLATE,
     "get_awx_status": GET_AWX_STATUS_TEMPLATE,
     "create_project": CREATE_PROJECT_TEMPLATE,
 }
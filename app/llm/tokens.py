@@ -0,0 +1,68 @@
+"""Local token estimates and prompt budgets per model family.
+
+Estimates use an average characters-per-token ratio for each tokenizer
+family.  They are cheap enough to run on every prompt and err on the high
+side, which is what a budget check needs.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Optional
+
+from app.config import settings
+
+# Average characters per token, by model name prefix
+CHARS_PER_TOKEN: Dict[str, float] = {
+    "gpt-4o": 4.0,
+    "gpt": 3.8,
+    "llama": 3.5,
+    "mistral": 3.3,
+    "mixtral": 3.3,
+    "qwen": 3.2,
+    "gemma": 3.6,
+    "phi": 3.5,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.5
+
+# Context window sizes in tokens, by model name prefix
+CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5": 16385,
+    "llama3": 8192,
+    "llama2": 4096,
+    "mistral": 32768,
+    "mixtral": 32768,
+    "qwen": 32768,
+    "gemma": 8192,
+    "phi": 4096,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+
+def _lookup(table: Dict, model: Optional[str], default):
+    # Longest matching prefix wins, ignoring any "namespace/" part
+    name = model.lower().rsplit("/", 1)[-1] if isinstance(model, str) else ""
+    matches = [prefix for prefix in table if name.startswith(prefix)]
+    return table[max(matches, key=len)] if matches else default
+
+
+def chars_per_token(model: Optional[str] = None) -> float:
+    return _lookup(CHARS_PER_TOKEN, model, DEFAULT_CHARS_PER_TOKEN)
+
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    return math.ceil(len(text) / chars_per_token(model))
+
+
+def context_window(model: Optional[str] = None) -> int:
+    if settings.llm_context_tokens:
+        return settings.llm_context_tokens
+    return _lookup(CONTEXT_WINDOWS, model, DEFAULT_CONTEXT_WINDOW)
+
+
+def prompt_budget(model: Optional[str] = None) -> int:
+    """Tokens available for the prompt once the completion is reserved."""
+    return context_window(model) - settings.llm_max_tokens
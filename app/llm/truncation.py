@@ -0,0 +1,79 @@
+"""Fit prompts into the model's token budget before they are sent.
+
+Only fields with a truncation strategy for their action are shortened:
+``head`` keeps the beginning, ``tail`` keeps the end and ``middle`` keeps
+both ends around an elision marker.  A prompt that is still too large is
+rejected locally instead of failing at the provider after the upload.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from app import metrics
+
+from .tokens import chars_per_token, estimate_tokens, prompt_budget
+
+# action -> field -> strategy
+TRUNCATION_POLICIES: Dict[str, Dict[str, str]] = {
+    "summarize_log": {"log": "middle"},
+    "reduce_summaries": {"summaries": "middle"},
+}
+
+
+def _marker(dropped: int) -> str:
+    return f"\n... [{dropped} characters truncated] ...\n"
+
+
+def truncate(text: str, max_chars: int, strategy: str) -> str:
+    if len(text) <= max_chars:
+        return text
+    # Reserve room for the marker itself
+    keep = max(0, max_chars - len(_marker(len(text))))
+    dropped = len(text) - keep
+    if strategy == "head":
+        return text[:keep] + _marker(dropped)
+    if strategy == "tail":
+        return _marker(dropped) + text[len(text) - keep :]
+    if strategy == "middle":
+        head = keep // 2
+        tail = keep - head
+        return text[:head] + _marker(dropped) + text[len(text) - tail :]
+    raise ValueError(f"Unknown truncation strategy {strategy}")
+
+
+def fit_prompt(
+    action: str, template: str, payload: Dict[str, Any], model: Optional[str] = None
+) -> str:
+    """Render ``template`` with ``payload``, truncating fields to fit the budget.
+
+    Raises ValueError if the prompt cannot be made to fit.
+    """
+    prompt = template.format(**payload)
+    budget = prompt_budget(model)
+    tokens = estimate_tokens(prompt, model)
+    metrics.observe("llm.prompt_tokens", tokens)
+    if tokens <= budget:
+        return prompt
+
+    policy = TRUNCATION_POLICIES.get(action, {})
+    fields = sorted(
+        (f for f in policy if isinstance(payload.get(f), str)),
+        key=lambda f: len(payload[f]),
+        reverse=True,
+    )
+    payload = dict(payload)
+    for field in fields:
+        overflow = (tokens - budget) * chars_per_token(model)
+        max_chars = int(len(payload[field]) - overflow)
+        payload[field] = truncate(payload[field], max(0, max_chars), policy[field])
+        prompt = template.format(**payload)
+        tokens = estimate_tokens(prompt, model)
+        if tokens <= budget:
+            metrics.incr(f"llm.truncation.{action}")
+            return prompt
+
+    metrics.incr(f"llm.truncation.rejected.{action}")
+    raise ValueError(
+        f"Prompt for {action} needs ~{tokens} tokens, over the budget of {budget}"
+    )
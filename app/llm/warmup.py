@@ -0,0 +1,99 @@
+"""Keep the Ollama model loaded so requests do not pay for a cold load.
+
+On startup every Ollama backend is asked to load ``LLM_MODEL``.  During
+business hours (``LLM_KEEP_WARM_HOURS``, local time, weekdays unless
+``LLM_KEEP_WARM_WEEKENDS``) the backends are pinged every
+``LLM_KEEP_WARM_INTERVAL`` seconds so ``keep_alive`` never runs out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from app.config import settings
+
+from .client import BaseLLMClient, OllamaClient, get_llm_client
+
+logger = logging.getLogger(__name__)
+
+
+def parse_hours(hours: str) -> Tuple[int, int]:
+    """Parse ``"8-18"`` into the half-open hour range ``(8, 18)``."""
+    start, _, end = hours.partition("-")
+    return int(start), int(end)
+
+
+def ollama_backends(client: BaseLLMClient) -> List[OllamaClient]:
+    backends = getattr(client, "backends", None)
+    if backends is not None:
+        return [b.client for b in backends if isinstance(b.client, OllamaClient)]
+    return [client] if isinstance(client, OllamaClient) else []
+
+
+class KeepWarm:
+    def __init__(
+        self,
+        clients: List[OllamaClient],
+        interval: float,
+        hours: Tuple[int, int] = (8, 18),
+        weekends: bool = False,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        self.clients = clients
+        self.interval = interval
+        self.hours = hours
+        self.weekends = weekends
+        self._clock = clock
+        self._task: Optional[asyncio.Task] = None
+
+    def in_business_hours(self) -> bool:
+        now = self._clock()
+        if now.weekday() >= 5 and not self.weekends:
+            return False
+        return self.hours[0] <= now.hour < self.hours[1]
+
+    async def warm_all(self) -> None:
+        for client in self.clients:
+            try:
+                seconds = await client.warm_up()
+                logger.info(f"LLM model on {client.host} loaded in {seconds:.1f}s")
+            except Exception:
+                logger.exception(f"LLM warm-up failed for {client.host}")
+
+    async def run(self) -> None:
+        await self.warm_all()
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.in_business_hours():
+                await self.warm_all()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def setup_keep_warm() -> Optional[KeepWarm]:
+    """Build the keep-warm task for Ollama deployments (``None`` otherwise)."""
+    if settings.llm_provider != "ollama" or not settings.llm_warmup:
+        return None
+    clients = ollama_backends(get_llm_client())
+    if not clients:
+        return None
+    return KeepWarm(
+        clients,
+        settings.llm_keep_warm_interval,
+        parse_hours(settings.llm_keep_warm_hours),
+        settings.llm_keep_warm_weekends,
+    )
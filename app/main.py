@@ -6,14 +6,89 @@ from app.adapters.llm import router as llm_router
 from app.adapters.audit import router as audit_router
 from app.adapters.ev import router as ev_router
 from app.adapters.sn import router as sn_router
+from app.adapters.webhooks import router as webhooks_router
+from app.adapters.context import catalog, router as context_router
 
 from app.adapters.awx_service import awx_client
+from app import metrics
+from app.config import settings
+from app.dependencies.llm import close_http_clients
+from app.jobs.notifications import register_job_webhooks
+from app.llm.cache import cache_stats, start_cache_tiers, stop_cache_tiers
+from app.llm.loop_thread import background_loop
+from app.llm.scheduler import queue_stats
+from app.llm.warmup import setup_keep_warm
+from app.replica.follower import ActivityStreamFollower
+from app.replica.invalidation import invalidation_bus
+from app.replica.sync import setup_replica
+from app.schema.validator import compile_registry
+from contextlib import asynccontextmanager
 import logging
 import json
 import httpx
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compile registry schemas before the first request needs them
+    compile_registry()
+    # Start optional background services
+    replica_sync = setup_replica(awx_client)
+    if replica_sync:
+        invalidation_bus.subscribe(replica_sync.on_invalidate)
+        replica_sync.start()
+    invalidation_bus.subscribe(catalog.on_invalidate)
+    follower = None
+    if settings.activity_stream_follow:
+        follower = ActivityStreamFollower(
+            awx_client, invalidation_bus, settings.activity_stream_poll_interval
+        )
+        follower.start()
+    if (
+        settings.webhook_job_templates
+        and settings.webhook_public_url
+        and settings.webhook_secret
+    ):
+        template_ids = [
+            int(t) for t in settings.webhook_job_templates.split(",") if t.strip()
+        ]
+        try:
+            await register_job_webhooks(
+                awx_client,
+                template_ids,
+                settings.webhook_public_url,
+                settings.webhook_secret,
+                settings.webhook_organization,
+            )
+        except Exception:
+            logging.exception("Failed to register AWX job webhooks")
+    keep_warm = setup_keep_warm()
+    if keep_warm:
+        keep_warm.start()
+    warmed = await start_cache_tiers(settings.llm_cache_warm_entries)
+    if warmed:
+        logging.info(f"Warmed LLM cache with {warmed} entries")
+    yield
+    await stop_cache_tiers()
+    if keep_warm:
+        await keep_warm.stop()
+    await close_http_clients()
+    background_loop.stop()
+    if follower:
+        await follower.stop()
+    invalidation_bus.unsubscribe(catalog.on_invalidate)
+    if replica_sync:
+        invalidation_bus.unsubscribe(replica_sync.on_invalidate)
+        await replica_sync.stop()
+        awx_client.replica = None
+        replica_sync.store.close()
+
+
 app = FastAPI(
-    title="AWX Advanced Tools", description="Orchestration gateway", version="1.0.0"
+    title="AWX Advanced Tools",
+    description="Orchestration gateway",
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware to allow Open-WebUI to make requests
@@ -30,6 +105,8 @@ app.include_router(llm_router)
 app.include_router(audit_router)
 app.include_router(ev_router)
 app.include_router(sn_router)
+app.include_router(webhooks_router)
+app.include_router(context_router)
 
 
 @app.get("/")
@@ -64,8 +141,8 @@ root_logger.handlers = [handler]
 
 async def awx_ping() -> bool:
     try:
-        # GET job templates to ensure AWX reachable
-        await awx_client.list_templates()
+        # Ask AWX itself; list endpoints may be served by the replica
+        await awx_client.ping()
         return True
     except Exception:
         return False
@@ -83,6 +160,15 @@ async def ready():
     return {"ready": available, "awx": available}
 
 
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
+
+
+metrics.register_gauge("llm.cache", cache_stats)
+metrics.register_gauge("llm.queue", queue_stats)
+
+
 @app.get("/activity_stream")
 async def list_activity_stream(page: int = 1, page_size: int = 20):
     try:
@@ -0,0 +1,58 @@
+"""Minimal in-process metrics registry.
+
+Counters, gauges and timing summaries are kept in memory and served as JSON
+by ``GET /metrics``.  Names are dotted strings, e.g. ``llm.fast_path.<action>``.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_timings: Dict[str, Dict[str, float]] = {}
+_gauges: Dict[str, Callable[[], Any]] = {}
+
+
+def incr(name: str, value: float = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, value: float) -> None:
+    """Record one observation (typically a duration in seconds)."""
+    with _lock:
+        summary = _timings.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+        summary["count"] += 1
+        summary["sum"] += value
+        summary["max"] = max(summary["max"], value)
+
+
+def register_gauge(name: str, fn: Callable[[], Any]) -> None:
+    """Register a callback evaluated every time a snapshot is taken."""
+    with _lock:
+        _gauges[name] = fn
+
+
+def counter(name: str) -> float:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        counters = dict(_counters)
+        timings = {k: dict(v) for k, v in _timings.items()}
+        gauges = dict(_gauges)
+    return {
+        "counters": counters,
+        "timings": timings,
+        "gauges": {name: fn() for name, fn in gauges.items()},
+    }
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _timings.clear()
@@ -0,0 +1 @@
+# replica package
@@ -0,0 +1,47 @@
+"""Publish/subscribe hub for AWX object change notifications.
+
+Producers (the activity-stream follower, write-through paths) publish
+``(resource, obj_id, operation)`` tuples; caches and replicas subscribe and
+drop or refresh exactly the objects that changed.
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+from typing import Awaitable, Callable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[str, Optional[int], str], Union[None, Awaitable[None]]]
+
+
+class InvalidationBus:
+    def __init__(self) -> None:
+        self._listeners: List[Listener] = []
+
+    def subscribe(self, listener: Listener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def publish(
+        self, resource: str, obj_id: Optional[int], operation: str
+    ) -> None:
+        """Notify every listener; a failing listener does not stop the others."""
+        for listener in list(self._listeners):
+            try:
+                result = listener(resource, obj_id, operation)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception(
+                    f"Invalidation listener failed for {resource}/{obj_id}"
+                )
+
+
+# Shared bus for the whole application
+invalidation_bus = InvalidationBus()
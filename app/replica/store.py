@@ -0,0 +1,181 @@
+"""SQLite-backed local replica of slow-changing AWX configuration objects.
+
+Each object is stored as its full JSON document next to a few indexed columns
+(name, organization, modified) used for lookups.  Secret-bearing fields are
+stripped before anything is written to disk.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+# AWX collections mirrored into the replica
+REPLICATED_RESOURCES = (
+    "organizations",
+    "projects",
+    "inventories",
+    "job_templates",
+    "credentials",
+    "users",
+)
+
+# Fields never persisted locally (credentials are kept as metadata only)
+SECRET_FIELDS: Dict[str, tuple] = {
+    "credentials": ("inputs",),
+    "users": ("password",),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    resource TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT,
+    organization INTEGER,
+    modified TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (resource, id)
+);
+CREATE INDEX IF NOT EXISTS ix_objects_name ON objects (resource, name);
+CREATE INDEX IF NOT EXISTS ix_objects_organization ON objects (resource, organization);
+CREATE INDEX IF NOT EXISTS ix_objects_modified ON objects (resource, modified);
+CREATE TABLE IF NOT EXISTS sync_state (
+    resource TEXT PRIMARY KEY,
+    cursor TEXT,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+def _strip_secrets(resource: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+    fields = SECRET_FIELDS.get(resource)
+    if not fields:
+        return obj
+    return {k: v for k, v in obj.items() if k not in fields}
+
+
+class ReplicaStore:
+    """Thread-safe SQLite store for replicated AWX objects."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def upsert(self, resource: str, objects: Iterable[Dict[str, Any]]) -> int:
+        rows = []
+        for obj in objects:
+            obj = _strip_secrets(resource, obj)
+            rows.append(
+                (
+                    resource,
+                    obj["id"],
+                    obj.get("name") or obj.get("username"),
+                    obj.get("organization"),
+                    obj.get("modified"),
+                    json.dumps(obj),
+                )
+            )
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO objects "
+                "(resource, id, name, organization, modified, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def delete(self, resource: str, obj_id: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM objects WHERE resource = ? AND id = ?", (resource, obj_id)
+            )
+            self._conn.commit()
+
+    def retain(self, resource: str, ids: Iterable[int]) -> int:
+        """Delete every object of ``resource`` whose id is not in ``ids``."""
+        keep = set(ids)
+        with self._lock:
+            existing = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM objects WHERE resource = ?", (resource,)
+                )
+            ]
+            stale = [(resource, i) for i in existing if i not in keep]
+            self._conn.executemany(
+                "DELETE FROM objects WHERE resource = ? AND id = ?", stale
+            )
+            self._conn.commit()
+        return len(stale)
+
+    def get(self, resource: str, obj_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM objects WHERE resource = ? AND id = ?",
+                (resource, obj_id),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list(
+        self,
+        resource: str,
+        name: Optional[str] = None,
+        organization: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Return objects in the same shape as an AWX list response."""
+        query = "SELECT data FROM objects WHERE resource = ?"
+        params: List[Any] = [resource]
+        if name is not None:
+            query += " AND name = ?"
+            params.append(name)
+        if organization is not None:
+            query += " AND organization = ?"
+            params.append(organization)
+        query += " ORDER BY id"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        results = [json.loads(row[0]) for row in rows]
+        return {
+            "count": len(results),
+            "next": None,
+            "previous": None,
+            "results": results,
+        }
+
+    def cursor(self, resource: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor FROM sync_state WHERE resource = ?", (resource,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, resource: str, cursor: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (resource, cursor, synced_at) "
+                "VALUES (?, ?, ?)",
+                (resource, cursor, time.time()),
+            )
+            self._conn.commit()
+
+    def is_synced(self, resource: str) -> bool:
+        """True once ``resource`` has completed at least one sync."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM sync_state WHERE resource = ?", (resource,)
+            ).fetchone()
+        return row is not None
@@ -0,0 +1,124 @@
+"""Background service keeping the local replica in sync with AWX.
+
+Incremental passes only fetch objects with ``modified__gt`` the newest
+timestamp seen so far.  Deletions do not show up in such a query, so every
+``full_sync_every`` passes a full listing is made and rows that AWX no longer
+returns are dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.replica.store import REPLICATED_RESOURCES, ReplicaStore
+
+logger = logging.getLogger(__name__)
+
+_UPSERT_BATCH = 200
+
+
+class ReplicaSync:
+    def __init__(
+        self,
+        client: Any,
+        store: ReplicaStore,
+        interval: float = 60,
+        full_sync_every: int = 60,
+    ) -> None:
+        self.client = client
+        self.store = store
+        self.interval = interval
+        self.full_sync_every = max(1, full_sync_every)
+        self._passes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def sync_resource(self, resource: str, full: bool = False) -> int:
+        """Pull changes for one resource and return the number of rows written."""
+        cursor = None if full else self.store.cursor(resource)
+        filters = {"modified__gt": cursor} if cursor else {}
+        newest = cursor
+        seen: List[int] = []
+        batch: List[Dict[str, Any]] = []
+        written = 0
+        async for obj in self.client.iter_collection(resource, filters):
+            batch.append(obj)
+            seen.append(obj["id"])
+            modified = obj.get("modified")
+            if modified and (newest is None or modified > newest):
+                newest = modified
+            if len(batch) >= _UPSERT_BATCH:
+                written += await asyncio.to_thread(self.store.upsert, resource, batch)
+                batch = []
+        written += await asyncio.to_thread(self.store.upsert, resource, batch)
+        if full:
+            removed = await asyncio.to_thread(self.store.retain, resource, seen)
+            if removed:
+                logger.info(f"Replica dropped {removed} deleted {resource}")
+        await asyncio.to_thread(self.store.set_cursor, resource, newest)
+        return written
+
+    async def on_invalidate(
+        self, resource: str, obj_id: Optional[int], operation: str
+    ) -> None:
+        """Refresh or drop a single replicated object after an AWX change."""
+        if resource not in REPLICATED_RESOURCES or obj_id is None:
+            return
+        if operation == "delete":
+            await asyncio.to_thread(self.store.delete, resource, obj_id)
+            return
+        try:
+            obj = await self.client.fetch_object(resource, obj_id)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code != 404:
+                raise
+            await asyncio.to_thread(self.store.delete, resource, obj_id)
+            return
+        await asyncio.to_thread(self.store.upsert, resource, [obj])
+
+    async def sync_all(self) -> Dict[str, int]:
+        full = self._passes % self.full_sync_every == 0
+        self._passes += 1
+        counts = {}
+        for resource in REPLICATED_RESOURCES:
+            try:
+                counts[resource] = await self.sync_resource(resource, full=full)
+            except Exception:
+                logger.exception(f"Replica sync of {resource} failed")
+        return counts
+
+    async def run(self) -> None:
+        while True:
+            await self.sync_all()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def setup_replica(client: Any) -> Optional[ReplicaSync]:
+    """Attach a replica to ``client`` if REPLICA_DB_PATH is configured."""
+    if not settings.replica_db_path:
+        return None
+    store = ReplicaStore(settings.replica_db_path)
+    client.replica = store
+    return ReplicaSync(
+        client,
+        store,
+        interval=settings.replica_sync_interval,
+        full_sync_every=settings.replica_full_sync_every,
+    )
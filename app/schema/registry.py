@@ -53,6 +53,21 @@ schema_registry: Dict[str, Dict[str, Dict]] = {
             "required": ["result"],
             "additionalProperties": False,
         },
+        "reduce_summaries": {
+            "type": "object",
+            "properties": {
+                "result": {
+                    "type": "object",
+                    "properties": {
+                        "summary": {"type": "string"},
+                    },
+                    "required": ["summary"],
+                    "additionalProperties": False,
+                }
+            },
+            "required": ["result"],
+            "additionalProperties": False,
+        },
         "get_awx_status": {
             "type": "object",
             "properties": {
@@ -89,8 +104,22 @@ schema_registry: Dict[str, Dict[str, Dict]] = {
     },
 }
 
+# Bumped by register_schema so compiled validators know to rebuild
+_version = 0
+
 # Function to retrieve schema
 
 
 def get_schema(platform: str, action: str):
     return schema_registry.get(platform, {}).get(action)
+
+
+def register_schema(platform: str, action: str, schema: Dict) -> None:
+    """Add or replace a schema; use this rather than mutating the registry."""
+    global _version
+    schema_registry.setdefault(platform, {})[action] = schema
+    _version += 1
+
+
+def registry_version() -> int:
+    return _version
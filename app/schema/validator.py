@@ -1,9 +1,24 @@
 # Add a simple JSON schema validator that uses jsonschema
-from typing import Dict
-from jsonschema import validate
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
 
 # Registry of schemas per platform/action
-from app.schema.registry import schema_registry
+from app.schema.registry import registry_version, schema_registry
+
+# Compiled validators keyed by schema fingerprint (bounded, LRU)
+_MAX_COMPILED = 256
+_COMPILED: "OrderedDict[str, Validator]" = OrderedDict()
+
+# Registry validators: (platform, action) -> (registry version, schema, validator)
+_REGISTRY: Dict[Tuple[str, str], Tuple[int, Dict, Validator]] = {}
+# Same validators by schema identity, so callers holding a registry schema
+# skip fingerprinting: id(schema) -> (registry version, schema, validator)
+_REGISTRY_BY_ID: Dict[int, Tuple[int, Dict, Validator]] = {}
 
 # Helper to get schema for a platform and action
 
@@ -12,11 +27,100 @@ def get_schema(platform: str, action: str) -> Dict | None:
     return schema_registry.get(platform, {}).get(action)
 
 
-# Validate a payload against a schema
+def schema_fingerprint(schema: Dict) -> str:
+    raw = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
-def validate_payload(platform: str, action: str, payload: Dict) -> None:
+def compile_schema(schema: Dict) -> Validator:
+    """Return a checked, reusable validator for ``schema``.
+
+    Raises jsonschema.SchemaError if the schema itself is invalid.
+    """
+    entry = _REGISTRY_BY_ID.get(id(schema))
+    if entry is not None and entry[1] is schema and entry[0] == registry_version():
+        return entry[2]
+    key = schema_fingerprint(schema)
+    validator = _COMPILED.get(key)
+    if validator is not None:
+        _COMPILED.move_to_end(key)
+        return validator
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    validator = cls(schema, format_checker=cls.FORMAT_CHECKER)
+    _COMPILED[key] = validator
+    if len(_COMPILED) > _MAX_COMPILED:
+        _COMPILED.popitem(last=False)
+    return validator
+
+
+def get_validator(platform: str, action: str) -> Validator | None:
+    """Return the compiled validator for a registry entry.
+
+    It is rebuilt only after the entry is replaced via ``register_schema``.
+    """
     schema = get_schema(platform, action)
     if schema is None:
+        return None
+    version = registry_version()
+    entry = _REGISTRY.get((platform, action))
+    if entry is not None and entry[0] == version and entry[1] is schema:
+        return entry[2]
+    validator = compile_schema(schema)
+    if entry is not None:
+        _REGISTRY_BY_ID.pop(id(entry[1]), None)
+    _REGISTRY[(platform, action)] = (version, schema, validator)
+    _REGISTRY_BY_ID[id(schema)] = (version, schema, validator)
+    return validator
+
+
+def compile_registry() -> int:
+    """Compile every registry schema up front; returns the number compiled."""
+    count = 0
+    for platform, actions in schema_registry.items():
+        for action in actions:
+            get_validator(platform, action)
+            count += 1
+    return count
+
+
+def _errors(validator: Validator, payload: Any) -> List[Dict[str, str]]:
+    errors = []
+    for error in validator.iter_errors(payload):
+        path = "".join(f"/{part}" for part in error.absolute_path)
+        errors.append(
+            {
+                "path": path or "/",
+                "message": error.message,
+                "rule": str(error.validator),
+            }
+        )
+    return sorted(errors, key=lambda e: e["path"])
+
+
+def schema_errors(schema: Dict, payload: Any) -> List[Dict[str, str]]:
+    """Validate ``payload`` and return every error with its JSON pointer path."""
+    return _errors(compile_schema(schema), payload)
+
+
+# Validate a payload against a schema
+
+
+def validate_payload(platform: str, action: str, payload: Dict) -> None:
+    validator = get_validator(platform, action)
+    if validator is None:
+        raise ValueError(f"No schema found for {platform}/{action}")
+    validator.validate(payload)
+
+
+def validate_many(
+    platform: str, action: str, payloads: Iterable[Any]
+) -> List[List[Dict[str, str]]]:
+    """Validate several payloads with one validator lookup.
+
+    Returns the error list of each payload, in order (empty when valid).
+    """
+    validator = get_validator(platform, action)
+    if validator is None:
         raise ValueError(f"No schema found for {platform}/{action}")
-    validate(instance=payload, schema=schema)
+    return [_errors(validator, payload) for payload in payloads]
@@ -0,0 +1,92 @@
+"""Throughput of PromptService.generate_payload_sync.
+
+Compares ``asyncio.run`` per call (the previous implementation) with the
+shared background loop.  Both use the real ``OllamaClient`` against a local
+HTTP server that answers ``/api/generate`` like Ollama, so the difference is
+the event loop, client and TCP connection set-up that the background loop
+avoids.  Most of that is httpx building an SSL context (loading the CA
+bundle) for every new client, even for plain HTTP hosts.  ``latency`` adds a
+server-side delay per request to stand in for generation time.
+
+Run with ``python benchmarks/bench_sync_generate.py [calls] [latency]``.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("LLM_PROVIDER", "ollama")
+
+from app.llm import cache
+from app.llm.client import OllamaClient
+from app.llm.loop_thread import background_loop
+from app.llm.service import PromptService
+
+
+class FakeOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like Ollama
+    disable_nagle_algorithm = True  # headers and body are written separately
+    latency = 0.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        if self.latency:
+            time.sleep(self.latency)
+        answer = json.dumps({"result": {"summary": "ok"}})
+        body = json.dumps({"response": answer, "done": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _payload(i):
+    return {"log": f"run {i}"}
+
+
+def main(calls: int = 200, latency: float = 0.0) -> None:
+    FakeOllama.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = OllamaClient(f"http://127.0.0.1:{server.server_port}")
+    cache.set_cache_tiers([])
+    try:
+        with patch("app.llm.service.get_llm_client", return_value=client):
+            service = PromptService()
+
+        cache._CACHE.clear()
+        start = time.perf_counter()
+        for i in range(calls):
+            asyncio.run(service.generate_payload("summarize_log", _payload(i)))
+        before = time.perf_counter() - start
+
+        cache._CACHE.clear()
+        start = time.perf_counter()
+        for i in range(calls):
+            service.generate_payload_sync("summarize_log", _payload(i))
+        after = time.perf_counter() - start
+    finally:
+        background_loop.stop()
+        server.shutdown()
+        server.server_close()
+
+    print(f"{'asyncio.run per call':24} {calls / before:8.1f} calls/s")
+    print(f"{'background loop':24} {calls / after:8.1f} calls/s")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.0,
+    )
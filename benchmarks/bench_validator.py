@@ -0,0 +1,51 @@
+"""Per-call cost of validating LLM payloads against the schema registry.
+
+Compares ``jsonschema.validate`` (checks the schema and builds a validator on
+every call) with the precompiled registry validators.
+
+Run with ``python benchmarks/bench_validator.py [iterations]``.
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+import jsonschema
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.schema.registry import get_schema
+from app.schema.validator import (
+    compile_registry,
+    validate_many,
+    validate_payload,
+)
+
+PAYLOAD = {"result": {"template_id": 42, "extra_vars": {"env": "prod"}}}
+
+
+def main(iterations: int = 5000) -> None:
+    schema = get_schema("AWX", "launch_job_template")
+    compile_registry()
+
+    runs = {
+        "jsonschema.validate": lambda: jsonschema.validate(PAYLOAD, schema),
+        "validate_payload (compiled)": lambda: validate_payload(
+            "AWX", "launch_job_template", PAYLOAD
+        ),
+    }
+    for name, fn in runs.items():
+        seconds = timeit.timeit(fn, number=iterations)
+        print(f"{name:32} {seconds / iterations * 1e6:8.1f} us/call")
+
+    batch = [PAYLOAD] * 100
+    seconds = timeit.timeit(
+        lambda: validate_many("AWX", "launch_job_template", batch),
+        number=max(1, iterations // 100),
+    )
+    per_call = seconds / (max(1, iterations // 100) * len(batch))
+    print(f"{'validate_many (per payload)':32} {per_call * 1e6:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -4,6 +4,9 @@
 import os
 import sys
 
+import httpx
+import pytest
+
 # Set LLM_PROVIDER to ollama to avoid import errors
 os.environ["LLM_PROVIDER"] = "ollama"
 os.environ["AUDIT_LOG_DIR"] = "/tmp/audit"
@@ -31,3 +34,87 @@ class DummyChatCompletion:
 # Add dummy openai to sys.modules
 sys.modules["openai"] = type(sys)("openai")
 sys.modules["openai"].ChatCompletion = DummyChatCompletion
+
+
+# In-memory stand-in for redis.asyncio.Redis (only the calls the app uses)
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value.encode() if isinstance(value, str) else value
+        self.expiry[key] = ex
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+        self.expiry.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+# Manually advanced stand-in for time.monotonic
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+# In-memory stand-in for AWXClient (collections, single objects, activity stream)
+class FakeAWX:
+    def __init__(self, objects=None, activity=None):
+        self.objects = {k: list(v) for k, v in (objects or {}).items()}
+        self.activity = list(activity or [])
+        self.listed = []
+        self.filters = []
+        self.activity_calls = []
+
+    async def iter_collection(self, resource, filters=None):
+        self.filters.append((resource, filters))
+        for obj in self.objects.get(resource, []):
+            yield obj
+
+    async def list_all(self, resource):
+        self.listed.append(resource)
+        return list(self.objects.get(resource, []))
+
+    async def read_object(self, resource, obj_id):
+        for obj in self.objects.get(resource, []):
+            if obj["id"] == obj_id:
+                return obj
+        return None
+
+    async def fetch_object(self, resource, obj_id):
+        obj = await self.read_object(resource, obj_id)
+        if obj is None:
+            request = httpx.Request("GET", f"http://awx/api/v2/{resource}/{obj_id}/")
+            raise httpx.HTTPStatusError(
+                "not found", request=request, response=httpx.Response(404)
+            )
+        return obj
+
+    async def latest_activity_stream_id(self):
+        return 10
+
+    async def list_activity_stream_since(self, since_id, page_size=200):
+        self.activity_calls.append(since_id)
+        return self.activity.pop(0)
+
+
+@pytest.fixture
+def fake_awx():
+    """Factory: ``fake_awx(objects, activity)`` builds a FakeAWX."""
+    return FakeAWX
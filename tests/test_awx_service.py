@@ -74,3 +74,30 @@ async def test_create_inventory(mock_httpx):
 async def test_list_templates(mock_httpx):
     result = await awx_client.list_templates()
     assert result["url"].endswith("/job_templates/")
+
+
+@pytest.mark.asyncio
+async def test_iter_collection_walks_pages_by_id():
+    pages = [
+        {"next": "page2", "results": [{"id": 1}, {"id": 2}]},
+        {"next": None, "results": [{"id": 5}]},
+    ]
+    seen_params = []
+
+    async def fake_request(method, url, params=None):
+        seen_params.append(dict(params))
+        return DummyResponse(pages[len(seen_params) - 1])
+
+    with patch.object(awx_client, "_request", side_effect=fake_request):
+        items = [
+            item
+            async for item in awx_client.iter_collection(
+                "hosts", {"name__icontains": "web"}, after_id=0
+            )
+        ]
+
+    assert [i["id"] for i in items] == [1, 2, 5]
+    assert seen_params[0]["id__gt"] == 0
+    assert seen_params[0]["name__icontains"] == "web"
+    assert seen_params[0]["order_by"] == "id"
+    assert seen_params[1]["id__gt"] == 2
@@ -0,0 +1,69 @@
+import os
+
+os.environ["AWX_BASE_URL"] = "dummy"
+os.environ["LLM_ENDPOINT"] = "dummy"
+os.environ["LLM_MODEL"] = "dummy"
+
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+@patch("app.adapters.awx.awx_client")
+def test_batch_returns_results_in_order(mock_client):
+    mock_client.get_inventory = AsyncMock(side_effect=lambda i: {"id": i})
+    mock_client.get_project = AsyncMock(side_effect=lambda i: {"id": i, "p": 1})
+    response = client.post(
+        "/awx2/batch",
+        json=[
+            {"path": "/awx2/inventories/1"},
+            {"method": "GET", "path": "/awx2/projects/2"},
+            {"path": "/awx2/inventories/3"},
+        ],
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [200, 200, 200]
+    assert results[0]["body"] == {"id": 1}
+    assert results[1]["body"] == {"id": 2, "p": 1}
+    assert results[2]["body"] == {"id": 3}
+
+
+@patch("app.adapters.awx.awx_client")
+def test_batch_deduplicates_identical_gets(mock_client):
+    mock_client.get_inventory = AsyncMock(return_value={"id": 1})
+    response = client.post(
+        "/awx2/batch",
+        json=[{"path": "/awx2/inventories/1"}, {"path": "/awx2/inventories/1"}],
+    )
+    results = response.json()["results"]
+    assert results[0] == results[1]
+    mock_client.get_inventory.assert_awaited_once_with(1)
+
+
+@patch("app.adapters.awx.awx_client")
+def test_batch_forwards_body_and_errors(mock_client):
+    mock_client.create_organization = AsyncMock(return_value={"id": 7})
+    response = client.post(
+        "/awx2/batch",
+        json=[
+            {"method": "POST", "path": "/awx2/organizations", "body": {"name": "o"}},
+            {"path": "/awx2/inventories/not-a-number"},
+            {"path": "/health"},
+            {"method": "POST", "path": "/awx2/batch", "body": []},
+        ],
+    )
+    results = response.json()["results"]
+    assert results[0] == {"status": 200, "body": {"id": 7}}
+    mock_client.create_organization.assert_awaited_once_with("o", None)
+    assert results[1]["status"] == 422
+    assert results[2]["status"] == 400
+    assert results[3]["status"] == 400
+
+
+def test_batch_rejects_oversized_batches():
+    response = client.post("/awx2/batch", json=[{"path": "/awx2/test"}] * 51)
+    assert response.status_code == 413
@@ -0,0 +1,155 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+from app.adapters.awx_service import AWXClient
+from app.context.catalog import CatalogDigest, digest_line
+from app.replica.invalidation import invalidation_bus
+from app.replica.store import ReplicaStore
+
+
+OBJECTS = {
+    "job_templates": [
+        {"id": 7, "name": "Deploy web", "description": "Rolls out the web tier"},
+        {"id": 3, "name": "Patch", "description": ""},
+    ],
+    "inventories": [{"id": 1, "name": "prod", "description": None}],
+    "organizations": [{"id": 1, "name": "Default", "description": "x" * 200}],
+}
+
+
+def test_digest_line_is_compact():
+    line = digest_line({"id": 2, "name": "a|b\n c", "description": "d" * 100})
+    assert line.startswith("2|a/b c|")
+    assert len(line.split("|")[2]) == 80
+
+
+@pytest.mark.asyncio
+async def test_render_sorted_by_id(fake_awx):
+    digest = CatalogDigest(fake_awx(OBJECTS))
+    text = await digest.text()
+    assert "job_templates (2) id|name|description:\n3|Patch|\n7|Deploy web|" in text
+    assert "inventories (1)" in text and "\n1|prod|\n" in text
+
+
+@pytest.mark.asyncio
+async def test_incremental_update_and_delete(fake_awx):
+    awx = fake_awx(OBJECTS)
+    digest = CatalogDigest(awx)
+    await digest.text()
+    etag = digest.etag()
+
+    awx.objects["job_templates"][0] = {"id": 7, "name": "Deploy api"}
+    await digest.on_invalidate("job_templates", 7, "update")
+    assert "7|Deploy api|" in await digest.text()
+    assert digest.etag() != etag
+
+    awx.objects["job_templates"].pop(1)
+    await digest.on_invalidate("job_templates", 3, "update")  # gone -> drop
+    await digest.on_invalidate("inventories", 1, "delete")
+    text = await digest.text()
+    assert "3|Patch" not in text and "inventories (0)" in text
+    # No full rebuild happened
+    assert awx.listed == ["job_templates", "inventories", "organizations"]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_object_keeps_etag_and_other_resources_ignored(fake_awx):
+    digest = CatalogDigest(fake_awx(OBJECTS))
+    await digest.text()
+    etag = digest.etag()
+    await digest.on_invalidate("job_templates", 3, "update")
+    await digest.on_invalidate("hosts", 5, "update")
+    assert digest.etag() == etag
+    # Same content, same tag, in another process or after a rebuild
+    other = CatalogDigest(fake_awx(OBJECTS))
+    await other.text()
+    assert other.etag() == etag
+
+
+@pytest.mark.asyncio
+async def test_rebuild_after_max_age_or_unknown_scope(fake_awx, clock):
+    awx = fake_awx(OBJECTS)
+    digest = CatalogDigest(awx, max_age=10, clock=clock)
+    await digest.text()
+    await digest.text()
+    assert len(awx.listed) == 3
+    clock.now = 11
+    await digest.text()
+    assert len(awx.listed) == 6
+    await digest.on_invalidate("inventories", None, "update")
+    await digest.text()
+    assert len(awx.listed) == 9
+
+
+@pytest.mark.asyncio
+async def test_reads_from_synced_replica(tmp_path):
+    store = ReplicaStore(str(tmp_path / "replica.db"))
+    awx = AWXClient()
+    awx.replica = store
+    try:
+        for resource, objects in OBJECTS.items():
+            store.upsert(resource, objects)
+            store.set_cursor(resource, None)
+        digest = CatalogDigest(awx)
+        with patch.object(awx, "_request", AsyncMock()) as request:
+            assert "7|Deploy web|" in await digest.text()
+            store.upsert("inventories", [{"id": 2, "name": "dev"}])
+            await digest.on_invalidate("inventories", 2, "create")
+            store.delete("job_templates", 3)
+            await digest.on_invalidate("job_templates", 3, "update")
+        request.assert_not_called()
+        assert "2|dev|" in digest.render()
+        assert "3|Patch" not in digest.render()
+    finally:
+        store.close()
+
+
+@pytest.mark.asyncio
+async def test_read_object_treats_404_as_gone():
+    awx = AWXClient()
+    request = httpx.Request("GET", "http://awx")
+    missing = httpx.HTTPStatusError(
+        "not found", request=request, response=httpx.Response(404, request=request)
+    )
+    with patch.object(awx, "_request", AsyncMock(side_effect=missing)):
+        assert await awx.read_object("inventories", 9) is None
+
+
+def test_catalog_endpoint_etag(monkeypatch, fake_awx):
+    from app.adapters import context
+    from app.main import app
+
+    monkeypatch.setattr(context, "catalog", CatalogDigest(fake_awx(OBJECTS)))
+    client = TestClient(app)
+    resp = client.get("/context/catalog")
+    assert resp.status_code == 200
+    assert "7|Deploy web|" in resp.text
+    assert int(resp.headers["x-token-estimate"]) > 0
+    etag = resp.headers["etag"]
+    assert (
+        client.get("/context/catalog", headers={"If-None-Match": etag}).status_code
+        == 304
+    )
+
+
+@pytest.mark.asyncio
+async def test_gateway_writes_reach_the_catalog(fake_awx):
+    awx = AWXClient()
+    digest = CatalogDigest(fake_awx(OBJECTS))
+    await digest.text()
+    renamed = {"id": 1, "name": "Renamed", "description": ""}
+    digest.client.read_object = AsyncMock(return_value=renamed)
+    response = httpx.Response(200, json=renamed, request=httpx.Request("PATCH", "u"))
+    invalidation_bus.subscribe(digest.on_invalidate)
+    try:
+        with patch("httpx.AsyncClient") as MockClient:
+            instance = MockClient.return_value
+            instance.__aenter__.return_value = instance
+            instance.request = AsyncMock(return_value=response)
+            await awx.update_organization(1, name="Renamed")
+    finally:
+        invalidation_bus.unsubscribe(digest.on_invalidate)
+    digest.client.read_object.assert_awaited_once_with("organizations", 1)
+    assert "\n1|Renamed|\n" in await digest.text()
@@ -0,0 +1,52 @@
+import json
+import os
+
+os.environ["AWX_BASE_URL"] = "dummy"
+os.environ["LLM_ENDPOINT"] = "dummy"
+os.environ["LLM_MODEL"] = "dummy"
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def fake_collection(objects):
+    calls = {}
+
+    async def iter_collection(resource, filters=None, after_id=None):
+        calls.update(resource=resource, filters=filters, after_id=after_id)
+        for obj in objects:
+            yield obj
+
+    return iter_collection, calls
+
+
+@patch("app.adapters.awx.awx_client")
+def test_export_streams_ndjson(mock_client):
+    mock_client.iter_collection, calls = fake_collection([{"id": 1}, {"id": 2}])
+    response = client.get("/awx2/users/export?cursor=0&username__startswith=a")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [{"id": 1}, {"id": 2}]
+    assert calls == {
+        "resource": "users",
+        "filters": {"username__startswith": "a"},
+        "after_id": 0,
+    }
+
+
+@patch("app.adapters.awx.awx_client")
+def test_export_empty_collection(mock_client):
+    mock_client.iter_collection, _ = fake_collection([])
+    response = client.get("/awx2/jobs/export")
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+def test_export_rejects_unknown_resource_and_format():
+    assert client.get("/awx2/secrets/export").status_code == 404
+    assert client.get("/awx2/jobs/export?format=csv").status_code == 400
@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app import metrics
+from app.llm.fastpath import try_fast_path
+from app.llm.service import PromptService
+from app.schema.validator import validate_payload
+
+
+class TestLaunchJobTemplate:
+    def test_builds_schema_valid_payload(self):
+        result = try_fast_path(
+            "launch_job_template", {"template_id": "7", "extra_vars": '{"a": 1}'}
+        )
+        assert result == {"result": {"template_id": 7, "extra_vars": {"a": 1}}}
+        validate_payload("AWX", "launch_job_template", result)
+
+    def test_missing_extra_vars_default_to_empty(self):
+        result = try_fast_path("launch_job_template", {"template_id": 3})
+        assert result == {"result": {"template_id": 3, "extra_vars": {}}}
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"template_id": "the deploy one", "extra_vars": {}},
+            {"template_id": 0, "extra_vars": {}},
+            {"template_id": True, "extra_vars": {}},
+            {"template_id": 4, "extra_vars": "set env to prod"},
+        ],
+    )
+    def test_ambiguous_inputs_fall_back(self, payload):
+        assert try_fast_path("launch_job_template", payload) is None
+
+
+class TestValidateSchema:
+    def test_reports_errors(self):
+        result = try_fast_path(
+            "validate_schema",
+            {"payload": '{"name": 1}', "schema": {"required": ["id"]}},
+        )
+        assert result["result"]["valid"] is False
+        assert result["result"]["errors"] == ["'id' is a required property"]
+        validate_payload("AWX", "validate_schema", result)
+
+    def test_valid_payload(self):
+        result = try_fast_path("validate_schema", {"payload": {}, "schema": {}})
+        assert result == {"result": {"valid": True}}
+
+    def test_unparseable_inputs_fall_back(self):
+        assert try_fast_path("validate_schema", {"payload": "not json"}) is None
+
+
+def test_unknown_action_has_no_fast_path():
+    assert try_fast_path("summarize_log", {"log": "x"}) is None
+
+
+@pytest.mark.asyncio
+@patch("app.llm.service.get_llm_client")
+async def test_service_skips_llm_and_counts_fast_path(mock_get_client):
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+    before = metrics.counter("llm.fast_path.launch_job_template")
+
+    result = await PromptService().generate_payload(
+        "launch_job_template", {"template_id": 5, "extra_vars": {}}
+    )
+
+    assert result == {"result": {"template_id": 5, "extra_vars": {}}}
+    mock_client.get_payload.assert_not_called()
+    assert metrics.counter("llm.fast_path.launch_job_template") == before + 1
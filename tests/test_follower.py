@@ -0,0 +1,79 @@
+import pytest
+
+from app.replica.follower import ActivityStreamFollower, entry_targets
+from app.replica.invalidation import InvalidationBus
+from app.replica.store import ReplicaStore
+from app.replica.sync import ReplicaSync
+
+
+def test_entry_targets_uses_summary_fields_and_changes():
+    entry = {
+        "object1": "inventory",
+        "object2": "host",
+        "summary_fields": {"inventory": [{"id": 3}], "host": [{"id": 7}]},
+    }
+    assert entry_targets(entry) == [("inventories", 3), ("hosts", 7)]
+    deleted = {"object1": "job_template", "changes": {"id": 12}, "summary_fields": {}}
+    assert entry_targets(deleted) == [("job_templates", 12)]
+
+
+@pytest.mark.asyncio
+async def test_follower_publishes_invalidations(fake_awx):
+    bus = InvalidationBus()
+    received = []
+
+    async def listener(resource, obj_id, operation):
+        received.append((resource, obj_id, operation))
+
+    def broken(resource, obj_id, operation):
+        raise RuntimeError("boom")
+
+    bus.subscribe(broken)
+    bus.subscribe(listener)
+    fake = fake_awx(
+        activity=[
+            {
+                "next": "more",
+                "results": [
+                    {
+                        "id": 11,
+                        "operation": "update",
+                        "object1": "project",
+                        "summary_fields": {"project": [{"id": 2}]},
+                    }
+                ],
+            },
+            {
+                "next": None,
+                "results": [
+                    {
+                        "id": 12,
+                        "operation": "delete",
+                        "object1": "user",
+                        "changes": {"id": 5},
+                    }
+                ],
+            },
+        ]
+    )
+    follower = ActivityStreamFollower(fake, bus)
+    assert await follower.poll_once() == 0
+    assert follower.last_id == 10
+    assert await follower.poll_once() == 2
+    assert fake.activity_calls == [10, 11]
+    assert follower.last_id == 12
+    assert received == [("projects", 2, "update"), ("users", 5, "delete")]
+
+
+@pytest.mark.asyncio
+async def test_replica_applies_invalidations(tmp_path, fake_awx):
+    store = ReplicaStore(str(tmp_path / "replica.db"))
+    store.upsert("projects", [{"id": 2, "name": "stale"}, {"id": 3, "name": "x"}])
+    fresh = {"id": 2, "name": "fresh"}
+    sync = ReplicaSync(fake_awx({"projects": [fresh]}), store)
+    await sync.on_invalidate("projects", 2, "update")
+    await sync.on_invalidate("projects", 3, "delete")
+    await sync.on_invalidate("hosts", 1, "update")
+    assert store.get("projects", 2) == {"id": 2, "name": "fresh"}
+    assert store.get("projects", 3) is None
+    store.close()
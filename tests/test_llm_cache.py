@@ -1,4 +1,11 @@
-from app.llm.cache import cache_get, cache_set, CACHE_ENABLED
+from app.llm.cache import (
+    CACHE_ENABLED,
+    LRUCache,
+    cache_get,
+    cache_set,
+    make_cache_key,
+    ttl_for,
+)
 
 
 class TestLLMCache:
@@ -14,3 +21,53 @@ class TestLLMCache:
         cache_set("key1", "value1")
         cache_set("key1", "value2")
         assert cache_get("key1") == "value2"
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_byte_bound(self):
+        cache = LRUCache(max_entries=100, max_bytes=20)
+        cache.set("a", "x" * 12)
+        cache.set("b", "y" * 12)
+        assert cache.get("a") is None
+        assert cache.stats()["bytes"] <= 20
+        cache.set("huge", "z" * 100)
+        assert cache.get("huge") is None
+
+    def test_ttl_expiry_and_counters(self, clock):
+        cache = LRUCache(default_ttl=10, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=100)
+        clock.now = 50
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["expirations"] == 1
+        assert stats["entries"] == 1
+
+
+class TestCacheKeys:
+    def test_keys_are_compact_and_order_independent(self):
+        key = make_cache_key("summarize_log", {"log": "x" * 10000, "a": 1})
+        assert key.startswith("summarize_log:")
+        assert len(key) < 64
+        assert key == make_cache_key("summarize_log", {"a": 1, "log": "x" * 10000})
+
+    def test_keys_depend_on_model_and_temperature(self):
+        base = make_cache_key("a", {"x": 1}, model="m1", temperature=0.2)
+        assert base != make_cache_key("a", {"x": 1}, model="m2", temperature=0.2)
+        assert base != make_cache_key("a", {"x": 1}, model="m1", temperature=0.8)
+
+    def test_ttl_for_action(self):
+        assert ttl_for("get_awx_status") < ttl_for("summarize_log")
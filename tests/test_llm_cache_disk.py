@@ -0,0 +1,89 @@
+import pytest
+
+from app.llm import cache as cache_module
+from app.llm.cache import make_cache_key, set_cache_tiers, start_cache_tiers
+from app.llm.cache_disk import DiskCache
+
+
+@pytest.fixture
+def disk(tmp_path):
+    disk = DiskCache(str(tmp_path / "llm_cache.db"), max_bytes=10_000)
+    yield disk
+    disk.close()
+
+
+@pytest.mark.asyncio
+async def test_values_survive_reopen(tmp_path):
+    path = str(tmp_path / "llm_cache.db")
+    first = DiskCache(path)
+    await first.set("k", {"result": {"summary": "x" * 500}}, ttl=60)
+    first.close()
+
+    reopened = DiskCache(path)
+    assert await reopened.get("k") == {"result": {"summary": "x" * 500}}
+    # Stored compressed
+    assert reopened.size() < 100
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_misses_and_compacted(disk):
+    await disk.set("old", {"a": 1}, ttl=-1)
+    await disk.set("new", {"a": 2}, ttl=60)
+    assert await disk.get("old") is None
+    assert disk.compact() == 1
+    assert await disk.get("new") == {"a": 2}
+
+
+@pytest.mark.asyncio
+async def test_compaction_enforces_size_cap(disk):
+    import os
+
+    for i in range(20):
+        await disk.set(f"k{i}", {"blob": os.urandom(400).hex()}, ttl=60)
+    await disk.get("k19")
+    disk.max_bytes = 2000
+    disk.compact()
+    assert disk.size() <= disk.max_bytes
+    assert await disk.get("k19") is not None
+    assert await disk.get("k0") is None
+
+
+@pytest.mark.asyncio
+async def test_startup_warms_most_used_entries(disk):
+    hot = make_cache_key("summarize_log", {"log": "hot"})
+    cold = make_cache_key("summarize_log", {"log": "cold"})
+    await disk.set(hot, {"v": "hot"}, ttl=60)
+    await disk.set(cold, {"v": "cold"}, ttl=60)
+    await disk.get(hot)
+    set_cache_tiers([disk])
+    try:
+        assert await start_cache_tiers(warm_entries=1) == 1
+        await disk.stop()
+    finally:
+        set_cache_tiers(None)
+    assert cache_module.cache_get(hot) == {"v": "hot"}
+    assert cache_module.cache_get(cold) is None
+
+
+@pytest.mark.asyncio
+async def test_memory_hits_keep_keys_hot_on_disk(disk):
+    hot = make_cache_key("summarize_log", {"log": "hot"})
+    cold = make_cache_key("summarize_log", {"log": "cold"})
+    set_cache_tiers([disk])
+    try:
+        await cache_module.cache_aset(hot, {"v": "hot"}, ttl=60)
+        await cache_module.cache_aset(cold, {"v": "cold"}, ttl=60)
+        # The cold key is read once from disk; the hot one only ever from memory
+        cache_module._CACHE.delete(cold)
+        await cache_module.cache_aget(cold)
+        for _ in range(3):
+            assert await cache_module.cache_aget(hot) == {"v": "hot"}
+    finally:
+        set_cache_tiers(None)
+
+    assert [key for key, _, _ in await disk.most_used(1)] == [hot]
+    disk.max_bytes = disk.size() - 1
+    disk.compact()
+    assert await disk.get(hot) == {"v": "hot"}
+    assert await disk.get(cold) is None
@@ -0,0 +1,45 @@
+import pytest
+
+from app.llm import cache as cache_module
+from app.llm.cache import cache_aget, cache_aset, make_cache_key, set_cache_tiers
+from app.llm.cache_redis import RedisCache
+
+
+class BrokenRedis:
+    async def get(self, key):
+        raise ConnectionError("down")
+
+    async def set(self, key, value, ex=None):
+        raise ConnectionError("down")
+
+
+@pytest.fixture
+def redis_tier(fake_redis):
+    set_cache_tiers([RedisCache(client=fake_redis)])
+    yield fake_redis
+    set_cache_tiers(None)
+
+
+@pytest.mark.asyncio
+async def test_set_writes_local_and_redis(redis_tier):
+    key = make_cache_key("summarize_log", {"log": "redis-set"})
+    await cache_aset(key, {"result": {"summary": "s"}}, ttl=60)
+    assert redis_tier.store["llm:" + key] == b'{"result":{"summary":"s"}}'
+    assert redis_tier.expiry["llm:" + key] == 60
+    assert cache_module.cache_get(key) == {"result": {"summary": "s"}}
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_backfills_local_tier(redis_tier):
+    key = make_cache_key("summarize_log", {"log": "other replica"})
+    await RedisCache(client=redis_tier).set(key, {"result": {"summary": "r"}}, 60)
+    assert cache_module.cache_get(key) is None
+    assert await cache_aget(key) == {"result": {"summary": "r"}}
+    assert cache_module.cache_get(key) == {"result": {"summary": "r"}}
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_are_cache_misses():
+    tier = RedisCache(client=BrokenRedis())
+    await tier.set("k", {"a": 1})
+    assert await tier.get("k") is None
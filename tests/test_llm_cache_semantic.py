@@ -0,0 +1,103 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+pytest.importorskip("numpy")
+
+from app import metrics
+from app.llm import cache
+from app.llm.cache_semantic import HashingVectorizer, SemanticCache
+from app.llm.service import PromptService
+
+LOG = (
+    "PLAY [deploy web tier] TASK [install nginx] changed: [web1] "
+    "TASK [start service] fatal: [web2]: FAILED! service nginx failed to start "
+    "PLAY RECAP web1 ok=2 changed=1 failed=0 web2 ok=1 changed=0 failed=1"
+)
+
+
+class TestVectorizer:
+    def test_normalization_ignores_case_and_punctuation(self):
+        vec = HashingVectorizer(1024)
+        a = vec.transform("Deploy the WEB tier!")
+        b = vec.transform("deploy, the web tier")
+        assert float(a @ b) == pytest.approx(1.0)
+
+    def test_unrelated_text_is_dissimilar(self):
+        vec = HashingVectorizer()
+        assert (
+            float(vec.transform(LOG) @ vec.transform("backup database nightly")) < 0.3
+        )
+
+
+class TestSemanticCache:
+    def test_near_duplicate_hits_above_threshold(self):
+        metrics.reset()
+        semantic = SemanticCache(max_entries=4)
+        semantic.set("summarize_log", LOG, {"result": {"summary": "s"}}, ttl=60)
+        rephrased = LOG.replace("PLAY RECAP", "Play recap:")
+        assert semantic.get("summarize_log", rephrased) == {"result": {"summary": "s"}}
+        assert metrics.counter("llm.semantic.hits.summarize_log") == 1
+        assert semantic.get("summarize_log", "TASK [backup] ok: [db1]") is None
+        assert metrics.counter("llm.semantic.misses.summarize_log") == 1
+
+    def test_one_more_failure_never_reuses_a_clean_summary(self):
+        hosts = [f"web{i}" for i in range(40)]
+
+        def run(failed=()):
+            tasks = " ".join(
+                f"fatal: [{h}]: FAILED! unreachable port"
+                if h in failed
+                else f"ok: [{h}]"
+                for h in hosts
+            )
+            recap = " ".join(
+                f"{h} ok={0 if h in failed else 1} changed=0 failed={int(h in failed)}"
+                for h in hosts
+            )
+            return f"PLAY [deploy] TASK [ping] {tasks} PLAY RECAP {recap}"
+
+        clean, broken = run(), run(failed={"web7"})
+        vec = HashingVectorizer()
+        # Close enough that similarity alone would have served it
+        assert float(vec.transform(clean) @ vec.transform(broken)) >= 0.97
+        for cached, asked in ((clean, broken), (broken, clean)):
+            semantic = SemanticCache(max_entries=4)
+            semantic.set("summarize_log", cached, {"result": {"summary": "s"}}, ttl=60)
+            assert semantic.get("summarize_log", asked) is None
+            assert semantic.get("summarize_log", cached) is not None
+
+    def test_exact_actions_are_never_served(self):
+        semantic = SemanticCache()
+        semantic.set("launch_job_template", "template 7", {"x": 1}, ttl=60)
+        assert semantic.get("launch_job_template", "template 7") is None
+
+    def test_expiry_and_bounded_size(self, clock):
+        semantic = SemanticCache(max_entries=2, clock=clock)
+        semantic.set("summarize_log", "alpha beta gamma", 1, ttl=10)
+        semantic.set("summarize_log", "delta epsilon zeta", 2, ttl=100)
+        clock.now = 5
+        assert semantic.get("summarize_log", "alpha beta gamma") == 1
+        semantic.set("summarize_log", "eta theta iota", 3, ttl=100)
+        assert semantic.stats() == {"summarize_log": 2}
+        # The least recently used row ("delta ...") was replaced
+        assert semantic.get("summarize_log", "delta epsilon zeta") is None
+        clock.now = 20
+        assert semantic.get("summarize_log", "alpha beta gamma") is None
+
+
+@pytest.mark.asyncio
+async def test_prompt_service_serves_rephrased_prompt():
+    cache._CACHE.clear()
+    cache.set_cache_tiers([])
+    client = AsyncMock()
+    client.get_payload = AsyncMock(return_value={"result": {"summary": "ok"}})
+    with (
+        patch("app.llm.service.get_llm_client", return_value=client),
+        patch("app.llm.service.get_semantic_cache", return_value=SemanticCache()),
+    ):
+        service = PromptService()
+        await service.generate_payload("summarize_log", {"log": LOG})
+        result = await service.generate_payload("summarize_log", {"log": LOG + "\n"})
+    cache.set_cache_tiers(None)
+    assert result == {"result": {"summary": "ok"}}
+    client.get_payload.assert_awaited_once()
@@ -1,7 +1,12 @@
 import os
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
-from app.llm.client import get_llm_client, OpenAIClient, OllamaClient
+from app.llm.client import (
+    get_llm_client,
+    is_strict_schema,
+    OpenAIClient,
+    OllamaClient,
+)
 import app.llm.client as client_module
 
 # Set default provider to ollama to avoid import errors
@@ -102,3 +107,58 @@ class TestOllamaClient:
         client = OllamaClient()
         result = await client.get_payload("test prompt")
         assert result == {"test": "data"}
+
+
+class TestStructuredOutput:
+    def test_is_strict_schema(self):
+        from app.schema.registry import get_schema
+
+        assert is_strict_schema(get_schema("AWX", "summarize_log"))
+        # "errors" is optional, so strict mode would reject the schema
+        assert not is_strict_schema(get_schema("AWX", "validate_schema"))
+        # Free-form AWX response object
+        assert not is_strict_schema(get_schema("AWX", "create_project"))
+
+    @pytest.mark.asyncio
+    async def test_ollama_passes_schema_as_format(self):
+        client = OllamaClient()
+        client.client = AsyncMock()
+        client.client.generate = AsyncMock(return_value={"response": '{"a": 1}'})
+        schema = {"type": "object", "properties": {"a": {"type": "integer"}}}
+
+        assert await client.get_payload("p", schema=schema) == {"a": 1}
+        assert client.client.generate.call_args.kwargs["format"] == schema
+
+        await client.get_payload("p")
+        assert client.client.generate.call_args.kwargs["format"] == "json"
+
+    @pytest.mark.asyncio
+    async def test_ollama_stream_payload_closes_stream_early(self):
+        class Stream:
+            closed = False
+
+            def __init__(self):
+                self.parts = iter([{"response": '{"a"'}, {"response": ": 1}"}])
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                try:
+                    return next(self.parts)
+                except StopIteration:
+                    raise StopAsyncIteration
+
+            async def aclose(self):
+                self.closed = True
+
+        stream = Stream()
+        client = OllamaClient()
+        client.client = AsyncMock()
+        client.client.generate = AsyncMock(return_value=stream)
+
+        tokens = client.stream_payload("p")
+        assert await tokens.__anext__() == '{"a"'
+        await tokens.aclose()
+        assert stream.closed
+        assert client.client.generate.call_args.kwargs["stream"] is True
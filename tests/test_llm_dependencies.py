@@ -0,0 +1,66 @@
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.dependencies import llm as llm_deps
+
+
+def _transport(handler):
+    def build(endpoint):
+        return httpx.AsyncClient(
+            base_url=endpoint, transport=httpx.MockTransport(handler)
+        )
+
+    return build
+
+
+@pytest.fixture(autouse=True)
+def reset_clients():
+    yield
+    llm_deps._CLIENTS.clear()
+
+
+@pytest.mark.asyncio
+async def test_client_is_pooled_per_endpoint():
+    with patch.object(llm_deps.settings, "llm_endpoint", "http://llm.test"):
+        first = llm_deps.get_http_client()
+        assert llm_deps.get_http_client() is first
+        assert llm_deps.get_http_client("http://other.test") is not first
+        assert first.timeout.connect == llm_deps.settings.llm_connect_timeout
+        assert first.timeout.read == llm_deps.settings.llm_read_timeout
+
+
+@pytest.mark.asyncio
+async def test_close_http_clients():
+    with patch.object(llm_deps.settings, "llm_endpoint", "http://llm.test"):
+        client = llm_deps.get_http_client()
+        await llm_deps.close_http_clients()
+        assert client.is_closed
+        assert llm_deps.get_http_client() is not client
+
+
+@pytest.mark.asyncio
+async def test_summarize_reuses_client():
+    calls = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        return httpx.Response(200, json={"summary": "ok"})
+
+    with (
+        patch.object(llm_deps.settings, "llm_endpoint", "http://llm.test"),
+        patch(
+            "app.dependencies.llm._build_client", side_effect=_transport(handler)
+        ) as build,
+    ):
+        assert await llm_deps.llm_summarize_log("a") == "ok"
+        assert await llm_deps.llm_summarize_log("b") == "ok"
+    assert build.call_count == 1
+    assert calls == ["http://llm.test/summarize"] * 2
+
+
+@pytest.mark.asyncio
+async def test_missing_endpoint():
+    with patch.object(llm_deps.settings, "llm_endpoint", None):
+        with pytest.raises(RuntimeError):
+            llm_deps.get_http_client()
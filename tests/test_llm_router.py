@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from app import metrics
+from app.llm.client import BaseLLMClient, get_llm_client
+from app.llm.router import RoutingClient
+
+
+class FakeBackend(BaseLLMClient):
+    def __init__(self, host, delay=0.0, fail=False):
+        self.host = host
+        self.model = "llama3"
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def get_payload(self, prompt, model=None, temperature=None, schema=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError("LLM request failed")
+        return {"host": self.host}
+
+
+def _prime(router, backend, latency, samples=20):
+    for _ in range(samples):
+        router.backends[backend].record_success(latency)
+
+
+@pytest.mark.asyncio
+async def test_picks_least_loaded_backend():
+    fast, slow = FakeBackend("fast"), FakeBackend("slow")
+    router = RoutingClient([slow, fast])
+    _prime(router, 0, 2.0)
+    _prime(router, 1, 0.5)
+    assert (await router.get_payload("p")) == {"host": "fast"}
+
+    # A busy fast backend loses to an idle slower one
+    router.backends[1].in_flight = 10
+    assert router.pick().name == "slow"
+
+
+@pytest.mark.asyncio
+async def test_fails_over_and_ejects_then_readmits(clock):
+    bad, good = FakeBackend("bad", fail=True), FakeBackend("good")
+    router = RoutingClient([bad, good], eject_failures=2, eject_seconds=30, clock=clock)
+    _prime(router, 1, 1.0)  # untried "bad" scores lower and is picked first
+
+    for _ in range(2):
+        assert (await router.get_payload("p")) == {"host": "good"}
+    assert bad.calls == 2
+    assert not router.backends[0].available(clock.now)
+
+    await router.get_payload("p")
+    assert bad.calls == 2
+
+    clock.now = 31
+    bad.fail = False
+    assert router.pick().name == "bad"
+    assert (await router.get_payload("p")) == {"host": "bad"}
+    assert router.backends[0].failures == 0
+
+
+@pytest.mark.asyncio
+async def test_invalid_output_is_not_a_backend_failure():
+    class BadJSON(FakeBackend):
+        async def get_payload(self, *args, **kwargs):
+            raise ValueError("LLM did not return valid JSON")
+
+    router = RoutingClient([BadJSON("a"), FakeBackend("b")])
+    with pytest.raises(ValueError):
+        await router.get_payload("p")
+    assert router.backends[0].failures == 0
+
+
+@pytest.mark.asyncio
+async def test_hedges_after_p95_and_cancels_loser():
+    metrics.reset()
+    stuck, quick = FakeBackend("stuck", delay=5), FakeBackend("quick", delay=0.01)
+    router = RoutingClient([stuck, quick], hedge=True)
+    _prime(router, 0, 0.02)
+    _prime(router, 1, 0.05)
+
+    assert (await router.get_payload("p")) == {"host": "quick"}
+    assert stuck.cancelled == 1
+    assert metrics.counter("llm.router.hedges") == 1
+    assert metrics.counter("llm.router.hedge_wins") == 1
+    assert router.backends[0].in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_latency_history():
+    primary, other = FakeBackend("a", delay=0.05), FakeBackend("b")
+    router = RoutingClient([primary, other], hedge=True)
+    assert (await router.get_payload("p")) == {"host": "a"}
+    assert other.calls == 0
+
+
+def test_get_llm_client_builds_shared_router():
+    with (
+        patch("app.llm.client.settings") as mock_settings,
+        patch("app.llm.client._ROUTER", None),
+    ):
+        mock_settings.llm_provider = "ollama"
+        mock_settings.llm_endpoints = "http://a:11434, http://b:11434"
+        mock_settings.llm_hedge = False
+        mock_settings.llm_eject_failures = 3
+        mock_settings.llm_eject_seconds = 30
+        router = get_llm_client()
+        assert isinstance(router, RoutingClient)
+        assert [b.name for b in router.backends] == ["http://a:11434", "http://b:11434"]
+        assert get_llm_client() is router
+
+
+@pytest.mark.asyncio
+async def test_stream_closed_early_counts_as_success(clock):
+    class TwoTokens(FakeBackend):
+        async def stream_payload(self, prompt, **kwargs):
+            yield '{"a": 1}'
+            yield " "
+
+    router = RoutingClient([TwoTokens("a")], clock=clock)
+    router.backends[0].failures = 2
+    tokens = router.stream_payload("p")
+    assert await tokens.__anext__() == '{"a": 1}'
+    await tokens.aclose()
+    backend = router.backends[0]
+    assert backend.failures == 0
+    assert backend.ewma == 0.0
+    assert backend.in_flight == 0
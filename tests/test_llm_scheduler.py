@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from app import metrics
+from app.llm.scheduler import LLMOverloaded, Scheduler, llm_priority
+
+
+async def _hold(scheduler, order, name, seconds=0.01):
+    async with scheduler.slot():
+        order.append(name)
+        await asyncio.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrency():
+    scheduler = Scheduler("test", limit=2)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with scheduler.slot():
+            peak = max(peak, scheduler.active)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(work() for _ in range(6)))
+    assert peak == 2
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_jumps_background_queue():
+    scheduler = Scheduler("test", limit=1)
+    order = []
+
+    async def background(i):
+        with llm_priority("background"):
+            await _hold(scheduler, order, f"bg{i}")
+
+    tasks = [asyncio.create_task(background(i)) for i in range(3)]
+    await asyncio.sleep(0)  # bg0 runs, bg1/bg2 queue
+    assert scheduler.stats()["queued.background"] == 2
+    tasks.append(asyncio.create_task(_hold(scheduler, order, "chat")))
+    await asyncio.gather(*tasks)
+    assert order == ["bg0", "chat", "bg1", "bg2"]
+
+
+@pytest.mark.asyncio
+async def test_sheds_requests_past_their_deadline():
+    metrics.reset()
+    scheduler = Scheduler("test", limit=1)
+    blocker = asyncio.create_task(_hold(scheduler, [], "slow", seconds=0.2))
+    await asyncio.sleep(0)
+    with llm_priority("interactive", timeout=0.02):
+        with pytest.raises(LLMOverloaded):
+            async with scheduler.slot():
+                pass
+    await blocker
+    assert metrics.counter("llm.shed.interactive") == 1
+    assert scheduler.active == 0 and scheduler.queued("interactive") == 0
+
+
+@pytest.mark.asyncio
+async def test_sheds_up_front_when_the_queue_is_too_slow():
+    scheduler = Scheduler("test", limit=2)
+    scheduler.service_time = 5.0
+    scheduler.active = 2
+    with llm_priority("interactive", timeout=6.0):
+        # First in line: one average generation until a slot frees up
+        waiter = asyncio.create_task(_hold(scheduler, [], "next"))
+        await asyncio.sleep(0)
+        assert scheduler.queued("interactive") == 1
+        # Second in line still fits in the first wave of freed slots
+        second = asyncio.create_task(_hold(scheduler, [], "second"))
+        await asyncio.sleep(0)
+        assert scheduler.queued("interactive") == 2
+        # Third in line needs two waves, ten seconds
+        with pytest.raises(LLMOverloaded):
+            async with scheduler.slot():
+                pass
+    scheduler._release()
+    scheduler._release()
+    await asyncio.gather(waiter, second)
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_backend_serves_after_a_slow_generation(clock):
+    scheduler = Scheduler("test", limit=1, clock=clock)
+    async with scheduler.slot():
+        clock.now += 90.0
+    assert scheduler.service_time == 90.0
+    # Far over any interactive deadline, but nothing has to wait
+    for _ in range(3):
+        with llm_priority("interactive", timeout=1.0):
+            async with scheduler.slot():
+                clock.now += 0.1
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    scheduler = Scheduler("test", limit=1)
+    blocker = asyncio.create_task(_hold(scheduler, [], "a", seconds=0.02))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_hold(scheduler, [], "b"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await blocker
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.active == 0
+    await _hold(scheduler, [], "c")
+
+
+@pytest.mark.asyncio
+async def test_records_wait_time_per_class():
+    metrics.reset()
+    with llm_priority("background"):
+        async with Scheduler("test", limit=1).slot():
+            pass
+    assert metrics.snapshot()["timings"]["llm.queue_wait.background"]["count"] == 1
+
+
+def test_unknown_priority():
+    with pytest.raises(ValueError):
+        with llm_priority("urgent"):
+            pass
+
+
+def test_slot_for_waiter_on_closed_loop_is_passed_on():
+    scheduler = Scheduler("test", limit=1)
+    scheduler.active = 1
+    gone = asyncio.new_event_loop()
+    future = gone.create_future()
+    gone.close()
+    scheduler._queue.append([1, float("inf"), 0, future, "interactive"])
+    scheduler._release()
+    assert scheduler.active == 0
+    assert not future.done()
@@ -83,3 +83,55 @@ class TestPromptService:
         service = PromptService()
         with pytest.raises(ValueError, match="LLM payload does not match schema"):
             await service.generate_payload("test_action", {})
+
+    @pytest.mark.asyncio
+    @patch("app.llm.service.get_llm_client")
+    @patch("app.llm.service.TEMPLATES")
+    @patch("app.llm.service.get_schema")
+    async def test_generate_payload_uses_shared_cache(
+        self, mock_get_schema, mock_templates, mock_get_client
+    ):
+        mock_client = AsyncMock()
+        mock_client.model = "cache-test-model"
+        mock_client.get_payload = AsyncMock(return_value={"name": "cached"})
+        mock_get_client.return_value = mock_client
+        mock_templates.__contains__ = lambda self, key: True
+        mock_templates.__getitem__ = lambda self, key: "Prompt for {name}"
+        mock_get_schema.return_value = {"type": "object"}
+
+        service = PromptService()
+        first = await service.generate_payload("cache_action", {"name": "shared"})
+        second = await PromptService().generate_payload(
+            "cache_action", {"name": "shared"}
+        )
+
+        assert first == second == {"name": "cached"}
+        mock_client.get_payload.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("app.llm.service.get_llm_client")
+    @patch("app.llm.service.TEMPLATES")
+    @patch("app.llm.service.get_schema")
+    async def test_concurrent_identical_requests_call_llm_once(
+        self, mock_get_schema, mock_templates, mock_get_client
+    ):
+        import asyncio
+
+        async def slow_payload(prompt, **kwargs):
+            await asyncio.sleep(0.01)
+            return {"name": "once"}
+
+        mock_client = AsyncMock()
+        mock_client.model = "singleflight-model"
+        mock_client.get_payload = AsyncMock(side_effect=slow_payload)
+        mock_get_client.return_value = mock_client
+        mock_templates.__contains__ = lambda self, key: True
+        mock_templates.__getitem__ = lambda self, key: "Prompt for {name}"
+        mock_get_schema.return_value = {"type": "object"}
+
+        service = PromptService()
+        results = await asyncio.gather(
+            *[service.generate_payload("flight", {"name": "same"}) for _ in range(4)]
+        )
+        assert results == [{"name": "once"}] * 4
+        mock_client.get_payload.assert_called_once()
@@ -0,0 +1,130 @@
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+
+os.environ.setdefault("AWX_BASE_URL", "http://awx.test")
+os.environ.setdefault("LLM_ENDPOINT", "http://llm.test")
+os.environ.setdefault("LLM_MODEL", "test-model")
+
+from app.llm import cache
+from app.llm.service import PromptService
+from app.llm.stream import IncrementalJSON, collect_json
+from app.main import app
+
+SUMMARY = '{"result": {"summary": "Play \\"deploy\\" ok, {0} failed"}}'
+
+
+async def _tokens(text, size=3, seen=None):
+    for i in range(0, len(text), size):
+        if seen is not None:
+            seen.append(i)
+        yield text[i : i + size]
+
+
+class FakeStreamingClient:
+    model = "fake"
+
+    def __init__(self, text):
+        self.text = text
+        self.sent = []
+
+    async def stream_payload(self, prompt, **kwargs):
+        async for token in _tokens(self.text, seen=self.sent):
+            yield token
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache._CACHE.clear()
+    cache.set_cache_tiers([])
+    yield
+    cache._CACHE.clear()
+    cache.set_cache_tiers(None)
+
+
+class TestIncrementalJSON:
+    def test_parses_across_chunk_boundaries(self):
+        parser = IncrementalJSON()
+        done = [parser.feed(c) for c in SUMMARY]
+        assert done[-1] and not any(done[:-1])
+        assert parser.result() == json.loads(SUMMARY)
+
+    def test_ignores_text_around_the_object(self):
+        parser = IncrementalJSON()
+        parser.feed('```json\n{"a": [1, {"b": "}"}]}\n```')
+        assert parser.result() == {"a": [1, {"b": "}"}]}
+
+    def test_stops_when_required_fields_complete(self):
+        parser = IncrementalJSON(required=["a"])
+        assert not parser.feed('{"a": {"x": 1}')
+        assert parser.feed(', "b": "unfini')
+        assert parser.result() == {"a": {"x": 1}}
+
+    def test_incomplete_output_raises(self):
+        parser = IncrementalJSON()
+        parser.feed('{"a": "no')
+        with pytest.raises(ValueError):
+            parser.result()
+
+
+@pytest.mark.asyncio
+async def test_collect_json_stops_the_stream_early():
+    seen = []
+    text = '{"result": {"summary": "done"}, "extra": "' + "x" * 300 + '"}'
+    result = await collect_json(
+        _tokens(text, seen=seen), {"type": "object", "required": ["result"]}
+    )
+    assert result == {"result": {"summary": "done"}}
+    assert len(seen) < 20
+
+
+@pytest.mark.asyncio
+async def test_prompt_service_streams_deltas_and_caches():
+    client = FakeStreamingClient(SUMMARY)
+    with patch("app.llm.service.get_llm_client", return_value=client):
+        service = PromptService()
+        events = [
+            e async for e in service.stream_payload("summarize_log", {"log": "l"})
+        ]
+        assert "".join(e["delta"] for e in events[:-1]) == SUMMARY
+        assert events[-1] == {"payload": json.loads(SUMMARY)}
+
+        client.text = "{}"
+        cached = [
+            e async for e in service.stream_payload("summarize_log", {"log": "l"})
+        ]
+    assert cached[-1] == {"payload": json.loads(SUMMARY)}
+
+
+def test_summarize_route_streams_ndjson():
+    client = FakeStreamingClient(SUMMARY)
+    with (
+        patch("app.llm.service.get_llm_client", return_value=client),
+        patch("app.adapters.llm._prompt_service", None),
+    ):
+        resp = TestClient(app).post("/llm/summarize?log=output&stream=true")
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert all("delta" in line for line in lines[:-1])
+    assert lines[-1] == {"summary": 'Play "deploy" ok, {0} failed'}
+
+
+def test_summarize_route_reports_stream_errors():
+    client = FakeStreamingClient('{"result": {"summary": 3}}')
+    with (
+        patch("app.llm.service.get_llm_client", return_value=client),
+        patch("app.adapters.llm._prompt_service", None),
+    ):
+        resp = TestClient(app).post("/llm/summarize?log=bad&stream=true")
+    assert "error" in json.loads(resp.text.splitlines()[-1])
+
+
+def test_summarize_route_uses_helper_without_stream():
+    helper = AsyncMock(return_value="done")
+    with patch("app.adapters.llm.llm_summarize_log", helper):
+        resp = TestClient(app).post("/llm/summarize?log=plain")
+    assert resp.json() == {"summary": "done"}
+    helper.assert_awaited_once_with("plain")
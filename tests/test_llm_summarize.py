@@ -0,0 +1,98 @@
+import pytest
+from unittest.mock import patch
+
+from app.llm import cache
+from app.llm.chunking import estimate_tokens, group_texts, split_text
+from app.llm.service import PromptService
+
+
+class CountingClient:
+    model = "fake"
+
+    def __init__(self):
+        self.prompts = []
+
+    async def get_payload(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        kind = "reduce" if "summaries of consecutive parts" in prompt else "map"
+        return {"result": {"summary": f"{kind}-{len(self.prompts)}"}}
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache._CACHE.clear()
+    cache.set_cache_tiers([])
+    yield
+    cache._CACHE.clear()
+    cache.set_cache_tiers(None)
+
+
+@pytest.fixture
+def small_chunks():
+    with patch("app.llm.service.settings") as mock_settings:
+        mock_settings.llm_summary_chunk_tokens = 10
+        mock_settings.llm_summary_concurrency = 2
+        yield mock_settings
+
+
+def _log(lines):
+    return "".join(f"TASK {i} ok\n" for i in range(lines))
+
+
+class TestChunking:
+    def test_chunks_respect_budget_and_lines(self):
+        log = _log(20)
+        chunks = split_text(log, 10)
+        assert "".join(chunks) == log
+        assert all(estimate_tokens(c) <= 10 for c in chunks)
+        assert all(c.endswith("\n") for c in chunks)
+
+    def test_long_line_is_cut(self):
+        chunks = split_text("x" * 100, 10)
+        assert [len(c) for c in chunks] == [35, 35, 30]
+
+    def test_growing_log_keeps_earlier_chunks(self):
+        before = split_text(_log(20), 10)
+        after = split_text(_log(30), 10)
+        assert after[: len(before) - 1] == before[:-1]
+
+    def test_groups_always_shrink(self):
+        texts = ["x" * 100] * 5
+        groups = group_texts(texts, 10)
+        assert len(groups) < len(texts)
+        assert sum(groups, []) == texts
+
+
+@pytest.mark.asyncio
+async def test_short_log_is_a_single_call(small_chunks):
+    client = CountingClient()
+    with patch("app.llm.service.get_llm_client", return_value=client):
+        result = await PromptService().summarize_log("one line\n")
+    assert result == {"result": {"summary": "map-1"}}
+    assert len(client.prompts) == 1
+
+
+@pytest.mark.asyncio
+async def test_large_log_is_mapped_then_reduced(small_chunks):
+    client = CountingClient()
+    log = _log(12)
+    with patch("app.llm.service.get_llm_client", return_value=client):
+        result = await PromptService().summarize_log(log)
+    chunks = len(split_text(log, 10))
+    assert result["result"]["summary"].startswith("reduce-")
+    maps = [p for p in client.prompts if "AWX log:" in p]
+    assert len(maps) == chunks
+    assert len(client.prompts) > chunks
+
+
+@pytest.mark.asyncio
+async def test_grown_log_only_summarizes_new_tail(small_chunks):
+    client = CountingClient()
+    with patch("app.llm.service.get_llm_client", return_value=client):
+        service = PromptService()
+        await service.summarize_log(_log(12))
+        client.prompts.clear()
+        await service.summarize_log(_log(14))
+    maps = [p for p in client.prompts if "AWX log:" in p]
+    # Only the chunks at or after the old last chunk are new
+    assert 1 <= len(maps) <= 2
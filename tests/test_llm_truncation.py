@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import patch
+
+from app import metrics
+from app.llm.templates import SUMMARIZE_LOG_TEMPLATE, TEMPLATES
+from app.llm.tokens import context_window, estimate_tokens, prompt_budget
+from app.llm.truncation import fit_prompt, truncate
+
+
+@pytest.fixture
+def small_budget():
+    with patch("app.llm.tokens.settings") as mock_settings:
+        mock_settings.llm_context_tokens = 400
+        mock_settings.llm_max_tokens = 100
+        yield mock_settings
+
+
+class TestTokens:
+    def test_family_specific_estimates(self):
+        text = "x" * 320
+        assert estimate_tokens(text, "gpt-4o-mini") == 80
+        assert estimate_tokens(text, "qwen2.5:7b") == 100
+        assert estimate_tokens(text, "unknown") == estimate_tokens(text)
+
+    def test_context_window_by_prefix(self):
+        with patch("app.llm.tokens.settings") as mock_settings:
+            mock_settings.llm_context_tokens = None
+            mock_settings.llm_max_tokens = 3000
+            assert context_window("gpt-4o") == 128000
+            assert context_window("gpt-4-0613") == 8192
+            assert context_window("library/llama2:13b") == 4096
+            assert prompt_budget("llama3") == 8192 - 3000
+
+    def test_configured_context_wins(self, small_budget):
+        assert context_window("gpt-4o") == 400
+        assert prompt_budget("gpt-4o") == 300
+
+
+class TestTruncate:
+    @pytest.mark.parametrize("strategy", ["head", "tail", "middle"])
+    def test_respects_limit(self, strategy):
+        text = "".join(str(i % 10) for i in range(1000))
+        result = truncate(text, 200, strategy)
+        assert len(result) <= 200
+        assert "characters truncated" in result
+
+    def test_strategies_keep_the_right_end(self):
+        text = "A" * 500 + "B" * 500
+        assert truncate(text, 100, "head").startswith("A")
+        assert truncate(text, 100, "tail").endswith("B")
+        middle = truncate(text, 100, "middle")
+        assert middle.startswith("A") and middle.endswith("B")
+
+    def test_short_text_is_untouched(self):
+        assert truncate("abc", 10, "middle") == "abc"
+
+
+class TestFitPrompt:
+    def test_small_prompt_is_unchanged(self, small_budget):
+        prompt = fit_prompt("summarize_log", SUMMARIZE_LOG_TEMPLATE, {"log": "hi"})
+        assert prompt == SUMMARIZE_LOG_TEMPLATE.format(log="hi")
+
+    def test_oversized_log_is_truncated(self, small_budget):
+        metrics.reset()
+        log = "start\n" + "line\n" * 2000 + "end\n"
+        prompt = fit_prompt("summarize_log", SUMMARIZE_LOG_TEMPLATE, {"log": log})
+        assert estimate_tokens(prompt) <= 300
+        assert "start" in prompt and "end" in prompt
+        assert metrics.counter("llm.truncation.summarize_log") == 1
+
+    def test_field_without_policy_is_rejected(self, small_budget):
+        payload = {"template_id": 1, "extra_vars": "x" * 5000}
+        with pytest.raises(ValueError, match="over the budget"):
+            fit_prompt("launch_job_template", TEMPLATES["launch_job_template"], payload)
+        assert metrics.counter("llm.truncation.rejected.launch_job_template") == 1
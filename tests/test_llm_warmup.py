@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app import metrics
+from app.llm.client import OllamaClient
+from app.llm.router import RoutingClient
+from app.llm.warmup import (
+    KeepWarm,
+    ollama_backends,
+    parse_hours,
+    setup_keep_warm,
+)
+
+
+def _client(load_seconds=0.0):
+    client = OllamaClient("http://gpu1:11434")
+    client.client = AsyncMock()
+    client.client.generate = AsyncMock(
+        return_value={"response": '{"a": 1}', "load_duration": int(load_seconds * 1e9)}
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_requests_carry_keep_alive_and_report_cold_loads():
+    metrics.reset()
+    client = _client(load_seconds=12.5)
+    await client.get_payload("p")
+    assert client.client.generate.call_args.kwargs["keep_alive"] == "30m"
+    assert metrics.counter("llm.cold_loads") == 1
+    assert metrics.snapshot()["timings"]["llm.cold_load_seconds"]["max"] == 12.5
+
+    client.client.generate.return_value["load_duration"] = 1000
+    await client.get_payload("p")
+    assert metrics.counter("llm.cold_loads") == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up_loads_model_with_empty_prompt():
+    client = _client(load_seconds=3)
+    assert await client.warm_up() == 3
+    kwargs = client.client.generate.call_args.kwargs
+    assert kwargs["prompt"] == "" and kwargs["keep_alive"] == "30m"
+
+
+@pytest.mark.asyncio
+async def test_warm_all_survives_failing_backend():
+    broken, healthy = _client(), _client()
+    broken.client.generate.side_effect = ConnectionError("down")
+    await KeepWarm([broken, healthy], 60).warm_all()
+    healthy.client.generate.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    "now, weekends, expected",
+    [
+        (datetime(2024, 5, 6, 9, 30), False, True),  # Monday morning
+        (datetime(2024, 5, 6, 18, 0), False, False),  # after hours
+        (datetime(2024, 5, 4, 10, 0), False, False),  # Saturday
+        (datetime(2024, 5, 4, 10, 0), True, True),
+    ],
+)
+def test_business_hours(now, weekends, expected):
+    keep_warm = KeepWarm([], 60, (8, 18), weekends, clock=lambda: now)
+    assert keep_warm.in_business_hours() is expected
+
+
+def test_parse_hours():
+    assert parse_hours("8-18") == (8, 18)
+
+
+def test_backends_of_router():
+    a, b = _client(), _client()
+    assert ollama_backends(RoutingClient([a, b])) == [a, b]
+    assert ollama_backends(a) == [a]
+
+
+def test_setup_keep_warm_only_for_ollama():
+    with patch("app.llm.warmup.settings") as mock_settings:
+        mock_settings.llm_provider = "default"
+        assert setup_keep_warm() is None
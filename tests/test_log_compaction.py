@@ -0,0 +1,51 @@
+from app import metrics
+from app.llm.compaction import compact_lines, compact_log
+
+PLAY = (
+    "\x1b[0;32mPLAY [all] ****************************************\x1b[0m\n"
+    "\n"
+    "TASK [Gathering Facts] ************************************\n"
+    "\x1b[0;32mok: [web1]\x1b[0m\n"
+    "ok: [web2]\n"
+    "ok: [web3]\n"
+    "changed: [web1]\n"
+    "changed: [web2]\n"
+    'fatal: [db1]: FAILED! => {"msg": "boom"}\n'
+    "\n"
+    "\n"
+    "skipping: [web1]\n"
+)
+
+
+class TestCompaction:
+    def test_strips_ansi_and_banners(self):
+        lines = list(compact_lines(PLAY.splitlines()))
+        assert lines[0] == "PLAY [all]"
+        assert "TASK [Gathering Facts]" in lines
+        assert not any("\x1b" in line for line in lines)
+
+    def test_collapses_ok_runs_and_keeps_changes_and_failures(self):
+        compacted, ratio = compact_log(PLAY)
+        assert "ok: 3 hosts" in compacted
+        assert "changed: [web1]\nchanged: [web2]" in compacted
+        assert 'fatal: [db1]: FAILED! => {"msg": "boom"}' in compacted
+        assert "skipping: [web1]" in compacted
+        assert "\n\n\n" not in compacted
+        assert ratio < 0.6
+
+    def test_different_results_are_not_merged(self):
+        lines = list(
+            compact_lines(
+                ['ok: [a] => {"x": 1}', 'ok: [b] => {"x": 1}', 'ok: [c] => {"x": 2}']
+            )
+        )
+        assert lines == ['ok: 2 hosts => {"x": 1}', 'ok: [c] => {"x": 2}']
+
+    def test_reports_metrics(self):
+        metrics.reset()
+        compact_log(PLAY)
+        assert metrics.counter("llm.compaction.chars_in") == len(PLAY)
+        assert metrics.snapshot()["timings"]["llm.compaction.ratio"]["count"] == 1
+
+    def test_empty_log(self):
+        assert compact_log("") == ("", 1.0)
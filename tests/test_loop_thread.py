@@ -0,0 +1,155 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.llm import cache
+from app.llm.client import OllamaClient
+from app.llm.loop_thread import BackgroundLoop, PerLoop
+from app.llm.scheduler import get_scheduler
+from app.llm.service import PromptService
+
+
+@pytest.fixture
+def runner():
+    loop = BackgroundLoop("test-loop")
+    yield loop
+    loop.stop()
+
+
+async def _loop_id():
+    return id(asyncio.get_running_loop()), threading.current_thread().name
+
+
+def test_reuses_one_loop_thread(runner):
+    first = runner.run(_loop_id())
+    assert runner.run(_loop_id()) == first
+    assert first[1] == "test-loop"
+
+
+def test_refuses_to_block_a_running_loop(runner):
+    async def caller():
+        return runner.run(_loop_id())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(caller())
+
+    async def allowed():
+        return runner.run(_loop_id(), block_running_loop=True)
+
+    assert asyncio.run(allowed())[1] == "test-loop"
+
+
+def test_propagates_exceptions(runner):
+    async def boom():
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError):
+        runner.run(boom())
+
+
+def test_rejects_reentrant_calls(runner):
+    async def reenter():
+        return runner.run(_loop_id(), block_running_loop=True)
+
+    with pytest.raises(RuntimeError):
+        runner.run(reenter())
+
+
+def test_restarts_after_stop(runner):
+    runner.run(_loop_id())
+    runner.stop()
+    assert runner.run(_loop_id())[1] == "test-loop"
+
+
+def test_per_loop_gives_each_loop_its_own_instance(runner):
+    per_loop = PerLoop(object)
+
+    async def get():
+        return per_loop.get()
+
+    first = asyncio.run(get())
+    assert runner.run(get()) is runner.run(get())
+    assert runner.run(get()) is not first
+
+
+class _FakeOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connections are pooled
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        answer = {"result": {"summary": "ok"}}
+        body = json.dumps({"response": json.dumps(answer), "done": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_and_sync_calls_share_one_service(ollama_server):
+    cache._CACHE.clear()
+    cache.set_cache_tiers([])
+    try:
+        client = OllamaClient(ollama_server)
+        with patch("app.llm.service.get_llm_client", return_value=client):
+            service = PromptService()
+        expected = {"result": {"summary": "ok"}}
+
+        async def on_app_loop():
+            return await service.generate_payload("summarize_log", {"log": "a"})
+
+        assert asyncio.run(on_app_loop()) == expected
+        assert service.generate_payload_sync("summarize_log", {"log": "b"}) == expected
+        assert asyncio.run(on_app_loop()) == expected  # cached
+        assert service.generate_payload_sync("summarize_log", {"log": "c"}) == expected
+    finally:
+        cache._CACHE.clear()
+        cache.set_cache_tiers(None)
+
+
+def test_generate_payload_sync_inside_a_running_loop(ollama_server):
+    cache._CACHE.clear()
+    cache.set_cache_tiers([])
+    try:
+        client = OllamaClient(ollama_server)
+        with patch("app.llm.service.get_llm_client", return_value=client):
+            service = PromptService()
+
+        async def inside_loop():
+            return service.generate_payload_sync("summarize_log", {"log": "x"})
+
+        assert asyncio.run(inside_loop()) == {"result": {"summary": "ok"}}
+    finally:
+        cache._CACHE.clear()
+        cache.set_cache_tiers(None)
+
+
+def test_generate_payload_sync_refuses_loop_holding_a_slot():
+    client = AsyncMock()
+    with patch("app.llm.service.get_llm_client", return_value=client):
+        service = PromptService()
+
+    async def inside_slot():
+        async with get_scheduler("test-backend").slot():
+            return service.generate_payload_sync("summarize_log", {"log": "x"})
+
+    with patch.dict("app.llm.scheduler._SCHEDULERS"):
+        with pytest.raises(RuntimeError, match="holds an LLM backend slot"):
+            asyncio.run(inside_slot())
+    client.get_payload.assert_not_called()
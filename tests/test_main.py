@@ -17,3 +17,11 @@ def test_health_check():
     response = client.get("/")
     assert response.status_code == 200
     assert response.json() == {"status": "running"}
+
+
+def test_metrics_endpoint():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"counters", "timings", "gauges"}
+    assert "hits" in body["gauges"]["llm.cache"]
@@ -0,0 +1,144 @@
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.adapters.awx_service import awx_client
+from app.replica.invalidation import invalidation_bus
+from app.replica.store import ReplicaStore
+from app.replica.sync import ReplicaSync
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ReplicaStore(str(tmp_path / "replica.db"))
+    yield store
+    store.close()
+
+
+class TestReplicaStore:
+    def test_upsert_get_list(self, store):
+        store.upsert(
+            "credentials",
+            [
+                {"id": 1, "name": "ssh", "organization": 2, "inputs": {"p": "x"}},
+                {"id": 2, "name": "vault", "organization": 3},
+            ],
+        )
+        assert store.get("credentials", 1) == {
+            "id": 1,
+            "name": "ssh",
+            "organization": 2,
+        }
+        assert store.list("credentials")["count"] == 2
+        assert store.list("credentials", organization=3)["results"][0]["id"] == 2
+        assert store.list("credentials", name="ssh")["results"][0]["id"] == 1
+
+    def test_users_indexed_by_username(self, store):
+        store.upsert("users", [{"id": 4, "username": "bob", "password": "x"}])
+        assert store.list("users", name="bob")["results"] == [
+            {"id": 4, "username": "bob"}
+        ]
+
+    def test_retain_and_cursor(self, store):
+        store.upsert("projects", [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+        assert store.retain("projects", [2]) == 1
+        assert store.get("projects", 1) is None
+        assert not store.is_synced("projects")
+        store.set_cursor("projects", "2024-01-01T00:00:00Z")
+        assert store.is_synced("projects")
+        assert store.cursor("projects") == "2024-01-01T00:00:00Z"
+
+
+@pytest.mark.asyncio
+async def test_sync_uses_modified_cursor(store, fake_awx):
+    fake = fake_awx(
+        {
+            "organizations": [
+                {"id": 1, "name": "a", "modified": "2024-01-02T00:00:00Z"},
+                {"id": 2, "name": "b", "modified": "2024-01-03T00:00:00Z"},
+            ]
+        }
+    )
+    sync = ReplicaSync(fake, store)
+    assert await sync.sync_resource("organizations") == 2
+    assert fake.filters[-1] == ("organizations", {})
+
+    await sync.sync_resource("organizations")
+    assert fake.filters[-1] == (
+        "organizations",
+        {"modified__gt": "2024-01-03T00:00:00Z"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_full_sync_drops_deleted_objects(store, fake_awx):
+    store.upsert("inventories", [{"id": 9, "name": "gone"}])
+    sync = ReplicaSync(fake_awx({"inventories": [{"id": 1, "name": "kept"}]}), store)
+    await sync.sync_resource("inventories", full=True)
+    assert store.get("inventories", 9) is None
+    assert store.get("inventories", 1) is not None
+
+
+@pytest.mark.asyncio
+async def test_client_answers_from_replica(store):
+    store.upsert("projects", [{"id": 3, "name": "p"}])
+    store.set_cursor("projects", None)
+    with (
+        patch.object(awx_client, "replica", store),
+        patch.object(awx_client, "_request", side_effect=AssertionError("AWX called")),
+    ):
+        assert (await awx_client.list_projects())["results"] == [{"id": 3, "name": "p"}]
+        assert await awx_client.get_project(3) == {"id": 3, "name": "p"}
+
+
+def test_ready_asks_awx_even_when_replica_is_synced(store):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    store.set_cursor("job_templates", None)
+    down = httpx.ConnectError("AWX down")
+    with (
+        patch.object(awx_client, "replica", store),
+        patch.object(awx_client, "_request", side_effect=down) as request,
+    ):
+        assert TestClient(app).get("/ready").json() == {"ready": False, "awx": False}
+    assert request.call_args.args[1].endswith("/api/v2/ping/")
+
+
+@pytest.mark.asyncio
+async def test_writes_go_through_to_replica(store):
+    class Response:
+        def __init__(self, data):
+            self._data = data
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self._data
+
+    async def fake_request(method, url, headers=None, json=None, params=None):
+        return Response({"id": 5, "name": json["name"]} if json else {})
+
+    events = []
+
+    def record(resource, obj_id, operation):
+        events.append((resource, obj_id, operation))
+
+    store.upsert("organizations", [{"id": 6, "name": "old"}])
+    invalidation_bus.subscribe(record)
+    with (
+        patch.object(awx_client, "replica", store),
+        patch("httpx.AsyncClient") as MockClient,
+    ):
+        instance = MockClient.return_value
+        instance.__aenter__.return_value = instance
+        instance.request = fake_request
+        await awx_client.create_organization("new")
+        await awx_client.delete_organization(6)
+    invalidation_bus.unsubscribe(record)
+
+    assert store.get("organizations", 5) == {"id": 5, "name": "new"}
+    assert store.get("organizations", 6) is None
+    assert events == [("organizations", 5, "create"), ("organizations", 6, "delete")]
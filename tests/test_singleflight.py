@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from app.llm.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"n": calls}
+
+    waiters = [asyncio.ensure_future(flight.do("k", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert len(flight) == 1
+    release.set()
+    results = await asyncio.gather(*waiters)
+    assert calls == 1
+    assert results == [{"n": 1}] * 5
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_all_waiters_then_retries():
+    flight = SingleFlight()
+    attempts = 0
+
+    async def failing():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("LLM down")
+
+    results = await asyncio.gather(
+        flight.do("k", failing), flight.do("k", failing), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert attempts == 1
+
+    async def ok():
+        return "fine"
+
+    assert await flight.do("k", ok) == "fine"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_work():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return 42
+
+    first = asyncio.ensure_future(flight.do("k", work))
+    second = asyncio.ensure_future(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == 42
@@ -0,0 +1,139 @@
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+os.environ.setdefault("AWX_BASE_URL", "http://awx.test")
+os.environ.setdefault("LLM_ENDPOINT", "http://llm.test")
+os.environ.setdefault("LLM_MODEL", "test-model")
+
+from app.adapters.awx_service import awx_client
+from app.llm import cache
+from app.llm.scheduler import _priority
+from app.main import app
+
+JOBS = [
+    {"id": i, "name": f"deploy-{i}", "status": "failed", "finished": "2024-05-06"}
+    for i in range(1, 6)
+]
+
+
+class FakeService:
+    def __init__(self, model="llama3"):
+        self.client = MagicMock(model=model)
+        self.priorities = []
+
+    async def summarize_log(self, log):
+        self.priorities.append(_priority.get())
+        if "explode" in log:
+            raise RuntimeError("LLM request failed")
+        return {"result": {"summary": f"summary of {log}"}}
+
+
+def _list(jobs, seen):
+    async def list_recent_jobs(filters=None, limit=50):
+        seen.append((filters, limit))
+        return sorted(jobs, key=lambda job: -job["id"])[:limit]
+
+    return list_recent_jobs
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache._CACHE.clear()
+    cache.set_cache_tiers([])
+    yield
+    cache._CACHE.clear()
+    cache.set_cache_tiers(None)
+
+
+def _post(body, service, stdout):
+    seen = []
+    with (
+        patch.object(awx_client, "list_recent_jobs", _list(JOBS, seen)),
+        patch.object(awx_client, "get_job_stdout", stdout),
+        patch("app.adapters.llm.get_prompt_service", return_value=service),
+    ):
+        resp = TestClient(app).post("/llm/summarize/jobs", json=body)
+    return resp, seen
+
+
+def test_streams_one_summary_per_job():
+    service = FakeService()
+    stdout = AsyncMock(side_effect=lambda job_id: f"stdout {job_id}")
+    resp, seen = _post(
+        {"job_template": 7, "finished_after": "2024-05-06T00:00:00Z", "limit": 3},
+        service,
+        stdout,
+    )
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    # The newest three matching jobs
+    assert sorted(line["id"] for line in lines) == [3, 4, 5]
+    assert all(line["summary"] == f"summary of stdout {line['id']}" for line in lines)
+    assert seen == [
+        (
+            {
+                "status": "failed",
+                "job_template": 7,
+                "finished__gte": "2024-05-06T00:00:00Z",
+            },
+            3,
+        )
+    ]
+    assert set(service.priorities) == {"background"}
+
+
+def test_summaries_are_cached_per_job():
+    service = FakeService()
+    stdout = AsyncMock(side_effect=lambda job_id: f"stdout {job_id}")
+    _post({"limit": 2}, service, stdout)
+    resp, _ = _post({"limit": 2}, service, stdout)
+    assert stdout.await_count == 2
+    assert all(json.loads(line)["cached"] for line in resp.text.splitlines())
+
+
+def test_cached_summaries_are_per_model():
+    stdout = AsyncMock(side_effect=lambda job_id: f"stdout {job_id}")
+    _post({"limit": 2}, FakeService("llama3"), stdout)
+    resp, _ = _post({"limit": 2}, FakeService("mistral"), stdout)
+    assert stdout.await_count == 4
+    assert not any(json.loads(line)["cached"] for line in resp.text.splitlines())
+
+
+def test_failed_job_reports_error_and_others_continue():
+    stdout = AsyncMock(side_effect=lambda job_id: "explode" if job_id == 5 else "ok")
+    resp, _ = _post({"limit": 2}, FakeService(), stdout)
+    lines = {line["id"]: line for line in map(json.loads, resp.text.splitlines())}
+    assert "error" in lines[5]
+    assert lines[4]["summary"] == "summary of ok"
+
+
+def test_limit_is_bounded():
+    resp, _ = _post({"limit": 1000}, FakeService(), AsyncMock())
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_job_stdout_requests_text():
+    response = MagicMock(text="PLAY [all]")
+    with patch.object(awx_client, "_request", AsyncMock(return_value=response)) as req:
+        assert await awx_client.get_job_stdout(9) == "PLAY [all]"
+    args, kwargs = req.call_args
+    assert args[1].endswith("/api/v2/jobs/9/stdout/")
+    assert kwargs["params"] == {"format": "txt"}
+
+
+@pytest.mark.asyncio
+async def test_list_recent_jobs_requests_one_newest_first_page():
+    response = MagicMock()
+    response.json.return_value = {"results": [{"id": 9}, {"id": 8}]}
+    with patch.object(awx_client, "_request", AsyncMock(return_value=response)) as req:
+        jobs = await awx_client.list_recent_jobs({"status": "failed"}, 2)
+    assert jobs == [{"id": 9}, {"id": 8}]
+    req.assert_awaited_once()
+    args, kwargs = req.call_args
+    assert args[1].endswith("/api/v2/jobs/")
+    assert kwargs["params"] == {"status": "failed", "order_by": "-id", "page_size": 2}
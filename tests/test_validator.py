@@ -0,0 +1,128 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from jsonschema.exceptions import SchemaError
+from unittest.mock import AsyncMock, patch
+
+os.environ.setdefault("AWX_BASE_URL", "http://awx.test")
+os.environ.setdefault("LLM_ENDPOINT", "http://llm.test")
+os.environ.setdefault("LLM_MODEL", "test-model")
+
+from app.main import app
+from app.schema import registry
+from app.schema.validator import (
+    compile_registry,
+    compile_schema,
+    get_validator,
+    schema_errors,
+    validate_many,
+)
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "hosts": {"type": "array", "items": {"type": "integer"}},
+    },
+    "required": ["name"],
+}
+
+
+class TestSchemaErrors:
+    def test_compiled_validator_is_reused(self):
+        same = {
+            "required": ["name"],
+            "type": "object",
+            "properties": SCHEMA["properties"],
+        }
+        assert compile_schema(SCHEMA) is compile_schema(same)
+
+    def test_reports_every_error_with_path(self):
+        errors = schema_errors(SCHEMA, {"hosts": [1, "two"]})
+        assert [e["path"] for e in errors] == ["/", "/hosts/1"]
+        assert errors[0]["rule"] == "required"
+        assert errors[1]["rule"] == "type"
+
+    def test_valid_payload_has_no_errors(self):
+        assert schema_errors(SCHEMA, {"name": "web", "hosts": [1]}) == []
+
+    def test_invalid_schema_raises(self):
+        with pytest.raises(SchemaError):
+            compile_schema({"type": "nope"})
+
+
+class TestRegistryValidators:
+    def teardown_method(self):
+        registry.schema_registry.get("TEST", {}).clear()
+
+    def test_compiled_once_per_registry_version(self):
+        compile_registry()
+        first = get_validator("AWX", "launch_job_template")
+        assert get_validator("AWX", "launch_job_template") is first
+        schema = registry.get_schema("AWX", "launch_job_template")
+        assert compile_schema(schema) is first
+
+    def test_register_schema_recompiles(self):
+        registry.register_schema("TEST", "thing", {"type": "object"})
+        before = get_validator("TEST", "thing")
+        registry.register_schema("TEST", "thing", {"type": "array"})
+        after = get_validator("TEST", "thing")
+        assert after is not before
+        assert after.is_valid([])
+        assert get_validator("TEST", "missing") is None
+
+    def test_validate_many(self):
+        results = validate_many(
+            "AWX",
+            "launch_job_template",
+            [
+                {"result": {"template_id": 1, "extra_vars": {}}},
+                {"result": {"template_id": "x", "extra_vars": {}}},
+            ],
+        )
+        assert results[0] == []
+        assert results[1][0]["path"] == "/result/template_id"
+
+    def test_validate_many_unknown_action(self):
+        with pytest.raises(ValueError):
+            validate_many("AWX", "nope", [{}])
+
+
+class TestValidateEndpoint:
+    def setup_method(self):
+        self.client = TestClient(app)
+
+    def test_valid_payload_does_not_call_llm(self):
+        with patch("app.adapters.llm.llm_validate_payload", new=AsyncMock()) as remote:
+            resp = self.client.post(
+                "/llm/validate", json={"payload": {"name": "web"}, "schema": SCHEMA}
+            )
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "valid"}
+        remote.assert_not_awaited()
+
+    def test_invalid_payload_returns_errors(self):
+        resp = self.client.post(
+            "/llm/validate", json={"payload": {"name": 3}, "schema": SCHEMA}
+        )
+        assert resp.status_code == 422
+        detail = resp.json()["detail"]
+        assert detail["status"] == "invalid"
+        assert detail["errors"][0]["path"] == "/name"
+
+    def test_invalid_schema_returns_400(self):
+        resp = self.client.post(
+            "/llm/validate", json={"payload": {}, "schema": {"type": "nope"}}
+        )
+        assert resp.status_code == 400
+
+    def test_semantic_review_is_opt_in(self):
+        with patch("app.adapters.llm.llm_validate_payload", new=AsyncMock()) as remote:
+            resp = self.client.post(
+                "/llm/validate?semantic=true",
+                json={"payload": {"name": "web"}, "schema": SCHEMA},
+            )
+        assert resp.status_code == 200
+        assert resp.json()["semantic_review"] == "passed"
+        remote.assert_awaited_once()
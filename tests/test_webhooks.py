@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+
+os.environ["AWX_BASE_URL"] = "dummy"
+os.environ["LLM_ENDPOINT"] = "dummy"
+os.environ["LLM_MODEL"] = "dummy"
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+from app.adapters.awx_service import awx_client
+from app.jobs.notifications import register_job_webhooks
+from app.jobs.tracker import JobTracker, job_tracker
+from app.config import settings
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def secret():
+    with patch.object(settings, "webhook_secret", "s3cret"):
+        yield "s3cret"
+
+
+class TestJobTracker:
+    @pytest.mark.asyncio
+    async def test_wait_is_woken_by_terminal_update(self):
+        tracker = JobTracker()
+        queue = tracker.subscribe()
+        waiter = asyncio.ensure_future(tracker.wait(1, timeout=5))
+        await asyncio.sleep(0)
+        tracker.update(1, {"id": 1, "status": "running"})
+        assert not waiter.done()
+        tracker.update(1, {"id": 1, "status": "successful"})
+        assert (await waiter)["status"] == "successful"
+        assert queue.qsize() == 2
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out_with_latest_state(self):
+        tracker = JobTracker()
+        tracker.update(2, {"id": 2, "status": "running"})
+        assert await tracker.wait(2, timeout=0.01) == {"id": 2, "status": "running"}
+        assert tracker._waiters == {}
+
+    def test_cache_is_bounded(self):
+        tracker = JobTracker(max_jobs=2)
+        for i in range(3):
+            tracker.update(i, {"id": i, "status": "pending"})
+        assert tracker.get(0) is None
+        assert tracker.get(2) is not None
+
+
+def test_webhook_accepts_token(secret):
+    response = client.post(
+        "/webhooks/awx",
+        json={"id": 41, "status": "failed"},
+        headers={"X-Webhook-Token": secret},
+    )
+    assert response.json() == {"status": "accepted", "id": 41}
+    assert job_tracker.get(41)["status"] == "failed"
+
+
+def test_webhook_accepts_signature(secret):
+    body = json.dumps({"id": 42, "status": "successful"}).encode()
+    signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    response = client.post(
+        "/webhooks/awx",
+        content=body,
+        headers={"X-Signature-256": f"sha256={signature}"},
+    )
+    assert response.status_code == 200
+    assert job_tracker.get(42)["status"] == "successful"
+
+
+def test_webhook_rejects_bad_credentials(secret):
+    response = client.post(
+        "/webhooks/awx", json={"id": 43}, headers={"X-Webhook-Token": "nope"}
+    )
+    assert response.status_code == 401
+
+
+def test_wait_endpoint_returns_cached_terminal_job(secret):
+    job_tracker.update(44, {"id": 44, "status": "canceled"})
+    response = client.get("/awx2/jobs/44/wait")
+    assert response.json() == {
+        "job": {"id": 44, "status": "canceled"},
+        "finished": True,
+    }
+
+
+def test_wait_endpoint_without_webhooks_checks_awx_once():
+    job_tracker.update(45, {"id": 45, "status": "running"})
+    finished = {"id": 45, "status": "successful"}
+    with patch("app.adapters.awx.awx_client.get_job", AsyncMock(return_value=finished)):
+        assert client.get("/awx2/jobs/45/wait").json()["finished"] is True
+    running = {"id": 45, "status": "running"}
+    with patch("app.adapters.awx.awx_client.get_job", AsyncMock(return_value=running)):
+        assert client.get("/awx2/jobs/45/wait").status_code == 503
+
+
+def test_wait_endpoint_maps_awx_errors():
+    request = httpx.Request("GET", "http://awx/api/v2/jobs/404404/")
+    error = httpx.HTTPStatusError(
+        "not found", request=request, response=httpx.Response(404, request=request)
+    )
+    with patch("app.adapters.awx.awx_client.get_job", AsyncMock(side_effect=error)):
+        response = client.get("/awx2/jobs/404404/wait")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_register_job_webhooks_reuses_existing_template():
+    awx = MagicMock()
+    awx.list_notifications = AsyncMock(
+        return_value={"results": [{"id": 9, "name": "awx-advanced-tools job webhook"}]}
+    )
+    awx.update_notification = AsyncMock()
+    awx.create_notification = AsyncMock()
+    awx.associate_notification = AsyncMock()
+    result = await register_job_webhooks(awx, [3], "http://gw/webhooks/awx", "tok")
+    assert result == {"notification_id": 9, "job_templates": [3]}
+    awx.create_notification.assert_not_called()
+    config = awx.update_notification.call_args.kwargs["notification_configuration"]
+    assert config["headers"] == {"X-Webhook-Token": "tok"}
+    assert awx.associate_notification.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_register_job_webhooks_creates_in_template_organization():
+    awx = MagicMock()
+    awx.list_notifications = AsyncMock(return_value={"results": []})
+    awx.fetch_object = AsyncMock(return_value={"id": 3, "organization": 4})
+    awx.create_notification = AsyncMock(return_value={"id": 10})
+    awx.associate_notification = AsyncMock()
+    result = await register_job_webhooks(awx, [3, 5], "http://gw/webhooks/awx", "tok")
+    assert result == {"notification_id": 10, "job_templates": [3, 5]}
+    awx.fetch_object.assert_awaited_once_with("job_templates", 3)
+    assert awx.create_notification.call_args.kwargs["organization"] == 4
+
+    awx.fetch_object.reset_mock()
+    await register_job_webhooks(awx, [3], "http://gw/webhooks/awx", "tok", 2)
+    awx.fetch_object.assert_not_called()
+    assert awx.create_notification.call_args.kwargs["organization"] == 2
+
+
+@pytest.mark.asyncio
+async def test_create_notification_sends_organization():
+    response = MagicMock()
+    response.json.return_value = {"id": 1}
+    with patch.object(awx_client, "_request", AsyncMock(return_value=response)) as req:
+        await awx_client.create_notification("n", "webhook", {}, organization=4)
+    assert req.call_args.kwargs["json"]["organization"] == 4